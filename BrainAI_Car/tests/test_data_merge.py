@@ -0,0 +1,66 @@
+"""
+data_merge 테스트 - 다시 실행해도 원본 데이터가 바뀌지 않는지 확인
+
+실행 방법 (BrainAI_Car 폴더에서):
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+import importlib.util
+
+# utils 패키지 전체(pygame, openvino 등)를 불러오지 않도록 파일만 직접 불러오기
+_MODULE_PATH = os.path.join(os.path.dirname(__file__), '..', 'utils', 'data_merge.py')
+_spec = importlib.util.spec_from_file_location('data_merge', _MODULE_PATH)
+data_merge = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(data_merge)
+
+
+def _make_folder(data_root, folder_name, files):
+    """날짜 폴더 하나 만들기 (files: {기본 이름: 이미지 내용})"""
+    images_dir = os.path.join(data_root, folder_name, 'images')
+    annotations_dir = os.path.join(data_root, folder_name, 'annotations')
+    os.makedirs(images_dir)
+    os.makedirs(annotations_dir)
+    for base_name, content in files.items():
+        with open(os.path.join(images_dir, f'{base_name}.jpg'), 'wb') as f:
+            f.write(content)
+        with open(os.path.join(annotations_dir, f'{base_name}.json'), 'w') as f:
+            f.write('{"steering": 0.0}')
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class MergeRerunTest(unittest.TestCase):
+    
+    def test_copy_rerun_does_not_write_through_hardlinks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_root = os.path.join(tmp, 'data')
+            target_dir = os.path.join(tmp, 'merged')
+            os.makedirs(target_dir)
+            _make_folder(data_root, '20250704_190000', {'img': b'original'})
+            source_img = os.path.join(data_root, '20250704_190000', 'images', 'img.jpg')
+            
+            # 1) 기본 방식(auto)으로 병합 → 같은 디스크라 하드링크가 만들어짐
+            data_merge.merge_data_folders(data_root, target_dir, max_workers=1)
+            target_img = os.path.join(target_dir, 'images', 'img.jpg')
+            if os.stat(target_img).st_nlink < 2:
+                self.skipTest('하드링크를 지원하지 않는 파일 시스템')
+            
+            # 2) 앞 순서의 날짜 폴더가 추가되면 img.jpg 자리에 다른 내용이 들어감
+            _make_folder(data_root, '20250704_183905', {'img': b'newer frame data'})
+            data_merge.merge_data_folders(data_root, target_dir, max_workers=1,
+                                          copy_mode='copy')
+            
+            # 원본은 그대로, 대상은 새 내용 (하드링크가 끊긴 일반 파일)
+            self.assertEqual(_read(source_img), b'original')
+            self.assertEqual(_read(target_img), b'newer frame data')
+            self.assertEqual(os.stat(target_img).st_nlink, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,8 +49,7 @@ class BrainAICarController:
         self.current_servo_angle = SERVO_CENTER
         self.current_motor_speed = MOTOR_STOP
 
-        # 재시도 시스템 (모터만)
-        self.serial_interval = 0.05  # 최소 전송 간격
+        # 마지막 전송 시각
         self.last_serial_send_time = time.time()
 
         # 강제 정지 로직
@@ -62,6 +61,13 @@ class BrainAICarController:
         self.reading_thread = None
         self.stop_reading = False
         
+        # 시리얼 쓰기 스레드 (서보/모터별 최신 명령만 모아서 한 번에 전송)
+        self.writing_thread = None
+        self.stop_writing = False
+        self.pending_commands = {}  # {'servo': 각도, 'motor': 속도}
+        self.command_writing = False
+        self.command_condition = threading.Condition()
+        
         # 데이터 획득기 추가
         self.enable_recording = enable_recording
         self.data_collector = None
@@ -110,8 +116,9 @@ class BrainAICarController:
                     self.serial_port.reset_output_buffer()
                     time.sleep(0.1)
                     
-                    # 읽기 스레드 시작
+                    # 읽기/쓰기 스레드 시작
                     self.start_serial_reading()
+                    self.start_serial_writing()
                     
                     # 초기화 명령: 서보 중앙, 모터 정지
                     self.send_command_internal(SERVO_CENTER, bypass_rate_limit=True)
@@ -152,60 +159,112 @@ class BrainAICarController:
             self.reading_thread.start()
                 
     def _read_serial_continuously(self):
-        """시리얼 데이터 지속적으로 읽기"""
+        """
+        시리얼 데이터 지속적으로 읽기
+        
+        readline()은 데이터가 올 때까지(최대 timeout) 커널에서 대기하므로
+        폴링/sleep 없이 읽습니다. 읽기는 이 스레드만 하므로 락은 쓰기에만 사용합니다.
+        """
         while not self.stop_reading:
             try:
-                with self.serial_lock:  # ← 락 안에서 모든 작업
-                    if not self.serial_port or not self.serial_port.is_open:
-                        break
-                    
-                    if self.serial_port.in_waiting > 0:
-                        data = self.serial_port.readline().decode('utf-8').strip()
-                        if data and self.show_messages:
-                            print(f'[마이크로비트] {data}')
+                serial_port = self.serial_port
+                if not serial_port or not serial_port.is_open:
+                    break
+                
+                line = serial_port.readline()
+                if not line:
+                    continue  # timeout - 종료 플래그 다시 확인
+                
+                data = line.decode('utf-8').strip()
+                if data and self.show_messages:
+                    print(f'[마이크로비트] {data}')
             except Exception as e:
                 if self.show_messages:
                     print(f'시리얼 읽기 오류: {e}')
                 break
-            
-            time.sleep(0.001)
                     
+    def start_serial_writing(self):
+        """시리얼 쓰기 스레드 시작"""
+        if self.serial_port and not self.writing_thread:
+            self.stop_writing = False
+            self.writing_thread = threading.Thread(target=self._write_serial_continuously)
+            self.writing_thread.daemon = True
+            self.writing_thread.start()
+    
+    def _write_serial_continuously(self):
+        """
+        대기 중인 명령을 모아서 전송
+        
+        같은 종류(서보/모터)의 명령은 가장 최근 값만 남기므로,
+        입력이 빠르게 들어와도 밀린 명령 없이 최신 상태만 전송됩니다.
+        """
+        while True:
+            with self.command_condition:
+                while not self.pending_commands and not self.stop_writing:
+                    self.command_condition.wait()
+                if not self.pending_commands:
+                    break  # 종료 요청 + 보낼 명령 없음
+                
+                commands = self.pending_commands
+                self.pending_commands = {}
+                self.command_writing = True
+            
+            # 한 번의 write로 전송 (flush/sleep 없이 OS 버퍼에 맡김)
+            payload = ''.join(f"{command}\n" for command in commands.values()).encode()
+            try:
+                with self.serial_lock:
+                    if self.serial_port and self.serial_port.is_open:
+                        self.serial_port.write(payload)
+                        self.last_serial_send_time = time.time()
+            except serial.SerialException as e:
+                if self.show_messages:
+                    print(f'✗ 명령 전송 실패: {e}')
+            finally:
+                with self.command_condition:
+                    self.command_writing = False
+                    self.command_condition.notify_all()
+    
+    def flush_commands(self, timeout=1.0):
+        """
+        대기 중인 명령이 모두 전송될 때까지 대기
+        
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        
+        Returns:
+            bool: 모두 전송되었으면 True
+        """
+        with self.command_condition:
+            return self.command_condition.wait_for(
+                lambda: not self.pending_commands and not self.command_writing,
+                timeout=timeout
+            )
+    
     def send_command_internal(self, command, bypass_rate_limit=False):
         """
-        내부 명령 전송
+        내부 명령 전송 (쓰기 스레드에 전달)
         
         Args:
             command (int): 전송할 명령 값
-            bypass_rate_limit (bool): 속도 제한 우회
+            bypass_rate_limit (bool): 호환용 (명령을 모아서 보내므로 속도 제한 없음)
         
         Returns:
-            bool: 전송 성공 여부
+            bool: 전송 대기열 등록 여부
         """
         if not self.use_serial:
             return False
         
         # 시리얼 포트 상태 확인
-        with self.serial_lock:
-            if not self.serial_port or not self.serial_port.is_open:
-                return False
-            
-            current_time = time.time()
-            
-            # 속도 제한 (서보는 제외, bypass_rate_limit가 True면 무시)
-            if not bypass_rate_limit and (current_time - self.last_serial_send_time) < self.serial_interval:
-                if not (35 <= command <= 145):  # 서보 범위 외
-                    return False
-            
-            try:
-                self.serial_port.write(f"{command}\n".encode())
-                self.serial_port.flush()
-                time.sleep(0.01)
-                self.last_serial_send_time = current_time
-                return True
-            except serial.SerialException as e:
-                if self.show_messages:
-                    print(f'✗ 명령 전송 실패: {e}')
-                return False
+        if not self.serial_port or not self.serial_port.is_open or not self.writing_thread:
+            return False
+        
+        # 서보 범위(35~145)면 서보 명령, 그 외는 모터 명령
+        kind = 'servo' if 35 <= command <= 145 else 'motor'
+        
+        with self.command_condition:
+            self.pending_commands[kind] = command
+            self.command_condition.notify_all()
+        return True
                 
     def control_steering(self, steering_value):
         """
@@ -291,7 +350,12 @@ class BrainAICarController:
         self.data_collector.delete_last_files(count)
             
     def save_data_frame(self, frame):
-        """현재 프레임과 조향 데이터 저장"""
+        """
+        현재 프레임과 조향 데이터 저장
+        
+        ⚠️ DataCollector.save_frame()이 프레임 복사본을 저장 스레드로 넘겨요.
+           저장한 뒤 같은 프레임에 상태 글자를 그리기 때문에 복사가 필요해요.
+        """
         if self.enable_recording and self.data_collector and self.data_collector.recording:
             self.data_collector.save_frame(
                 frame, 
@@ -320,6 +384,14 @@ class BrainAICarController:
                     print(f'  재시도 {attempt + 1}/3...')
                     time.sleep(0.1)
             
+            # 정지 명령이 실제로 전송될 때까지 대기 후 쓰기 스레드 중지
+            self.flush_commands()
+            with self.command_condition:
+                self.stop_writing = True
+                self.command_condition.notify_all()
+            if self.writing_thread:
+                self.writing_thread.join(timeout=1.0)
+            
             if self.show_messages:
                 print('✓ 차량 정지 완료')
         
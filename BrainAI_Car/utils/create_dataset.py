@@ -1,166 +1,434 @@
-"""
-BrainAI Car 자율주행 도로인식 데이터셋 생성_v1.0.0
-
-모듈 위치: utils/ 
-모듈 이름: create_dataset.py
-
-이 모듈은:
-1. data 폴더의 이미지와 JSON을 읽어서
-2. train과 validation으로 자동 분할합니다 (70:30)
-"""
-
-import os
-import json
-import random
-import shutil
-import math
-from pathlib import Path
-
-def create_dataset(source_dir, target_dir, train_ratio=0.7):
-    """
-    데이터셋 생성
-    
-    Args:
-        source_dir: 획득한 데이터 폴더
-        target_dir: 저장할 데이터셋 폴더
-        train_ratio: 훈련 데이터 비율 (0.7 = 70%)
-    """
-    
-    # train_ratio 검증 추가
-    if not 0 < train_ratio < 1:
-        print(f"❌ 오류: train_ratio는 0과 1 사이의 값이어야 합니다: {train_ratio}")
-        return
-    
-    # 1. 폴더 확인
-    images_dir = os.path.join(source_dir, "images")
-    annotations_dir = os.path.join(source_dir, "annotations")
-    
-    if not os.path.exists(images_dir):
-        print(f"❌ 이미지 폴더를 찾을 수 없습니다: {images_dir}")
-        print("   먼저 BrainAI_Car_AD_dataAcquisition.py로 데이터를 획득하세요!")
-        return
-    
-    # 2. 출력 폴더 생성
-    train_img_dir = os.path.join(target_dir, "train", "images")
-    train_ann_dir = os.path.join(target_dir, "train", "annotations")
-    val_img_dir = os.path.join(target_dir, "validation", "images")
-    val_ann_dir = os.path.join(target_dir, "validation", "annotations")
-    
-    for folder in [train_img_dir, train_ann_dir, val_img_dir, val_ann_dir]:
-        os.makedirs(folder, exist_ok=True)
-    
-    # 3. 이미지와 JSON 쌍 찾기
-    print(f"\n📂 이미지 스캔 중: {images_dir}")
-    
-    valid_pairs = []
-    img_files = [f for f in os.listdir(images_dir) if f.endswith('.jpg')]
-    total_images = len(img_files)
-    print(f"   총 {total_images}개 이미지 발견")
-    
-    for idx, img_file in enumerate(img_files, 1):
-        # 진행률 표시 (100개마다)
-        if idx % 100 == 0 or idx == total_images:
-            progress = (idx / total_images) * 100
-            print(f"   진행중... {idx}/{total_images} ({progress:.1f}%)", end='\r')
-        
-        # 대응하는 JSON 찾기
-        base_name = os.path.splitext(img_file)[0]
-        json_file = f"{base_name}.json"
-        
-        img_path = os.path.join(images_dir, img_file)
-        json_path = os.path.join(annotations_dir, json_file)
-        
-        # JSON이 있고, 모든 필수 데이터가 유효한지 확인
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                    # 필수 필드 확인
-                    required_fields = ['steering']
-                    if not all(field in data for field in required_fields):
-                        print(f"⚠️  필수 필드 누락: {json_file}")
-                        continue
-
-                    # 숫자 값 유효성 확인
-                    try:
-                        steering = float(data['steering'])
-                        
-                        # NaN, Infinity 체크
-                        if math.isnan(steering) or math.isinf(steering):
-                            print(f"⚠️  비정상 값 (NaN/Inf): {json_file}")
-                            continue
-                            
-                    except (ValueError, TypeError):
-                        print(f"⚠️  숫자 변환 실패: {json_file}")
-                        continue
-                    
-                    # 모든 검증 통과
-                    valid_pairs.append((img_path, json_path))
-                    
-            except json.JSONDecodeError:
-                print(f"⚠️  JSON 파싱 실패: {json_file}")
-                continue
-            except Exception as e:
-                print(f"⚠️  오류 ({json_file}): {str(e)}")
-                continue
-    
-    print()  # 진행률 출력 후 줄바꿈
-    
-    if not valid_pairs:
-        print("❌ 유효한 데이터를 찾을 수 없습니다!")
-        return
-    
-    print(f"✅ 발견: {len(valid_pairs)}개 데이터")
-    
-    # 4. 랜덤 셔플
-    random.shuffle(valid_pairs)
-    
-    # 5. Train/Validation 분할
-    split_idx = int(len(valid_pairs) * train_ratio)
-    train_pairs = valid_pairs[:split_idx]
-    val_pairs = valid_pairs[split_idx:]
-    
-    print(f"\n📊 분할:")
-    print(f"  - Train: {len(train_pairs)}개 ({len(train_pairs)/len(valid_pairs)*100:.1f}%)")
-    print(f"  - Validation: {len(val_pairs)}개 ({len(val_pairs)/len(valid_pairs)*100:.1f}%)")
-    
-    # 6. 파일 복사
-    print(f"\n📥 복사 중...")
-    
-    # Train 복사
-    print(f"   Train 데이터 복사 중... (0/{len(train_pairs)})", end='\r')
-    for idx, (img_path, json_path) in enumerate(train_pairs, 1):
-        shutil.copy2(img_path, train_img_dir)
-        shutil.copy2(json_path, train_ann_dir)
-        if idx % 100 == 0 or idx == len(train_pairs):
-            print(f"   Train 데이터 복사 중... ({idx}/{len(train_pairs)})", end='\r')
-    print()
-    
-    # Validation 복사
-    print(f"   Validation 데이터 복사 중... (0/{len(val_pairs)})", end='\r')
-    for idx, (img_path, json_path) in enumerate(val_pairs, 1):
-        shutil.copy2(img_path, val_img_dir)
-        shutil.copy2(json_path, val_ann_dir)
-        if idx % 100 == 0 or idx == len(val_pairs):
-            print(f"   Validation 데이터 복사 중... ({idx}/{len(val_pairs)})", end='\r')
-    print()
-    
-    print(f"✅ 완료!")
-    
-    # 7. 최종 구조 표시
-    print(f"\n📂 저장 위치: {target_dir}")
-    print(f"└── train/")
-    print(f"    ├── images/ ({len(train_pairs)}개)")
-    print(f"    └── annotations/ ({len(train_pairs)}개)")
-    print(f"└── validation/")
-    print(f"    ├── images/ ({len(val_pairs)}개)")
-    print(f"    └── annotations/ ({len(val_pairs)}개)")
-    
-    print("\n✅ 다음 단계: python main/BrainAI_Car_AD_modeling.py 실행")
-
-
-# 버전 정보
-__version__ = '1.0.0'
-__author__ = 'BrainAI Co,.Ltd.'
+"""
+BrainAI Car 자율주행 도로인식 데이터셋 생성_v1.0.0
+
+모듈 위치: utils/ 
+모듈 이름: create_dataset.py
+
+이 모듈은:
+1. data 폴더의 이미지와 JSON을 읽어서
+2. train과 validation으로 자동 분할합니다 (70:30)
+"""
+
+import os
+import json
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import orjson  # 설치되어 있으면 더 빠른 JSON 파서 사용
+except ImportError:
+    orjson = None
+
+
+def _load_json(json_path):
+    """JSON 파일 읽기 (orjson 우선, 실패 시 표준 json)"""
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity 등 표준 json만 읽을 수 있는 값은 아래에서 재시도
+    
+    return json.loads(raw)
+
+
+def _is_complete_jpeg(img_path):
+    """
+    JPEG 파일이 잘리지 않았는지 확인 (시작/끝 마커 2바이트씩만 읽음)
+    
+    Args:
+        img_path: 이미지 경로
+    
+    Returns:
+        bool: SOI(FFD8)로 시작하고 EOI(FFD9)로 끝나면 True
+    """
+    try:
+        with open(img_path, 'rb') as f:
+            if f.read(2) != b'\xff\xd8':
+                return False
+            f.seek(-2, os.SEEK_END)
+            return f.read(2) == b'\xff\xd9'
+    except OSError:
+        return False  # 4바이트 미만이거나 읽을 수 없는 파일
+
+
+def _validate_pair(img_path, json_path):
+    """
+    이미지/JSON 한 쌍 검증 (다른 프로세스에서 실행될 수 있도록 모듈 최상위 함수)
+    
+    Args:
+        img_path: 이미지 경로
+        json_path: JSON 경로
+    
+    Returns:
+        tuple: (조향 값, 오류 메시지) - 유효하면 오류 메시지는 None
+               (NaN/Inf 검사는 호출한 쪽에서 한 번에)
+    """
+    json_file = os.path.basename(json_path)
+    
+    # 잘린 이미지 제외 (녹화 중 강제 종료 등)
+    if not _is_complete_jpeg(img_path):
+        return None, f"⚠️  손상된 이미지: {os.path.basename(img_path)}"
+    
+    # 모든 필수 데이터가 유효한지 확인
+    try:
+        data = _load_json(json_path)
+        
+        # 필수 필드 확인
+        required_fields = ['steering']
+        if not all(field in data for field in required_fields):
+            return None, f"⚠️  필수 필드 누락: {json_file}"
+        
+        # 숫자 값 변환
+        try:
+            return float(data['steering']), None
+        except (ValueError, TypeError):
+            return None, f"⚠️  숫자 변환 실패: {json_file}"
+            
+    except json.JSONDecodeError:
+        return None, f"⚠️  JSON 파싱 실패: {json_file}"
+    except Exception as e:
+        return None, f"⚠️  오류 ({json_file}): {str(e)}"
+
+
+def _kernel_copy(src_path, dst_dir):
+    """
+    커널 안에서 파일 복사 (copy_file_range - 사용자 메모리로 복사하지 않음)
+    
+    XFS/btrfs 등에서는 reflink로 처리되어 데이터를 거의 옮기지 않습니다.
+    지원하지 않는 환경(OSError)이면 shutil.copy2로 복사합니다.
+    
+    Args:
+        src_path: 원본 파일 경로
+        dst_dir: 저장 폴더
+    """
+    dst_path = os.path.join(dst_dir, os.path.basename(src_path))
+    try:
+        with open(src_path, 'rb') as fsrc, open(dst_path, 'wb') as fdst:
+            st = os.fstat(fsrc.fileno())
+            remaining = st.st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        os.utime(dst_path, ns=(st.st_atime_ns, st.st_mtime_ns))  # copy2처럼 수정 시간 유지
+    except OSError:
+        shutil.copy2(src_path, dst_path)
+
+
+# 복사용 버퍼 풀 (읽기 스레드와 쓰기 스레드가 돌려 쓰는 고정 크기 버퍼)
+COPY_BUFFER_SIZE = 1 << 20   # 1MB (JPEG 한 장보다 충분히 큼)
+COPY_BUFFER_COUNT = 32       # 동시에 메모리에 올라가는 파일 수 상한
+
+
+def _read_file(src_path, dst_dir, buffers, write_queue):
+    """
+    원본 파일을 풀 버퍼로 읽어서 쓰기 큐에 넣기
+    
+    Args:
+        src_path: 원본 파일 경로
+        dst_dir: 저장 폴더
+        buffers: 버퍼 풀 (queue.Queue)
+        write_queue: 해당 폴더 쓰기 스레드의 큐
+    """
+    with open(src_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        
+        # 풀 버퍼보다 큰 파일은 따로 할당
+        buf = buffers.get() if size <= COPY_BUFFER_SIZE else bytearray(size)
+        try:
+            length = f.readinto(memoryview(buf)[:size])
+        except Exception:
+            if len(buf) == COPY_BUFFER_SIZE:
+                buffers.put(buf)
+            raise
+    
+    dst_path = os.path.join(dst_dir, os.path.basename(src_path))
+    write_queue.put((dst_path, buf, length, (st.st_atime_ns, st.st_mtime_ns)))
+
+
+def _write_files(write_queue, buffers, counts, errors):
+    """
+    쓰기 큐의 버퍼를 파일로 저장 (저장 폴더마다 한 스레드)
+    
+    Args:
+        write_queue: (저장 경로, 버퍼, 길이, 시간 정보) 큐, None이면 종료
+        buffers: 다 쓴 버퍼를 돌려줄 버퍼 풀
+        counts: 완료 개수 (리스트 한 칸, 이 스레드만 증가)
+        errors: 오류 목록
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+        
+        dst_path, buf, length, times = item
+        try:
+            with open(dst_path, 'wb') as f:
+                f.write(memoryview(buf)[:length])
+            os.utime(dst_path, ns=times)  # copy2처럼 수정 시간 유지
+        except OSError as e:
+            errors.append((dst_path, e))
+        finally:
+            if len(buf) == COPY_BUFFER_SIZE:
+                buffers.put(buf)
+            counts[0] += 1
+
+
+def _copy_pairs(pairs, img_dst, ann_dst, label):
+    """
+    이미지/JSON 쌍 복사
+    
+    copy_file_range를 지원하면(Linux) 커널 복사,
+    아니면 버퍼 풀을 쓰는 읽기/쓰기 파이프라인으로 복사합니다.
+    
+    Args:
+        pairs: (이미지 경로, JSON 경로) 리스트
+        img_dst: 이미지 저장 폴더
+        ann_dst: JSON 저장 폴더
+        label: 진행률 표시용 이름 (Train / Validation)
+    """
+    if hasattr(os, 'copy_file_range'):
+        _copy_pairs_kernel(pairs, img_dst, ann_dst, label)
+    else:
+        _copy_pairs_buffered(pairs, img_dst, ann_dst, label)
+
+
+def _copy_pairs_kernel(pairs, img_dst, ann_dst, label, max_workers=None):
+    """
+    이미지/JSON 쌍을 여러 스레드에서 커널 복사
+    
+    Args:
+        pairs: (이미지 경로, JSON 경로) 리스트
+        img_dst: 이미지 저장 폴더
+        ann_dst: JSON 저장 폴더
+        label: 진행률 표시용 이름 (Train / Validation)
+        max_workers: 복사 스레드 수 (None이면 CPU 수 x 4)
+    """
+    total = len(pairs)
+    if max_workers is None:
+        max_workers = (os.cpu_count() or 1) * 4
+    
+    print(f"   {label} 데이터 복사 중... (0/{total})", end='\r')
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_kernel_copy, path, dst_dir)
+                   for img_path, json_path in pairs
+                   for path, dst_dir in ((img_path, img_dst), (json_path, ann_dst))}
+        
+        # 진행률은 최대 초당 10번만 표시
+        while pending:
+            done, pending = wait(pending, timeout=0.1)
+            for future in done:
+                future.result()  # 복사 오류 전달
+            finished = total - (len(pending) + 1) // 2
+            print(f"   {label} 데이터 복사 중... ({finished}/{total})", end='\r')
+    print()
+
+
+def _copy_pairs_buffered(pairs, img_dst, ann_dst, label, max_workers=4):
+    """
+    이미지/JSON 쌍 복사 (읽기 스레드 풀 → 버퍼 풀 → 폴더별 쓰기 스레드)
+    
+    읽기와 쓰기가 서로 다른 스레드에서 겹쳐서 진행되고,
+    버퍼 풀 크기만큼만 메모리에 올라가도록 제한합니다.
+    
+    Args:
+        pairs: (이미지 경로, JSON 경로) 리스트
+        img_dst: 이미지 저장 폴더
+        ann_dst: JSON 저장 폴더
+        label: 진행률 표시용 이름 (Train / Validation)
+        max_workers: 읽기 스레드 수
+    """
+    total = len(pairs)
+    
+    buffers = queue.Queue()
+    for _ in range(COPY_BUFFER_COUNT):
+        buffers.put(bytearray(COPY_BUFFER_SIZE))
+    
+    errors = []
+    img_queue, ann_queue = queue.Queue(), queue.Queue()
+    img_count, ann_count = [0], [0]
+    writers = [
+        threading.Thread(target=_write_files, args=(img_queue, buffers, img_count, errors), daemon=True),
+        threading.Thread(target=_write_files, args=(ann_queue, buffers, ann_count, errors), daemon=True),
+    ]
+    for writer in writers:
+        writer.start()
+    
+    def show_progress():
+        done = min(img_count[0], ann_count[0])
+        print(f"   {label} 데이터 복사 중... ({done}/{total})", end='\r')
+    
+    show_progress()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for img_path, json_path in pairs:
+                pending.add(executor.submit(_read_file, img_path, img_dst, buffers, img_queue))
+                pending.add(executor.submit(_read_file, json_path, ann_dst, buffers, ann_queue))
+            
+            # 진행률은 최대 초당 10번만 표시
+            while pending:
+                done, pending = wait(pending, timeout=0.1)
+                for future in done:
+                    future.result()  # 읽기 오류 전달
+                show_progress()
+    finally:
+        img_queue.put(None)
+        ann_queue.put(None)
+        for writer in writers:
+            writer.join()
+    
+    show_progress()
+    print()
+    
+    for dst_path, e in errors:
+        print(f"⚠️  복사 실패 ({dst_path}): {e}")
+
+
+def create_dataset(source_dir, target_dir, train_ratio=0.7, seed=None, num_workers=None):
+    """
+    데이터셋 생성
+    
+    Args:
+        source_dir: 획득한 데이터 폴더
+        target_dir: 저장할 데이터셋 폴더
+        train_ratio: 훈련 데이터 비율 (0.7 = 70%)
+        seed: 랜덤 시드 (같은 값이면 항상 같은 분할, None이면 매번 다름)
+        num_workers: 검증 프로세스 수 (None이면 CPU 수, 1이면 단일 프로세스 - 디버깅용)
+    """
+    
+    # train_ratio 검증 추가
+    if not 0 < train_ratio < 1:
+        print(f"❌ 오류: train_ratio는 0과 1 사이의 값이어야 합니다: {train_ratio}")
+        return
+    
+    # 1. 폴더 확인
+    images_dir = os.path.join(source_dir, "images")
+    annotations_dir = os.path.join(source_dir, "annotations")
+    
+    if not os.path.exists(images_dir):
+        print(f"❌ 이미지 폴더를 찾을 수 없습니다: {images_dir}")
+        print("   먼저 BrainAI_Car_AD_dataAcquisition.py로 데이터를 획득하세요!")
+        return
+    
+    # 2. 출력 폴더 생성
+    train_img_dir = os.path.join(target_dir, "train", "images")
+    train_ann_dir = os.path.join(target_dir, "train", "annotations")
+    val_img_dir = os.path.join(target_dir, "validation", "images")
+    val_ann_dir = os.path.join(target_dir, "validation", "annotations")
+    
+    for folder in [train_img_dir, train_ann_dir, val_img_dir, val_ann_dir]:
+        os.makedirs(folder, exist_ok=True)
+    
+    # 3. 이미지와 JSON 쌍 찾기
+    print(f"\n📂 이미지 스캔 중: {images_dir}")
+    
+    # 폴더를 한 번씩만 읽어서 {베이스명: 전체 경로} 생성 (파일마다 exists 호출 X)
+    images = {entry.name[:-4]: entry.path for entry in os.scandir(images_dir)
+              if entry.name.endswith('.jpg')}
+    annotations = {}
+    if os.path.isdir(annotations_dir):
+        annotations = {entry.name[:-5]: entry.path for entry in os.scandir(annotations_dir)
+                       if entry.name.endswith('.json')}
+    print(f"   총 {len(images)}개 이미지 발견")
+    
+    # 이미지와 JSON이 모두 있는 쌍만 (프로세스별로 나눠서 검증)
+    pairs = [(images[base], annotations[base]) for base in images.keys() & annotations.keys()]
+    total_pairs = len(pairs)
+    
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    
+    candidates = []  # (이미지 경로, JSON 경로, JSON 파일명)
+    steering_values = []
+    last_progress_time = 0.0
+    
+    executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+    try:
+        if executor:
+            results = executor.map(_validate_pair, *zip(*pairs), chunksize=256) if pairs else []
+        else:
+            results = (_validate_pair(img_path, json_path) for img_path, json_path in pairs)
+        
+        for idx, ((img_path, json_path), (steering, message)) in enumerate(zip(pairs, results), 1):
+            # 진행률 표시 (0.1초마다)
+            now = time.monotonic()
+            if now - last_progress_time >= 0.1 or idx == total_pairs:
+                last_progress_time = now
+                progress = (idx / total_pairs) * 100
+                print(f"   진행중... {idx}/{total_pairs} ({progress:.1f}%)", end='\r')
+            
+            if message:
+                print(message)
+                continue
+            
+            candidates.append((img_path, json_path, os.path.basename(json_path)))
+            steering_values.append(steering)
+    finally:
+        if executor:
+            executor.shutdown()
+    
+    # NaN, Infinity 체크 (벡터화)
+    finite_mask = np.isfinite(np.array(steering_values, dtype=np.float64))
+    for i in np.flatnonzero(~finite_mask):
+        print(f"⚠️  비정상 값 (NaN/Inf): {candidates[i][2]}")
+    
+    valid_pairs = [candidates[i][:2] for i in np.flatnonzero(finite_mask)]
+    
+    print()  # 진행률 출력 후 줄바꿈
+    
+    if not valid_pairs:
+        print("❌ 유효한 데이터를 찾을 수 없습니다!")
+        return
+    
+    print(f"✅ 발견: {len(valid_pairs)}개 데이터")
+    
+    # 4. 랜덤 셔플 (리스트 대신 인덱스 배열을 섞음)
+    valid_pairs.sort()  # 시드가 같으면 결과도 같도록 순서 고정
+    rng = np.random.default_rng(seed)
+    indices = rng.permutation(len(valid_pairs))
+    
+    # 5. Train/Validation 분할
+    split_idx = int(len(valid_pairs) * train_ratio)
+    train_pairs = [valid_pairs[i] for i in indices[:split_idx]]
+    val_pairs = [valid_pairs[i] for i in indices[split_idx:]]
+    
+    print(f"\n📊 분할:")
+    print(f"  - Train: {len(train_pairs)}개 ({len(train_pairs)/len(valid_pairs)*100:.1f}%)")
+    print(f"  - Validation: {len(val_pairs)}개 ({len(val_pairs)/len(valid_pairs)*100:.1f}%)")
+    
+    # 6. 파일 복사
+    print(f"\n📥 복사 중...")
+    
+    _copy_pairs(train_pairs, train_img_dir, train_ann_dir, "Train")
+    _copy_pairs(val_pairs, val_img_dir, val_ann_dir, "Validation")
+    
+    print(f"✅ 완료!")
+    
+    # 7. 최종 구조 표시
+    print(f"\n📂 저장 위치: {target_dir}")
+    print(f"└── train/")
+    print(f"    ├── images/ ({len(train_pairs)}개)")
+    print(f"    └── annotations/ ({len(train_pairs)}개)")
+    print(f"└── validation/")
+    print(f"    ├── images/ ({len(val_pairs)}개)")
+    print(f"    └── annotations/ ({len(val_pairs)}개)")
+    
+    print("\n✅ 다음 단계: python main/BrainAI_Car_AD_modeling.py 실행")
+
+
+# 버전 정보
+__version__ = '1.0.0'
+__author__ = 'BrainAI Co,.Ltd.'
 __description__ = 'BrainAI Autonomous Driving Project - Dataset Creation Module'
\ No newline at end of file
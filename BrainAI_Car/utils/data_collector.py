@@ -7,11 +7,61 @@ PS4 컨트롤러로 BrainAI Car를 운전하면서 프레임 이미지와 조향
 """
 
 import cv2
+import numpy as np
 import os
 import json
+import math
 import time
+import queue
+import threading
 from datetime import datetime
-from .constants import angle_to_steering
+from .constants import SERVO_MIN, SERVO_MAX, angle_to_steering
+from .sprites import make_sprite, paste_sprite
+
+try:
+    # libjpeg-turbo(SIMD) 인코더 - 설치되어 있으면 사용
+    from turbojpeg import TurboJPEG, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+JPEG_QUALITY = 95
+
+# 서보 각도 → 조향 값 변환표 (매 프레임 함수 호출 대신 조회)
+STEERING_BY_ANGLE = {
+    angle: angle_to_steering(angle) for angle in range(SERVO_MIN, SERVO_MAX + 1)
+}
+
+# 화면 표시 영역
+REC_AREA_SIZE = (60, 90)             # 오른쪽 위 녹화 표시 (높이, 너비)
+STATS_RECT = (10, 200, 320, 270)     # 통계 배경 사각형 (x1, y1, x2, y2)
+
+
+# 파일 쓰기 플래그 (Windows는 O_BINARY 필요)
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# JSON 어노테이션 템플릿 (json.dump와 같은 형식, 매 프레임 dict/인코더 생성 생략)
+# 숫자 자리는 _json_number로 바꾼 문자열을 넣어요
+ANNOTATION_TEMPLATE = '{"image": "%s", "steering": %s, "servo_angle": %s, "speed": %s}'
+
+
+def _json_number(value):
+    """
+    숫자를 JSON에 쓸 수 있는 문자열로 바꾸기
+    
+    💡 %r로 바로 넣으면 numpy 숫자는 'np.float64(0.5)'처럼, nan/inf는
+       'nan'/'inf'로 써져서 JSON 파일을 읽을 수 없게 돼요.
+    
+    Args:
+        value: 정수 또는 실수 (numpy 숫자도 가능)
+    
+    Returns:
+        str: JSON 숫자 (json.dump와 같은 모양, nan/inf는 null)
+    """
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    value = float(value)
+    return repr(value) if math.isfinite(value) else 'null'
+
 
 class DataCollector:
     """자율주행 학습용 데이터를 수집하는 클래스"""
@@ -30,6 +80,17 @@ class DataCollector:
         self.data_dir = data_dir
         self.frame_interval = 1.0 / save_fps  # 프레임 간격
         
+        # JSON에 들어갈 접두사 (따옴표 등 특수문자 이스케이프는 한 번만)
+        self._json_prefix = json.dumps(video_prefix, ensure_ascii=False)[1:-1]
+        
+        # JPEG 인코더 (libjpeg-turbo 라이브러리가 없으면 OpenCV 사용)
+        self._turbo_jpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._turbo_jpeg = TurboJPEG()
+            except (OSError, RuntimeError):
+                self._turbo_jpeg = None
+        
         # 저장 폴더 생성
         self.current_session_dir = None
         self.images_dir = None
@@ -43,6 +104,33 @@ class DataCollector:
         self.session_start_time = None
         self.sequence_number = 0
         
+        # 파일명 타임스탬프 캐시 (초 단위 문자열은 1초에 한 번만 생성)
+        self._timestamp_second = None
+        self._timestamp_text = None
+        
+        # 비동기 저장 (JPEG 인코딩 + 파일 쓰기는 백그라운드 스레드에서 처리)
+        # 💡 디스크가 밀려서 큐가 가득 차면 기다리지 않고 그 프레임은 건너뜀
+        self._write_queue = queue.Queue(maxsize=32)
+        self.dropped_frames = 0
+        self._writer_thread = None
+        self._dir_fds = None  # 세션 폴더 fd (이미지, 어노테이션) - 지원하는 OS만
+        
+        # 고정 그림은 마스크로 한 번만 그려두고 매 프레임 붙여넣기
+        rec_height, rec_width = REC_AREA_SIZE
+        canvas = np.zeros(REC_AREA_SIZE, dtype=np.uint8)
+        cv2.circle(canvas, (rec_width - 40, 40), 15, 255, -1)
+        self._rec_dot_sprite = make_sprite(canvas)
+        
+        canvas = np.zeros(REC_AREA_SIZE, dtype=np.uint8)
+        cv2.putText(canvas, "REC", (rec_width - 85, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 2)
+        self._rec_text_sprite = make_sprite(canvas)
+        
+        x1, y1, x2, y2 = STATS_RECT
+        canvas = np.zeros((y2 - y1 + 1, x2 - x1 + 1), dtype=np.uint8)
+        cv2.putText(canvas, "=== Data Collection ===", (20 - x1, 225 - y1),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, 255, 2)
+        self._stats_title_sprite = make_sprite(canvas)
+        
         print(f"✓ 데이터 수집기 준비 완료")
         print(f"  - 저장 위치: {self.data_dir}")
         print(f"  - 파일 접두사: {self.video_prefix}")
@@ -60,6 +148,7 @@ class DataCollector:
         
         self.recording = True
         self.frame_count = 0
+        self.dropped_frames = 0
         self.last_save_time = time.time()
         self.session_start_time = datetime.now()
         self.sequence_number = 0
@@ -74,6 +163,16 @@ class DataCollector:
         os.makedirs(self.images_dir, exist_ok=True)
         os.makedirs(self.annotations_dir, exist_ok=True)
         
+        # 세션 동안 폴더를 열어두고 상대 경로로 파일 생성 (경로 탐색 생략)
+        if os.open in os.supports_dir_fd:
+            self._dir_fds = (
+                os.open(self.images_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)),
+                os.open(self.annotations_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)),
+            )
+        
+        # 저장 스레드 시작
+        self._start_writer()
+        
         print(f"\n🔴 녹화 시작!")
         print(f"   - 세션 폴더: {session_folder_name}")
     
@@ -83,8 +182,14 @@ class DataCollector:
             return
         
         self.recording = False
+        
+        # 대기 중인 파일 쓰기 완료 후 폴더 fd 닫기
+        self.flush()
+        self._close_dir_fds()
         print(f"⬛ 녹화 중지! (이번 세션: {self.frame_count}장)")
         print(f" - 저장 위치: {self.current_session_dir}")
+        if self.dropped_frames:
+            print(f" - 저장이 밀려 건너뛴 프레임: {self.dropped_frames}장")
         self.frame_count = 0
     
     def save_frame(self, frame, servo_angle, speed):
@@ -106,54 +211,148 @@ class DataCollector:
         
         self.last_save_time = current_time
         
-        image_path = None
-        json_path = None
-        
-        # 파일명 생성 (접두사 + 타임스탬프)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-        filename_base = f"{self.video_prefix}_{timestamp}_{self.sequence_number:04d}"
+        # 파일명 생성 (접두사 + 타임스탬프: YYYYmmdd_HHMMSS_밀리초)
+        second = int(current_time)
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp_text = time.strftime("%Y%m%d_%H%M%S", time.localtime(second))
+        millisecond = int((current_time - second) * 1000)
+        filename_base = (f"{self.video_prefix}_{self._timestamp_text}_{millisecond:03d}"
+                         f"_{self.sequence_number:04d}")
         self.sequence_number += 1
         
-        # 에러 처리 추가
+        # 1. 조향 값 계산 (-1.0 ~ 1.0 범위로 변환)
+        steering_value = STEERING_BY_ANGLE.get(servo_angle)
+        if steering_value is None:
+            steering_value = angle_to_steering(servo_angle)
+        
+        # 2. JSON 어노테이션 (image, steering: 학습용 / servo_angle, speed: 참고용)
+        image_filename = f"{filename_base}.jpg"
+        json_image_name = image_filename.replace(self.video_prefix, self._json_prefix, 1)
+        annotation = (ANNOTATION_TEMPLATE % (
+            json_image_name, _json_number(steering_value),
+            _json_number(servo_angle), _json_number(speed)
+        )).encode('utf-8')
+        
+        image_path = os.path.join(self.images_dir, image_filename)
+        json_path = os.path.join(self.annotations_dir, f"{filename_base}.json")
+        
+        # 3. 인코딩/파일 쓰기는 저장 스레드에 맡기고 바로 반환
+        # (프레임은 복사본을 넘김 → 이후 호출 쪽에서 frame을 수정하거나 재사용해도 안전)
         try:
-            # 1. 이미지 저장 (.jpg)
-            image_filename = f"{filename_base}.jpg"
-            image_path = os.path.join(self.images_dir, image_filename)
-            success = cv2.imwrite(image_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            self._write_queue.put_nowait(
+                (image_path, frame.copy(), json_path, annotation, self._dir_fds)
+            )
+        except queue.Full:
+            self.dropped_frames += 1
+    
+    def _encode_jpeg(self, frame):
+        """
+        프레임을 JPEG으로 인코딩
+        
+        Args:
+            frame: BGR 이미지
             
-            if not success:
-                print(f"⚠️ 이미지 저장 실패!")
+        Returns:
+            JPEG 버퍼 (실패 시 None)
+        """
+        if self._turbo_jpeg is not None:
+            return self._turbo_jpeg.encode(
+                frame, quality=JPEG_QUALITY, jpeg_subsample=TJSAMP_420
+            )
+        
+        success, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        return encoded if success else None
+    
+    def _start_writer(self):
+        """저장 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            return
+        
+        self._writer_thread = threading.Thread(target=self._write_loop)
+        self._writer_thread.daemon = True
+        self._writer_thread.start()
+    
+    def _write_loop(self):
+        """큐에 쌓인 이미지/JSON을 파일로 저장"""
+        while True:
+            item = self._write_queue.get()
+            try:
+                if item is None:
+                    break
+                self._write_files(*item)
+            finally:
+                self._write_queue.task_done()
+    
+    def _write_files(self, image_path, frame, json_path, annotation, dir_fds):
+        """
+        이미지를 JPEG으로 인코딩하고 이미지와 어노테이션 파일 저장
+        
+        Args:
+            image_path: 이미지 저장 경로
+            frame: 저장할 프레임 (복사본)
+            json_path: JSON 저장 경로
+            annotation: JSON 어노테이션 (bytes)
+            dir_fds: (이미지 폴더 fd, 어노테이션 폴더 fd) 또는 None
+        """
+        image_dir_fd, annotation_dir_fd = dir_fds or (None, None)
+        
+        try:
+            encoded = self._encode_jpeg(frame)
+            if encoded is None:
+                print(f"⚠️ 이미지 인코딩 실패!")
                 return
             
-            # 2. 조향 값 계산 (-1.0 ~ 1.0 범위로 변환)
-            steering_value = angle_to_steering(servo_angle)
-
-            # 3. JSON 어노테이션 저장
-            annotation = {
-                "image": image_filename,
-                "steering": steering_value,  # AI 모델 학습용
-                "servo_angle": servo_angle,  # 참고용
-                "speed": speed  # 참고용 (학습에는 미사용)
-            }
-            
-            json_filename = f"{filename_base}.json"
-            json_path = os.path.join(self.annotations_dir, json_filename)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(annotation, f, ensure_ascii=False)
+            self._write_file(image_path, encoded, image_dir_fd)
+            self._write_file(json_path, annotation, annotation_dir_fd)
             
-            # 4. 성공했을 때만 카운트 증가
+            # 성공했을 때만 카운트 증가
             self.frame_count += 1
             self.total_saved += 1
             
         except Exception as e:
             # 에러 나면 만든 파일 삭제 (반쪽짜리 데이터 방지)
             print(f"⚠️ 저장 오류: {e}")
-            if image_path and os.path.exists(image_path):
+            if os.path.exists(image_path):
                 os.remove(image_path)
-            if json_path and os.path.exists(json_path):
+            if os.path.exists(json_path):
                 os.remove(json_path)
     
+    @staticmethod
+    def _write_file(path, data, dir_fd=None):
+        """
+        버퍼를 파일로 저장 (open/write/close 시스템 콜만 사용)
+        
+        Args:
+            path: 저장 경로
+            data: 저장할 버퍼
+            dir_fd: 폴더 fd (있으면 파일명만으로 생성)
+        """
+        if dir_fd is not None:
+            fd = os.open(os.path.basename(path), WRITE_FLAGS, 0o644, dir_fd=dir_fd)
+        else:
+            fd = os.open(path, WRITE_FLAGS, 0o644)
+        
+        try:
+            view = memoryview(data).cast('B')
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
+    def _close_dir_fds(self):
+        """세션 폴더 fd 닫기"""
+        if self._dir_fds:
+            for fd in self._dir_fds:
+                os.close(fd)
+        self._dir_fds = None
+    
+    def flush(self):
+        """대기 중인 모든 파일 쓰기가 끝날 때까지 대기"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._write_queue.join()
+    
     def delete_last_files(self, count=10):
         """최근 저장된 파일 삭제"""
         if not self.images_dir or not os.path.exists(self.images_dir):
@@ -163,6 +362,9 @@ class DataCollector:
         # 녹화 중이면 경고하지만 삭제는 허용
         if self.recording:
             print("⚠️ 녹화 중입니다. 최근 파일을 삭제합니다.")
+        
+        # 아직 쓰는 중인 파일까지 반영
+        self.flush()
             
         # 이미지 파일 목록 (최신순)
         images = sorted(
@@ -201,16 +403,14 @@ class DataCollector:
             return frame
         
         height, width = frame.shape[:2]
+        rec_area = frame[:REC_AREA_SIZE[0], width - REC_AREA_SIZE[1]:]
         
         # 빨간 점 깜빡임
         if int(time.time() * 2) % 2 == 0:
-            cv2.circle(frame, (width - 40, 40), 15, (0, 0, 255), -1)
+            paste_sprite(rec_area, self._rec_dot_sprite, (0, 0, 255))
         
         # REC 텍스트
-        cv2.putText(
-            frame, "REC", (width - 85, 50),
-            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2
-        )
+        paste_sprite(rec_area, self._rec_text_sprite, (0, 0, 255))
         
         # 프레임 카운트
         cv2.putText(
@@ -221,15 +421,16 @@ class DataCollector:
         return frame
     
     def draw_stats(self, frame):
-        """통계 정보 표시"""
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 200), (320, 270), (0, 0, 0), -1)
-        frame = cv2.addWeighted(overlay, 0.7, frame, 0.3, 0)
+        """통계 정보 표시 (프레임 전체 복사 없이 사각형 영역만 직접 수정)"""
+        x1, y1, x2, y2 = STATS_RECT
+        roi = frame[y1:y2 + 1, x1:x2 + 1]
+        
+        # 반투명 검은 배경 (검은색 70% + 원본 30% = 원본 x 0.3)
+        np.multiply(roi, 0.3, out=roi, casting='unsafe')
+        
+        # 제목
+        paste_sprite(roi, self._stats_title_sprite, (255, 255, 255))
         
-        cv2.putText(
-            frame, "=== Data Collection ===", (20, 225),
-            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2
-        )
         cv2.putText(
             frame, f"Total Saved: {self.total_saved}", (20, 250),
             cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
@@ -242,6 +443,12 @@ class DataCollector:
         if self.recording:
             self.stop_recording()
         
+        # 저장 스레드 종료
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join(timeout=5.0)
+        self._writer_thread = None
+        
         print(f"\n📊 수집 완료:")
         print(f"  - 총 저장: {self.total_saved}장")
         print(f"  - 저장 위치: {self.data_dir}")
@@ -10,86 +10,415 @@ BrainAI Car 자율주행 - 데이터 병합 모듈
 """
 
 import os
+import sys
+import time
+import queue
 import shutil
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
 
+# fcntl은 리눅스/맥에만 있어요 (reflink 복사에 사용)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
-def merge_data_folders(data_root, target_dir):
+# tqdm이 설치되어 있으면 진행 막대로 표시 (없으면 logger로 한 줄씩 표시)
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+# 이미지로 인정할 확장자 (endswith에 튜플을 넣으면 한 번에 검사해요)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.JPG', '.JPEG')
+
+# 합친 폴더에 저장할 이미지 확장자
+# 💡 데이터셋 생성/학습/업데이트 코드는 '.jpg' 파일만 읽어요. 그래서 원본이
+#    .jpeg나 .JPG여도 합칠 때 이름을 '.jpg'로 맞춰요 (내용은 같은 JPEG예요).
+TARGET_IMAGE_EXT = '.jpg'
+
+# 진행 상황 표시 간격 (초) - 너무 자주 출력하면 오히려 복사가 느려져요
+PROGRESS_INTERVAL = 0.25
+
+# 병합 과정 출력용 로거
+# 💡 print는 화면에 글자를 쓸 때까지 기다리지만, logger는 메시지를 큐에 넣기만
+#    하고 실제 출력은 별도 스레드가 해요. 그래서 복사 작업이 덜 멈춰요.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False  # 다른 모듈의 로그 설정과 섞여 두 번 출력되지 않도록
+
+# 리눅스 FICLONE ioctl 번호 (btrfs/XFS에서 내용 복사 없이 파일 복제)
+FICLONE = 0x40049409
+
+# 사용할 수 있는 복사 방법
+COPY_MODES = ('auto', 'link', 'reflink', 'copy')
+
+
+class _ConsoleHandler(logging.StreamHandler):
     """
-    여러 날짜 폴더에 나뉜 데이터를 하나로 합치는 함수
+    병합 메시지와 진행 상황을 화면(stdout) 한 곳으로만 출력하는 핸들러
+    
+    💡 tqdm 진행 막대가 그려지는 중에 그냥 print하면 막대와 글자가 섞여요.
+       tqdm.write는 막대를 잠깐 지우고 글자를 쓴 뒤 막대를 다시 그려줘요.
+       진행 막대도 같은 stdout에 그리기 때문에 출력 순서가 뒤섞이지 않아요.
+    """
+    
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            # 줄 끝 문자 (진행 상황은 '\r'로 같은 줄을 덮어써요)
+            end = getattr(record, 'end', '\n')
+            if tqdm is not None and end == '\n':
+                tqdm.write(msg, file=self.stream)
+            else:
+                self.stream.write(msg + end)
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def _start_log_listener():
+    """
+    logger 메시지를 큐로 받아 별도 스레드에서 화면(stdout)에 출력하기 시작
+    
+    Returns:
+        tuple: (QueueListener, QueueHandler)
+               끝날 때 _stop_log_listener에 넘겨서 남은 메시지를 출력하고 정리해요
+    """
+    log_queue = queue.Queue()
+    
+    # 화면 출력 담당 (메시지만 그대로 출력 - print와 같은 모양)
+    console_handler = _ConsoleHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    # logger → 큐 (기존 핸들러는 새 큐 핸들러로 교체)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    
+    listener = logging.handlers.QueueListener(log_queue, console_handler)
+    listener.start()
+    return listener, queue_handler
+
+
+def _stop_log_listener(listener, queue_handler):
+    """
+    남은 메시지를 모두 출력하고 출력 스레드와 큐 핸들러 정리하기
+    
+    💡 큐 핸들러를 떼지 않으면 다음 병합 때 핸들러가 쌓이고, 멈춘 스레드의
+       큐로 메시지가 들어가서 화면에 아무것도 안 나와요.
+    """
+    try:
+        listener.stop()
+    finally:
+        logger.removeHandler(queue_handler)
+
+
+def _plan_folder_copies(folder_name, source_images_dir, source_annotations_dir,
+                        img_files, json_names, existing_files, next_suffix,
+                        target_images_dir, target_annotations_dir):
+    """
+    한 날짜 폴더의 복사 계획 세우기 (실제 복사는 하지 않아요)
     
     🎯 이 함수가 하는 일:
-    1. data 폴더 안의 모든 날짜 폴더를 찾기
-    2. 각 폴더에서 이미지(.jpg)와 라벨(.json) 파일 찾기
-    3. 파일명이 중복되면 자동으로 이름 바꾸기
-    4. 모든 파일을 하나의 폴더에 복사하기
+    1. 이미지와 JSON이 쌍으로 있는 파일만 고르기
+    2. 파일명이 중복되면 새 이름 정하기 (이미지와 JSON은 항상 같은 이름)
+    3. (원본 이미지, 대상 이미지, 원본 JSON, 대상 JSON) 경로 목록 만들기
+    
+    💡 계획과 실행을 나누면, 복사 방법(한 개씩 / 여러 개 동시에)을
+       바꿔도 이름 정하는 규칙은 그대로 유지할 수 있어요.
+    
+    ⚠️ 중복 검사는 확장자를 뺀 이름을 소문자로 바꿔서 해요.
+       (img.jpg와 img.JPG는 둘 다 img.json을 쓰고, 윈도우/맥에서는
+       대소문자만 다른 파일명이 같은 파일로 취급되기 때문이에요)
     
     Args:
-        data_root: 원본 데이터 폴더 경로 (예: 'data_laneD1')
-        target_dir: 합친 데이터를 저장할 폴더 (예: 'data_merged_laneD1')
+        folder_name: 날짜 폴더 이름
+        source_images_dir: 원본 images 폴더
+        source_annotations_dir: 원본 annotations 폴더
+        img_files: 이미지 파일 이름 목록
+        json_names: annotations 폴더에 있는 JSON 파일 이름 세트
+        existing_files: 이미 사용한 대상 이름 세트 - 확장자 없이 소문자로 저장
+                        (이 함수가 추가해요)
+        next_suffix: {"폴더명_파일명": 다음에 붙일 번호} 딕셔너리 (이 함수가 갱신해요)
+        target_images_dir: 저장할 images 폴더
+        target_annotations_dir: 저장할 annotations 폴더
     
-    📖 용어 설명:
-    - Args: Arguments(인수) - 함수에 넣어주는 값
-    - 파일 경로: 컴퓨터에서 파일의 위치를 나타내는 주소
+    Returns:
+        list: (원본 이미지, 대상 이미지, 원본 JSON, 대상 JSON) 경로 튜플 목록
+    """
+    copy_jobs = []
+    
+    # 각 이미지 파일 처리
+    for img_file in img_files:
+        # 이미지 파일명을 이름과 확장자로 나누기 (예: "image_001.jpg" → "image_001", ".jpg")
+        # 💡 마지막 '.' 위치를 한 번만 찾아서 이름과 확장자를 같이 구해요
+        dot = img_file.rfind('.')
+        base_name = img_file[:dot]
+        json_file = f"{base_name}.json"
+        
+        # JSON 파일이 없으면 이미지도 건너뛰기
+        # (이미지와 라벨은 항상 쌍으로 있어야 함)
+        if json_file not in json_names:
+            continue
+        
+        # --------------------------------------
+        # 중복 파일명 처리
+        # --------------------------------------
+        target_base = base_name
+        
+        # 같은 이름의 파일이 이미 있다면? (대소문자, 확장자 구분 없이 비교)
+        if target_base.casefold() in existing_files:
+            # 폴더명을 앞에 붙여서 구분
+            base_key = f"{folder_name}_{base_name}"
+            
+            # 그래도 중복이면 숫자를 붙임 (_1, _2, _3, ...)
+            # 💡 마지막에 쓴 번호를 딕셔너리에 기억해두면 매번 1부터 다시
+            #    세어볼 필요가 없어요 (같은 이름이 많을수록 차이가 커져요)
+            counter = next_suffix.get(base_key, 0)
+            while True:
+                suffix = f"_{counter}" if counter else ""
+                target_base = f"{base_key}{suffix}"
+                if target_base.casefold() not in existing_files:
+                    break
+                counter += 1
+            next_suffix[base_key] = counter + 1
+        
+        # 사용한 이름 기록 (다음 중복 체크를 위해)
+        existing_files.add(target_base.casefold())
+        
+        # 이미지와 JSON은 같은 이름으로 저장 (이미지 확장자는 .jpg로 통일)
+        target_img_name = f"{target_base}{TARGET_IMAGE_EXT}"
+        target_json_name = f"{target_base}.json"
+        
+        copy_jobs.append((
+            os.path.join(source_images_dir, img_file),
+            os.path.join(target_images_dir, target_img_name),
+            os.path.join(source_annotations_dir, json_file),
+            os.path.join(target_annotations_dir, target_json_name),
+        ))
+    
+    return copy_jobs
+
+
+def _reflink(source_path, target_path):
+    """reflink 복사: 같은 데이터 블록을 공유하는 새 파일 만들기 (btrfs/XFS)"""
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source_path, target_path)
+
+
+def _scan_existing_targets(*target_dirs):
+    """
+    대상 폴더에 이미 있는 파일의 (크기, 수정 시간) 모으기
+    
+    💡 병합이 중간에 멈췄다가 다시 실행할 때, 이미 복사된 파일은
+       건너뛰기 위해 사용해요. scandir의 stat 정보를 그대로 써요.
+    
+    Returns:
+        dict: {파일 경로: (크기, 수정 시간(초))}
+    """
+    existing_targets = {}
+    for target_dir in target_dirs:
+        with os.scandir(target_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    existing_targets[entry.path] = (stat.st_size, int(stat.st_mtime))
+    return existing_targets
+
+
+def _copy_file(source_path, target_path, copy_mode, existing_targets=None):
+    """
+    파일 하나를 copy_mode 방식으로 복사하기 (안 되면 일반 복사로 대신해요)
+    
+    💡 하드링크(link)와 reflink는 파일 내용을 읽고 쓰지 않아서 파일 크기와
+       상관없이 거의 즉시 끝나요. 대신 원본과 같은 디스크(파티션)에서만 돼요.
+    
+    Args:
+        source_path: 원본 파일 경로
+        target_path: 대상 파일 경로
+        copy_mode: 'auto', 'link', 'reflink', 'copy' 중 하나
+        existing_targets: _scan_existing_targets 결과 (None이면 항상 복사)
+    
+    Returns:
+        bool: 복사했으면 True, 이미 같은 파일이 있어서 건너뛰었으면 False
     """
+    # 대상에 크기와 수정 시간이 같은 파일이 이미 있으면 건너뛰기
+    # (copy2와 하드링크 모두 수정 시간을 원본과 같게 유지해요)
+    if existing_targets and target_path in existing_targets:
+        stat = os.stat(source_path)
+        if existing_targets[target_path] == (stat.st_size, int(stat.st_mtime)):
+            return False
     
-    print("\n" + "=" * 60)
-    print("🤖 BrainAI Car 자율주행 - 데이터 병합 시작")
-    print("=" * 60)
+    # 대상 파일이 이미 있으면 복사 방법과 상관없이 먼저 지우기
+    # ⚠️ 예전 실행에서 만든 하드링크에 그대로 덮어쓰면 원본 파일까지 바뀌어요!
+    #    (copy_mode='copy'로 다시 실행해도 대상이 하드링크일 수 있어요)
+    try:
+        os.remove(target_path)
+    except FileNotFoundError:
+        pass
+    
+    if copy_mode != 'copy':
+        if copy_mode in ('auto', 'link'):
+            try:
+                os.link(source_path, target_path)
+                return True
+            except OSError:
+                pass  # 다른 디스크이거나 하드링크를 지원하지 않는 경우 (FAT32 등)
+        
+        if copy_mode in ('auto', 'reflink') and fcntl is not None:
+            try:
+                _reflink(source_path, target_path)
+                return True
+            except OSError:
+                # 지원하지 않는 파일 시스템이면 만들다 만 파일 지우기
+                if os.path.exists(target_path):
+                    os.remove(target_path)
+    
+    # shutil.copy2: 파일을 복사 (메타데이터 포함)
+    shutil.copy2(source_path, target_path)
+    return True
+
+
+def _copy_pair(copy_job, copy_mode='copy', existing_targets=None):
+    """
+    이미지 + JSON 한 쌍 복사하기
+    
+    Returns:
+        bool: 둘 다 이미 있어서 건너뛰었으면 True
+    """
+    source_img_path, target_img_path, source_json_path, target_json_path = copy_job
+    
+    img_copied = _copy_file(source_img_path, target_img_path, copy_mode, existing_targets)
+    json_copied = _copy_file(source_json_path, target_json_path, copy_mode, existing_targets)
+    return not (img_copied or json_copied)
+
+
+def _copy_pairs(copy_jobs, total_files, executor=None, desc=None, copy_mode='copy',
+                existing_targets=None):
+    """
+    복사 계획대로 이미지와 JSON 파일 복사하기
+    
+    💡 executor(스레드 풀)가 있으면 여러 파일을 동시에 복사해요.
+       파일 복사는 대부분 디스크를 기다리는 시간이라, 동시에 여러 개를
+       요청해두면 SSD나 네트워크 드라이브에서 훨씬 빨라져요.
+    
+    Args:
+        copy_jobs: _plan_folder_copies가 만든 경로 튜플 목록
+        total_files: 진행 상황 표시용 전체 이미지 수
+        executor: ThreadPoolExecutor (None이면 한 개씩 복사)
+        desc: 진행 막대에 표시할 이름 (예: 날짜 폴더명)
+        copy_mode: 복사 방법 ('auto', 'link', 'reflink', 'copy')
+        existing_targets: 대상 폴더에 이미 있는 파일 정보 (같은 파일은 건너뛰기)
+    
+    Returns:
+        tuple: (처리한 쌍의 개수, 그중 이미 있어서 건너뛴 쌍의 개수)
+    """
+    copied_count = 0  # 이 폴더에서 복사한 파일 수
+    skipped_count = 0  # 이미 있어서 건너뛴 파일 수
+    
+    copy_pair = partial(_copy_pair, copy_mode=copy_mode, existing_targets=existing_targets)
+    if executor is not None:
+        results = executor.map(copy_pair, copy_jobs)
+    else:
+        results = map(copy_pair, copy_jobs)
+    
+    # tqdm은 화면 갱신을 알아서 0.25초에 한 번으로 줄여줘요
+    if tqdm is not None:
+        for skipped in tqdm(results, total=len(copy_jobs), desc=desc, unit='쌍',
+                            file=sys.stdout, mininterval=PROGRESS_INTERVAL, leave=False):
+            copied_count += 1
+            skipped_count += skipped
+        return copied_count, skipped_count
+    
+    # tqdm이 없으면 직접 시간을 재서 0.25초에 한 번만 출력
+    # 💡 파일 개수가 아니라 시간으로 나누면, 복사가 빠르든 느리든
+    #    화면 출력 횟수가 일정하게 유지돼요
+    last_print = time.monotonic()
+    for skipped in results:
+        copied_count += 1
+        skipped_count += skipped
+        
+        now = time.monotonic()
+        if now - last_print >= PROGRESS_INTERVAL:
+            logger.info(f"   복사 중... {copied_count}/{total_files}개", extra={'end': '\r'})
+            last_print = now
+    
+    return copied_count, skipped_count
+
+
+def _merge_data_folders(data_root, target_dir, max_workers, copy_mode):
+    """merge_data_folders의 실제 작업 (화면 출력은 모두 logger로 보내요)"""
+    
+    logger.info("\n" + "=" * 60)
+    logger.info("🤖 BrainAI Car 자율주행 - 데이터 병합 시작")
+    logger.info("=" * 60)
     
     # ========================================
     # 1단계: data 폴더가 있는지 확인
     # ========================================
     if not os.path.exists(data_root):
-        print(f"\n❌ 오류: data 폴더를 찾을 수 없습니다: {data_root}")
-        print(f"\n💡 힌트:")
-        print(f"   1. 폴더 이름을 확인해보세요")
-        print(f"   2. 프로젝트 루트 폴더에서 실행하고 있는지 확인하세요")
+        logger.info(f"\n❌ 오류: data 폴더를 찾을 수 없습니다: {data_root}")
+        logger.info(f"\n💡 힌트:")
+        logger.info(f"   1. 폴더 이름을 확인해보세요")
+        logger.info(f"   2. 프로젝트 루트 폴더에서 실행하고 있는지 확인하세요")
         return
     
     # ========================================
     # 2단계: 유효한 날짜 폴더 찾기
     # ========================================
-    print(f"\n🔍 '{data_root}' 폴더에서 데이터 찾는 중...")
+    logger.info(f"\n🔍 '{data_root}' 폴더에서 데이터 찾는 중...")
     
     date_folders = []  # 날짜 폴더 이름들을 담을 리스트
+    folder_images = {}  # {날짜 폴더 이름: 이미지 파일 이름 목록} - 복사 단계에서 다시 사용
     
     # data_root 안의 모든 항목(폴더/파일) 확인
-    for item in os.listdir(data_root):
-        item_path = os.path.join(data_root, item)
-        
-        # 폴더인지 확인
-        if os.path.isdir(item_path):
-            # images와 annotations 폴더가 둘 다 있는지 확인
-            images_path = os.path.join(item_path, "images")
-            annotations_path = os.path.join(item_path, "annotations")
+    # 💡 os.scandir: 폴더 목록과 함께 '폴더인지 파일인지' 정보도 한 번에 알려줘요
+    #    (os.listdir + os.path.isdir처럼 항목마다 따로 물어볼 필요가 없어요)
+    with os.scandir(data_root) as entries:
+        for entry in entries:
+            # 폴더인지 확인
+            if not entry.is_dir(follow_symlinks=False):
+                continue
             
-            if os.path.exists(images_path) and os.path.exists(annotations_path):
-                date_folders.append(item)  # 유효한 폴더로 추가
+            # images와 annotations 폴더가 둘 다 있는지 확인 (폴더를 한 번만 읽기)
+            with os.scandir(entry.path) as sub_entries:
+                sub_folders = {e.name for e in sub_entries if e.is_dir()}
+            
+            if "images" in sub_folders and "annotations" in sub_folders:
+                date_folders.append(entry.name)  # 유효한 폴더로 추가
+                
+                # 이미지 목록도 지금 한 번만 읽어두기 (개수 출력 + 복사에 같이 사용)
+                with os.scandir(os.path.join(entry.path, "images")) as img_entries:
+                    folder_images[entry.name] = [
+                        e.name for e in img_entries if e.name.endswith(IMAGE_EXTENSIONS) and e.is_file()
+                    ]
     
     # 날짜 폴더가 하나도 없으면 종료
     if not date_folders:
-        print(f"\n❌ 오류: 유효한 데이터 폴더를 찾을 수 없습니다!")
-        print(f"\n💡 필요한 구조:")
-        print(f"   {data_root}/")
-        print(f"   ├── 20250704_183905/")
-        print(f"   │   ├── images/")
-        print(f"   │   └── annotations/")
-        print(f"   └── 20250704_190000/")
-        print(f"       ├── images/")
-        print(f"       └── annotations/")
+        logger.info(f"\n❌ 오류: 유효한 데이터 폴더를 찾을 수 없습니다!")
+        logger.info(f"\n💡 필요한 구조:")
+        logger.info(f"   {data_root}/")
+        logger.info(f"   ├── 20250704_183905/")
+        logger.info(f"   │   ├── images/")
+        logger.info(f"   │   └── annotations/")
+        logger.info(f"   └── 20250704_190000/")
+        logger.info(f"       ├── images/")
+        logger.info(f"       └── annotations/")
         return
     
     date_folders.sort()  # 날짜순으로 정렬
     
     # 발견된 폴더 정보 출력
-    print(f"\n📂 발견된 데이터 폴더: {len(date_folders)}개")
+    logger.info(f"\n📂 발견된 데이터 폴더: {len(date_folders)}개")
     for folder in date_folders:
-        folder_path = os.path.join(data_root, folder)
-        # 이미지 개수 세기
-        img_count = len([f for f in os.listdir(os.path.join(folder_path, "images")) 
-                         if f.endswith('.jpg')])
-        print(f"   - {folder} ({img_count}개 이미지)")
+        logger.info(f"   - {folder} ({len(folder_images[folder])}개 이미지)")
     
     # ========================================
     # 3단계: 결과를 저장할 폴더 만들기
@@ -101,115 +430,139 @@ def merge_data_folders(data_root, target_dir):
     os.makedirs(target_images_dir, exist_ok=True)
     os.makedirs(target_annotations_dir, exist_ok=True)
     
-    print(f"\n📁 결과 저장 폴더 생성 완료:")
-    print(f"   - {target_images_dir}")
-    print(f"   - {target_annotations_dir}")
+    logger.info(f"\n📁 결과 저장 폴더 생성 완료:")
+    logger.info(f"   - {target_images_dir}")
+    logger.info(f"   - {target_annotations_dir}")
+    
+    # 복사 방법 정하기: 원본과 대상이 다른 디스크면 링크가 안 되므로 바로 일반 복사
+    if copy_mode not in COPY_MODES:
+        logger.info(f"\n❌ 오류: copy_mode는 {COPY_MODES} 중 하나여야 합니다: {copy_mode}")
+        return
+    if copy_mode == 'auto' and os.stat(data_root).st_dev != os.stat(target_dir).st_dev:
+        copy_mode = 'copy'
+    logger.info(f"   - 복사 방법: {copy_mode}")
     
     # ========================================
     # 4단계: 파일 중복 방지 준비
     # ========================================
-    # 이미 복사한 파일명을 기억하기 위한 세트
+    # 이미 사용한 파일 이름(확장자 없이 소문자)을 기억하기 위한 세트
     existing_files = set()
+    # 중복 이름에 다음으로 붙일 번호
+    next_suffix = {}
+    
+    # 다시 실행한 경우를 위해 이미 복사된 파일 정보 모으기 (폴더당 한 번만 읽기)
+    existing_targets = _scan_existing_targets(target_images_dir, target_annotations_dir)
+    if existing_targets:
+        logger.info(f"   - 기존 파일 {len(existing_targets)}개 발견 (같은 파일은 건너뜀)")
     
     # 통계를 위한 카운터
     total_images = 0
     total_annotations = 0
+    total_skipped = 0
     
     # ========================================
     # 5단계: 각 날짜 폴더에서 데이터 복사
     # ========================================
-    for idx, folder_name in enumerate(date_folders, 1):
-        print(f"\n📥 [{idx}/{len(date_folders)}] 처리 중: {folder_name}")
-        
-        # 현재 폴더의 images, annotations 경로
-        source_images_dir = os.path.join(data_root, folder_name, "images")
-        source_annotations_dir = os.path.join(data_root, folder_name, "annotations")
-        
-        # 이미지 파일 목록 가져오기
-        img_files = [f for f in os.listdir(source_images_dir) if f.endswith('.jpg')]
-        
-        print(f"   발견: {len(img_files)}개 이미지")
-        
-        copied_count = 0  # 이 폴더에서 복사한 파일 수
-        
-        # 각 이미지 파일 처리
-        for img_file in img_files:
-            # 이미지 파일명에서 확장자를 제외한 부분 (예: "image_001.jpg" → "image_001")
-            base_name = os.path.splitext(img_file)[0]
-            json_file = f"{base_name}.json"
+    # 모든 날짜 폴더가 같이 쓰는 복사 스레드 풀 (max_workers=1이면 한 개씩 복사)
+    if max_workers is None:
+        max_workers = (os.cpu_count() or 1) * 4
+    # 💡 with 블록을 쓰면 중간에 오류가 나도 스레드 풀이 꼭 정리돼요
+    #    (max_workers=1이면 nullcontext()가 executor 자리에 None을 넣어줘요)
+    pool = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else nullcontext()
+    with pool as executor:
+        for idx, folder_name in enumerate(date_folders, 1):
+            logger.info(f"\n📥 [{idx}/{len(date_folders)}] 처리 중: {folder_name}")
             
-            # 원본 파일 경로
-            source_img_path = os.path.join(source_images_dir, img_file)
-            source_json_path = os.path.join(source_annotations_dir, json_file)
+            # 현재 폴더의 images, annotations 경로
+            source_images_dir = os.path.join(data_root, folder_name, "images")
+            source_annotations_dir = os.path.join(data_root, folder_name, "annotations")
             
-            # JSON 파일이 없으면 이미지도 건너뛰기
-            # (이미지와 라벨은 항상 쌍으로 있어야 함)
-            if not os.path.exists(source_json_path):
-                continue
-            
-            # --------------------------------------
-            # 중복 파일명 처리
-            # --------------------------------------
-            target_img_name = img_file
-            target_json_name = json_file
-            
-            # 같은 이름의 파일이 이미 있다면?
-            if img_file in existing_files:
-                # 폴더명을 앞에 붙여서 구분
-                base = os.path.splitext(img_file)[0]
-                ext = os.path.splitext(img_file)[1]
-                target_img_name = f"{folder_name}_{base}{ext}"
-                target_json_name = f"{folder_name}_{base}.json"
-                
-                # 그래도 중복이면 숫자를 붙임 (_1, _2, _3, ...)
-                counter = 1
-                while target_img_name in existing_files:
-                    target_img_name = f"{folder_name}_{base}_{counter}{ext}"
-                    target_json_name = f"{folder_name}_{base}_{counter}.json"
-                    counter += 1
+            # 이미지 파일 목록 (2단계에서 읽어둔 것 사용)
+            img_files = folder_images[folder_name]
             
-            # 사용한 파일명 기록 (다음 중복 체크를 위해)
-            existing_files.add(target_img_name)
+            # JSON 파일 이름들을 미리 한 번에 모아두기 (파일마다 존재 여부를 묻지 않도록)
+            with os.scandir(source_annotations_dir) as entries:
+                json_names = {e.name for e in entries if e.name.endswith('.json')}
             
-            # --------------------------------------
-            # 파일 복사
-            # --------------------------------------
-            target_img_path = os.path.join(target_images_dir, target_img_name)
-            target_json_path = os.path.join(target_annotations_dir, target_json_name)
+            logger.info(f"   발견: {len(img_files)}개 이미지")
             
-            # shutil.copy2: 파일을 복사 (메타데이터 포함)
-            shutil.copy2(source_img_path, target_img_path)
-            shutil.copy2(source_json_path, target_json_path)
+            # 1) 계획: 어떤 파일을 어떤 이름으로 복사할지 먼저 정하기 (파일 작업 없음)
+            copy_jobs = _plan_folder_copies(
+                folder_name, source_images_dir, source_annotations_dir,
+                img_files, json_names, existing_files, next_suffix,
+                target_images_dir, target_annotations_dir
+            )
             
-            copied_count += 1
+            # 2) 실행: 계획대로 복사하기
+            copied_count, skipped_count = _copy_pairs(
+                copy_jobs, len(img_files), executor, folder_name, copy_mode, existing_targets
+            )
             
-            # 진행 상황 표시 (100개마다)
-            if copied_count % 100 == 0 or copied_count == len(img_files):
-                print(f"   복사 중... {copied_count}/{len(img_files)}개", end='\r')
-        
-        print(f"   ✅ 복사 완료: {copied_count}개 쌍 (이미지 + JSON)")
-        total_images += copied_count
-        total_annotations += copied_count
+            logger.info(f"   ✅ 복사 완료: {copied_count}개 쌍 (이미지 + JSON)")
+            if skipped_count:
+                logger.info(f"      (이미 있던 {skipped_count}개 쌍은 건너뜀)")
+            total_images += copied_count
+            total_skipped += skipped_count
+            total_annotations += copied_count
     
     # ========================================
     # 6단계: 최종 결과 출력
     # ========================================
-    print(f"\n" + "=" * 60)
-    print(f"🎉 병합 완료!")
-    print(f"=" * 60)
-    
-    print(f"\n📊 병합 결과:")
-    print(f"   - 처리된 날짜 폴더: {len(date_folders)}개")
-    print(f"   - 총 이미지: {total_images}개")
-    print(f"   - 총 어노테이션: {total_annotations}개")
-    
-    print(f"\n📂 저장 위치: {target_dir}/")
-    print(f"   ├── images/ ({total_images}개)")
-    print(f"   └── annotations/ ({total_annotations}개)")
-    
-    print("\n💡 다음 단계:")
-    print("   데이터 탐색 스크립트를 실행해보세요!")
-    print(f"   (source_dir을 '{target_dir}'로 설정)")
+    logger.info(f"\n" + "=" * 60)
+    logger.info(f"🎉 병합 완료!")
+    logger.info(f"=" * 60)
+    
+    logger.info(f"\n📊 병합 결과:")
+    logger.info(f"   - 처리된 날짜 폴더: {len(date_folders)}개")
+    logger.info(f"   - 총 이미지: {total_images}개")
+    logger.info(f"   - 총 어노테이션: {total_annotations}개")
+    if total_skipped:
+        logger.info(f"   - 이미 있어서 건너뛴 쌍: {total_skipped}개")
+    
+    logger.info(f"\n📂 저장 위치: {target_dir}/")
+    logger.info(f"   ├── images/ ({total_images}개)")
+    logger.info(f"   └── annotations/ ({total_annotations}개)")
+    
+    logger.info("\n💡 다음 단계:")
+    logger.info("   데이터 탐색 스크립트를 실행해보세요!")
+    logger.info(f"   (source_dir을 '{target_dir}'로 설정)")
+
+
+def merge_data_folders(data_root, target_dir, max_workers=None, copy_mode='auto'):
+    """
+    여러 날짜 폴더에 나뉜 데이터를 하나로 합치는 함수
+    
+    🎯 이 함수가 하는 일:
+    1. data 폴더 안의 모든 날짜 폴더를 찾기
+    2. 각 폴더에서 이미지(.jpg/.jpeg)와 라벨(.json) 파일 찾기
+    3. 파일명이 중복되면 자동으로 이름 바꾸기
+    4. 모든 파일을 하나의 폴더에 복사하기
+    
+    Args:
+        data_root: 원본 데이터 폴더 경로 (예: 'data_laneD1')
+        target_dir: 합친 데이터를 저장할 폴더 (예: 'data_merged_laneD1')
+        max_workers: 동시에 복사할 스레드 수
+                     (None이면 CPU 코어 수 x 4, 하드디스크라면 1 추천)
+        copy_mode: 파일 복사 방법
+                   - 'auto': 같은 디스크면 하드링크 → reflink → 일반 복사 순서로 시도
+                   - 'link': 하드링크 (안 되면 일반 복사)
+                   - 'reflink': reflink 복제 (안 되면 일반 복사)
+                   - 'copy': 항상 일반 복사 (shutil.copy2)
+    
+    ⚠️ 하드링크는 원본과 같은 파일을 가리켜요. 합친 폴더의 파일을 지우는 건
+       괜찮지만, 파일 내용을 직접 고치면 원본도 같이 바뀌어요.
+       (학습 데이터처럼 읽기만 하는 파일이라면 문제없어요)
+    
+    📖 용어 설명:
+    - Args: Arguments(인수) - 함수에 넣어주는 값
+    - 파일 경로: 컴퓨터에서 파일의 위치를 나타내는 주소
+    """
+    # 로그 출력 스레드 시작 → 병합 → (남은 출력을 모두 내보낸 뒤) 종료
+    listener, queue_handler = _start_log_listener()
+    try:
+        _merge_data_folders(data_root, target_dir, max_workers, copy_mode)
+    finally:
+        _stop_log_listener(listener, queue_handler)
 
 
 # ============================================================
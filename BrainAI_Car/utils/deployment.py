@@ -5,12 +5,24 @@ BrainAI Car Autonomous Driving Deployment
 """
 
 import cv2
+import sys
 import time
+import select
 import logging
+import threading
+from collections import deque
 from typing import Optional
 
+try:
+    import msvcrt  # Windows 콘솔 키 입력
+except ImportError:
+    msvcrt = None
+
+import numpy as np
+
 from .car_controller import BrainAICarController
 from .lane_detection import LaneDetection
+from .sprites import TextSpriteCache
 from .constants import (
     SERVO_CENTER,
     MOTOR_STOP,
@@ -28,15 +40,57 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def build_gstreamer_pipeline(video_source) -> str:
+    """
+    비디오 소스에 맞는 GStreamer 파이프라인 문자열 생성
+
+    decodebin이 보드의 하드웨어 디코더(v4l2h264dec, nvv4l2decoder 등)를
+    자동으로 선택하고, appsink는 최신 프레임 1장만 유지합니다.
+
+    Args:
+        video_source: 카메라 인덱스, RTSP URL 또는 HTTP(MJPEG) URL
+
+    Returns:
+        cv2.CAP_GSTREAMER용 파이프라인 문자열
+    """
+    sink = "videoconvert ! video/x-raw,format=BGR ! appsink drop=1 max-buffers=1 sync=false"
+    source = str(video_source)
+
+    if source.isdigit():
+        return f"v4l2src device=/dev/video{source} ! image/jpeg ! jpegdec ! {sink}"
+    if source.startswith("rtsp://"):
+        return f"rtspsrc location={source} latency=0 ! decodebin ! {sink}"
+    return f"souphttpsrc location={source} ! multipartdemux ! jpegdec ! {sink}"
+
+
 class BrainAICarDeployment:
     """BrainAI 자율주행 차량 배포 클래스"""
 
+    # 오버레이 표시 설정 (매 프레임 다시 만들지 않도록 클래스 상수로 정의)
+    OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+    OVERLAY_FONT_SCALE = 0.7
+    OVERLAY_THICKNESS = 2
+    STATUS_ON = ("BrainAI Car Autonomous Driving: ON", (0, 255, 0))
+    STATUS_OFF = ("Driving: OFF", (128, 128, 128))
+    MODEL_COLOR = (0, 255, 255)
+    STEERING_COLOR = (255, 255, 0)
+    LATENCY_COLOR = (255, 100, 100)
+
+    # 새 예측 결과 없이 이 프레임 수가 지나면 안전을 위해 정지 (30fps 기준 약 0.5초)
+    MAX_STALE_FRAMES = 15
+
     def __init__(
         self,
         video_source: str,
         initial_speed: int = 450,
         use_serial: bool = True,
-        show_messages: bool = True
+        show_messages: bool = True,
+        show_window: bool = True,
+        key_poll_interval: int = 3,
+        use_gstreamer: bool = False,
+        gstreamer_pipeline: Optional[str] = None,
+        model_precision: str = 'fp32',
+        model_performance_hint: str = 'LATENCY'
     ):
         """
         Args:
@@ -44,11 +98,25 @@ class BrainAICarDeployment:
             initial_speed: 초기 전진 속도 (181~1023)
             use_serial: 시리얼 통신 사용 여부
             show_messages: 디버그 메시지 표시 여부
+            show_window: 영상 창 표시 여부 (False면 터미널에서 키 입력)
+            key_poll_interval: 몇 프레임마다 키 입력을 확인할지 (1이면 매 프레임)
+            use_gstreamer: GStreamer(하드웨어 디코딩)로 영상 읽기 시도 여부
+            gstreamer_pipeline: 직접 지정할 파이프라인 (None이면 video_source로 생성)
+            model_precision: 차선 인식 모델 정밀도 ('fp32' 또는 'int8')
+            model_performance_hint: OpenVINO 성능 힌트 ('LATENCY' 또는 'THROUGHPUT')
+                                    추론이 카메라보다 느릴 때 THROUGHPUT이면 여러 프레임을
+                                    동시에 추론해 처리량이 늘어남 (프레임당 지연은 조금 늘 수 있음)
         """
         self.video_source = video_source
         self.initial_speed = initial_speed
         self.use_serial = use_serial
         self.show_messages = show_messages
+        self.show_window = show_window
+        self.key_poll_interval = max(1, key_poll_interval)
+        self.use_gstreamer = use_gstreamer or gstreamer_pipeline is not None
+        self.gstreamer_pipeline = gstreamer_pipeline
+        self.model_precision = model_precision
+        self.model_performance_hint = model_performance_hint
 
         # 컴포넌트
         self.car_controller: Optional[BrainAICarController] = None
@@ -61,6 +129,28 @@ class BrainAICarDeployment:
         self.prediction_result = None
         self.latency_avg = 0.0
 
+        # 캡처 스레드 (최신 프레임 1장만 보관, 처리 못한 이전 프레임은 버림)
+        self._capture_thread: Optional[threading.Thread] = None
+        self._frame_lock = threading.Lock()
+        self._frame_event = threading.Event()
+        self._latest_frame = None
+
+        # 추론 스레드 (입력/출력 슬롯 각 1개, 새 값이 오면 덮어씀)
+        self._pred_thread: Optional[threading.Thread] = None
+        self._pred_lock = threading.Lock()
+        self._pred_event = threading.Event()
+        self._pred_input = None
+        self._pred_output = None
+        self._pred_failed = False  # 추론 중 예외 발생 여부 (메인 루프에서 정지 처리)
+        self._stale_frames = 0  # 새 예측 결과 없이 지난 프레임 수
+        self._pred_buffers = []  # 재사용할 프레임 복사 버퍼 (매 프레임 새로 할당하지 않음)
+        self._pred_generation = 0  # 's' 키로 정지할 때마다 1씩 증가
+        self._pred_generations = deque()  # 제출한 추론 요청마다 제출 당시의 세대 (제출 순서대로)
+
+        # 오버레이 글자 캐시 (상태/모델/조향 문구는 값이 몇 가지뿐이라 한 번만 그림)
+        self._text_cache = TextSpriteCache()
+        self._frame_shape = None
+
         logger.info("BrainAICarDeployment 초기화 완료")
 
     def initialize_components(self) -> bool:
@@ -87,10 +177,14 @@ class BrainAICarDeployment:
                 self.car_controller.connect_microbit()
 
             # Lane Detection 초기화
-            self.lane_detection = LaneDetection(models_base_dir='models')
+            self.lane_detection = LaneDetection(
+                models_base_dir='models',
+                precision=self.model_precision,
+                performance_hint=self.model_performance_hint
+            )
 
             # 비디오 캡처 초기화
-            self.video_capture = cv2.VideoCapture(self.video_source)
+            self.video_capture = self._open_video_capture()
             if not self.video_capture.isOpened():
                 logger.error("비디오 스트림 열기 실패")
                 return False
@@ -102,27 +196,181 @@ class BrainAICarDeployment:
             logger.error(f"컴포넌트 초기화 실패: {str(e)}")
             return False
 
+    def _open_video_capture(self) -> cv2.VideoCapture:
+        """
+        비디오 캡처 열기 (GStreamer 사용 시 실패하면 기본 방식으로 대체)
+
+        Returns:
+            열린 cv2.VideoCapture 객체
+        """
+        if self.use_gstreamer:
+            pipeline = self.gstreamer_pipeline or build_gstreamer_pipeline(self.video_source)
+            capture = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if capture.isOpened():
+                logger.info(f"GStreamer 파이프라인 사용: {pipeline}")
+                return capture
+
+            capture.release()
+            logger.warning("GStreamer 파이프라인 열기 실패 - 기본 VideoCapture로 대체")
+
+        return cv2.VideoCapture(self.video_source)
+
+    def _start_capture(self) -> None:
+        """백그라운드 캡처 스레드 시작"""
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+
+    def _capture_loop(self) -> None:
+        """카메라에서 계속 프레임을 읽어 최신 프레임 슬롯에 덮어쓰기"""
+        while self.is_running:
+            ret, frame = self.video_capture.read()
+            if not ret:
+                logger.warning("프레임 읽기 실패")
+                time.sleep(0.01)
+                continue
+
+            with self._frame_lock:
+                self._latest_frame = frame
+            self._frame_event.set()
+
+    def _get_latest_frame(self, timeout: float = 0.1) -> Optional[cv2.Mat]:
+        """
+        캡처 스레드가 넣어둔 최신 프레임 가져오기
+
+        Args:
+            timeout: 새 프레임을 기다릴 최대 시간 (초)
+
+        Returns:
+            최신 프레임 (새 프레임이 없으면 None)
+        """
+        if not self._frame_event.wait(timeout):
+            return None
+
+        with self._frame_lock:
+            frame = self._latest_frame
+            self._latest_frame = None
+            self._frame_event.clear()
+        return frame
+
+    def _start_inference(self) -> None:
+        """백그라운드 추론 스레드 시작"""
+        self._pred_thread = threading.Thread(target=self._inference_loop, daemon=True)
+        self._pred_thread.start()
+
+    def _inference_loop(self) -> None:
+        """
+        입력 슬롯의 최신 프레임을 비동기로 추론하여 출력 슬롯에 저장
+
+        💡 LaneDetection의 submit/poll로 추론 요청 여러 개를 번갈아 사용
+           - 추론이 도는 동안 새 프레임이 오면 바로 전처리해서 다음 요청에 넣음
+           - 새 프레임이 없으면 진행 중인 추론을 기다려 결과를 바로 내보냄 (조향이 늦어지지 않도록)
+        """
+        detector = self.lane_detection
+        while self.is_running:
+            # 진행 중인 추론이 있는데 새 프레임이 없거나 요청이 모두 사용 중이면 결과부터 받기
+            if detector.pending_count and (
+                not self._pred_event.is_set() or not detector.can_submit()
+            ):
+                self._collect_prediction()
+                continue
+
+            if not self._pred_event.wait(0.1):
+                continue
+
+            with self._pred_lock:
+                frame = self._pred_input
+                generation = self._pred_generation
+                self._pred_input = None
+                self._pred_event.clear()
+            if frame is None:
+                continue
+
+            try:
+                detector.submit(frame)
+                self._pred_generations.append(generation)
+                submit_failed = False
+            except Exception:
+                logger.exception("추론 실패 - 차량을 정지합니다")
+                submit_failed = True
+
+            with self._pred_lock:
+                self._pred_buffers.append(frame)  # 전처리가 끝났으니 버퍼 반납
+                if submit_failed and generation == self._pred_generation:
+                    self._pred_failed = True
+
+    def _collect_prediction(self) -> None:
+        """가장 먼저 제출한 추론의 결과를 기다렸다가 출력 슬롯에 저장"""
+        generation = self._pred_generations.popleft()
+        try:
+            raw_result = self.lane_detection.poll()
+            prediction = self.lane_detection.postprocess(raw_result)
+        except Exception:
+            logger.exception("추론 실패 - 차량을 정지합니다")
+            prediction = None
+
+        with self._pred_lock:
+            if generation != self._pred_generation:
+                return  # 정지 전에 제출한 프레임의 결과는 버림
+            if prediction is not None:
+                self._pred_output = prediction
+            else:
+                self._pred_failed = True
+
     def process_frame(self, frame: cv2.Mat) -> None:
         """
         프레임 처리 및 차량 제어
 
+        추론은 별도 스레드에서 수행하므로 기다리지 않고,
+        새 예측 결과가 나와 있을 때만 조향/속도를 갱신합니다.
+
         Args:
             frame: 입력 영상 프레임
         """
         if not self.is_started:
             return
 
-        # 차선 인식 예측
-        raw_result = self.lane_detection.predict(frame)
-        self.prediction_result = self.lane_detection.postprocess(raw_result)
+        # 추론 스레드에 최신 프레임 전달 (이전 프레임이 남아 있으면 덮어씀)
+        # 이후 draw_overlay가 프레임에 직접 그리므로 복사본을 전달
+        # (복사 버퍼는 반납된 것을 재사용, 동시에 최대 3개만 존재)
+        with self._pred_lock:
+            buffer = self._pred_buffers.pop() if self._pred_buffers else None
+        if buffer is None or buffer.shape != frame.shape:
+            buffer = np.empty_like(frame)
+        np.copyto(buffer, frame)
+
+        with self._pred_lock:
+            if self._pred_input is not None:
+                self._pred_buffers.append(self._pred_input)  # 처리 안 된 이전 프레임 버퍼 반납
+            self._pred_input = buffer
+            prediction = self._pred_output
+            self._pred_output = None
+            pred_failed = self._pred_failed
+            self._pred_failed = False
+        self._pred_event.set()
+
+        if prediction is None:
+            # 💡 추론이 실패했거나 한동안 새 결과가 없으면 마지막 조향/속도로 계속 달리지 않도록 정지
+            self._stale_frames += 1
+            if pred_failed or self._stale_frames >= self.MAX_STALE_FRAMES:
+                if self.car_controller.current_motor_speed != 0:
+                    if not pred_failed:
+                        logger.warning("새 예측 결과가 없어 차량을 정지합니다")
+                    self.car_controller.control_speed(0)
+            return
+        self._stale_frames = 0
+        self.prediction_result = prediction
 
         # 레이턴시 업데이트
         self.latency_avg = self.lane_detection.latency
 
         # 조향 제어: prediction_result를 조향 값으로 변환
         # postprocess 결과는 0-100 스케일이므로 -1.0~1.0으로 변환
-        steering_value = (self.prediction_result - 50.0) / 50.0
-        steering_value = max(-1.0, min(1.0, steering_value))
+        # (max/min 함수 호출 대신 비교식으로 바로 -1.0~1.0 범위 제한)
+        steering_value = (self.prediction_result - 50.0) * 0.02
+        if steering_value < -1.0:
+            steering_value = -1.0
+        elif steering_value > 1.0:
+            steering_value = 1.0
         self.car_controller.control_steering(steering_value)
 
         # DC 모터 제어: 레이턴시가 낮으면 전진
@@ -144,29 +392,25 @@ class BrainAICarDeployment:
         Returns:
             오버레이가 그려진 프레임
         """
-        overlay = frame.copy()
-        height, width = frame.shape[:2]
-
-        # 반투명 배경
-        cv2.rectangle(
-            overlay,
-            (10, 10),
-            (width - 10, 150),
-            (0, 0, 0),
-            -1
-        )
-        cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+        # 스트림 해상도는 바뀌지 않으므로 첫 프레임에서 한 번만 확인
+        if self._frame_shape is None:
+            self._frame_shape = frame.shape[:2]
+        width = self._frame_shape[1]
+
+        # 반투명 배경 (검은색 30% + 원본 70% = 원본 x 0.7)
+        # 프레임 전체를 복사/합성하지 않고 배경 영역만 직접 어둡게 처리
+        roi = frame[10:151, 10:width - 9]
+        np.multiply(roi, 0.7, out=roi, casting='unsafe')
 
         # 상태 정보
         y_offset = 35
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.7
-        thickness = 2
+        font = self.OVERLAY_FONT
+        font_scale = self.OVERLAY_FONT_SCALE
+        thickness = self.OVERLAY_THICKNESS
 
         # 자율주행 상태
-        status = "BrainAI Car Autonomous Driving: ON" if self.is_started else "Driving: OFF"
-        status_color = (0, 255, 0) if self.is_started else (128, 128, 128)
-        cv2.putText(
+        status, status_color = self.STATUS_ON if self.is_started else self.STATUS_OFF
+        self._text_cache.put_text(
             frame,
             status,
             (20, y_offset),
@@ -179,31 +423,31 @@ class BrainAICarDeployment:
 
         if self.is_started and self.prediction_result is not None:
             # 현재 모델
-            cv2.putText(
+            self._text_cache.put_text(
                 frame,
                 f"Model: {self.lane_detection.current_model}",
                 (20, y_offset),
                 font,
                 font_scale,
-                (0, 255, 255),
+                self.MODEL_COLOR,
                 thickness
             )
             y_offset += 35
 
             # 조향 정보
             steering_text = f"Steering: {self.car_controller.current_servo_angle}"
-            cv2.putText(
+            self._text_cache.put_text(
                 frame,
                 steering_text,
                 (20, y_offset),
                 font,
                 font_scale,
-                (255, 255, 0),
+                self.STEERING_COLOR,
                 thickness
             )
             y_offset += 35
 
-            # 레이턴시
+            # 레이턴시 (매 프레임 값이 바뀌므로 캐시하지 않고 직접 그림)
             latency_ms = self.latency_avg * 1000
             cv2.putText(
                 frame,
@@ -211,7 +455,7 @@ class BrainAICarDeployment:
                 (20, y_offset),
                 font,
                 font_scale,
-                (255, 100, 100),
+                self.LATENCY_COLOR,
                 thickness
             )
 
@@ -240,6 +484,17 @@ class BrainAICarDeployment:
                 # 정지 시 차량 멈춤
                 self.car_controller.control_speed(0)
 
+                # 정지 전 예측 결과가 재시작 직후 조향에 쓰이지 않도록 비우기
+                # 💡 세대를 올려두면 아직 추론 중인 정지 전 프레임의 결과도 나중에 버려져요
+                with self._pred_lock:
+                    self._pred_generation += 1
+                    if self._pred_input is not None:
+                        self._pred_buffers.append(self._pred_input)
+                    self._pred_input = None
+                    self._pred_output = None
+                    self._pred_failed = False
+                self._stale_frames = 0
+
         elif key == ord('1'):
             logger.info("모델 전환: laneD1")
             self.lane_detection.switch_model("laneD1", manual_override=True)
@@ -250,6 +505,29 @@ class BrainAICarDeployment:
 
         return False
 
+    def _poll_console_key(self) -> int:
+        """
+        창 없이 실행할 때 터미널 키 입력 확인 (기다리지 않음)
+
+        Returns:
+            입력된 키 값 (입력이 없으면 -1)
+        """
+        if msvcrt is not None:
+            if msvcrt.kbhit():
+                return ord(msvcrt.getwch())
+            return -1
+
+        # 리눅스/맥: 입력 후 Enter를 누르면 읽음
+        try:
+            ready, _, _ = select.select([sys.stdin], [], [], 0)
+        except (OSError, ValueError):  # Jupyter 등 터미널이 아닌 환경
+            return -1
+        if ready:
+            line = sys.stdin.readline().strip()
+            if line:
+                return ord(line[0])
+        return -1
+
     def run(self) -> None:
         """메인 실행 루프"""
         logger.info("=" * 60)
@@ -267,14 +545,15 @@ class BrainAICarDeployment:
             return
 
         self.is_running = True
+        self._start_capture()
+        self._start_inference()
+        frame_index = 0
 
         try:
             while self.is_running:
-                # 프레임 읽기
-                ret, frame = self.video_capture.read()
-                if not ret:
-                    logger.warning("프레임 읽기 실패")
-                    time.sleep(0.01)
+                # 최신 프레임 가져오기 (읽기는 캡처 스레드가 담당)
+                frame = self._get_latest_frame()
+                if frame is None:
                     continue
 
                 # 프레임 처리
@@ -286,11 +565,22 @@ class BrainAICarDeployment:
                 # 오버레이 그리기
                 frame = self.draw_overlay(frame)
 
-                # 화면 출력
-                cv2.imshow(VIDEO_WINDOW_NAME, frame)
+                # 키보드 입력은 N프레임마다 한 번만 확인 (30fps에서 3프레임 = 0.1초)
+                frame_index += 1
+                poll_key = frame_index % self.key_poll_interval == 0
+
+                if self.show_window:
+                    # 화면 출력
+                    cv2.imshow(VIDEO_WINDOW_NAME, frame)
+                    if not poll_key:
+                        continue
+                    key = cv2.waitKey(1) & 0xFF
+                elif poll_key:
+                    key = self._poll_console_key() & 0xFF
+                else:
+                    continue
 
                 # 키보드 입력 처리
-                key = cv2.waitKey(1) & 0xFF
                 if self.handle_keyboard_input(key):
                     break
 
@@ -309,6 +599,13 @@ class BrainAICarDeployment:
         """리소스 정리"""
         logger.info("리소스 정리 중...")
 
+        # 캡처 스레드 종료 후 카메라 해제
+        self.is_running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+        if self._pred_thread is not None:
+            self._pred_thread.join(timeout=1.0)
+
         if self.video_capture is not None:
             self.video_capture.release()
             logger.info("✓ 비디오 캡처 해제")
@@ -17,33 +17,136 @@ BrainAI Car 자율주행 도로인식 데이터 뷰어 및 불량 데이터 삭
 import cv2
 import json
 import os
-import glob
 import time
+import queue
 import threading
 import csv
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
-from collections import deque
+from collections import OrderedDict
 from datetime import datetime
 
+from .sprites import TextSpriteCache
+
+# libjpeg-turbo가 설치되어 있으면 JPEG 디코딩에 사용 (없으면 cv2.imread)
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
+# 프리로드 프로세스마다 하나씩 만드는 TurboJPEG 객체 (_init_decode_process에서 생성)
+_process_turbo_jpeg = None
+
+
+def _decode_frame(img_path, imread_flag, decode_factor, display_max_width, turbo_jpeg=None):
+    """
+    이미지 디코딩 후 화면 표시 크기로 축소
+    
+    💡 캐시에 작은 이미지를 저장하면 이후 복사/그리기 작업도 모두 빨라짐
+    
+    Args:
+        img_path: 이미지 경로
+        imread_flag: cv2.imread 플래그 (축소 디코딩 포함)
+        decode_factor: 축소 디코딩 비율 (1, 2, 4, 8)
+        display_max_width: 화면 표시 최대 너비 (None이면 축소 안 함)
+        turbo_jpeg: TurboJPEG 객체 (None이면 cv2.imread만 사용)
+        
+    Returns:
+        numpy.ndarray: 이미지 (실패 시 None)
+    """
+    image = None
+    if turbo_jpeg is not None and img_path.lower().endswith(('.jpg', '.jpeg')):
+        # turbojpeg: 축소 디코딩(scaling_factor)을 직접 지원하고 cv2보다 빠름 (기본 BGR 출력)
+        try:
+            with open(img_path, 'rb') as f:
+                image = turbo_jpeg.decode(f.read(), scaling_factor=(1, decode_factor))
+        except (OSError, ValueError):
+            image = None  # 손상된 파일 등은 cv2로 다시 시도
+    
+    if image is None:
+        image = cv2.imread(img_path, imread_flag)
+    if image is None or not display_max_width:
+        return image
+    
+    height, width = image.shape[:2]
+    if width > display_max_width:
+        scale = display_max_width / width
+        image = cv2.resize(
+            image, (display_max_width, int(height * scale)),
+            interpolation=cv2.INTER_AREA
+        )
+    return image
+
+
+@functools.lru_cache(maxsize=64)
+def _text_size(text, font_scale, thickness):
+    """
+    cv2.getTextSize 결과 캐시 (FONT_HERSHEY_SIMPLEX)
+    
+    💡 고정 문구는 크기가 바뀌지 않으므로 매 프레임 다시 계산할 필요 없음
+    
+    Args:
+        text: 문자열
+        font_scale: 글자 크기
+        thickness: 글자 두께
+        
+    Returns:
+        tuple: ((너비, 높이), baseline)
+    """
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
+
+def _init_decode_process():
+    """프리로드 프로세스 시작 시 한 번 실행 (프로세스별 TurboJPEG 준비)"""
+    global _process_turbo_jpeg
+    if TurboJPEG is not None:
+        try:
+            _process_turbo_jpeg = TurboJPEG()
+        except (OSError, RuntimeError):
+            _process_turbo_jpeg = None
+
+
+def _decode_in_process(img_path, imread_flag, decode_factor, display_max_width):
+    """프리로드 프로세스에서 실행되는 디코딩 작업"""
+    return _decode_frame(
+        img_path, imread_flag, decode_factor, display_max_width, _process_turbo_jpeg
+    )
+
 
 class LaneDataViewer:
     """자율주행 데이터 시각화 및 정제 도구"""
     
     # 상수 정의
     DELETE_RANGE = 10  # Shift+D로 삭제할 프레임 범위 (±N)
-    CACHE_REMOVE_COUNT = 10  # 캐시 초과 시 제거할 항목 수
     PRELOAD_AHEAD_FRAMES = 50  # 앞쪽으로 프리로드할 프레임 수
     PRELOAD_BEHIND_FRAMES = 10  # 뒤쪽으로 프리로드할 프레임 수
     SKIP_FRAME_COUNT = 10  # W/S 키로 건너뛸 프레임 수
+    PAUSED_WAIT_MS = 100  # 정지 중 키 입력/창 닫힘 확인 간격 (ms)
+    RAW_CACHE_DIR = ".raw_cache"  # 디코딩된 프레임(.npy) 저장 폴더 이름
+    ANNOTATION_LOAD_WORKERS = 16  # JSON을 동시에 읽을 스레드 수
+    MAX_PRELOAD_WORKERS = 4  # 기본 프리로드 스레드 수 상한
+    DELETE_WORKERS = 16  # 파일을 동시에 삭제할 스레드 수
+    DELETION_LOG_QUEUE_SIZE = 256  # 기록 대기 중인 삭제 이벤트 최대 개수
+    HELP_TEXT = "[W/S] 10Frames  [Shift+D] Delete +/-10Frames  [Space] Play/Pause  [Q] Quit"
             
-    def __init__(self, lane_dir="data_merged_laneD1", cache_size=100):
+    def __init__(self, lane_dir="data_merged_laneD1", cache_size=100, use_raw_cache=False,
+                 display_max_width=1280, preload_processes=0, preload_workers=None):
         """
         초기화
         
         Args:
             lane_dir: 데이터 폴더 경로
             cache_size: 캐시할 프레임 개수
+            use_raw_cache: 디코딩한 프레임을 .npy로 저장해두고 재사용할지 여부
+                           (두 번째 실행부터 JPEG 디코딩 없이 바로 읽음, 디스크 사용량 증가)
+            display_max_width: 화면 표시 최대 너비 (더 큰 이미지는 로드할 때 한 번만 축소,
+                               None이면 원본 크기 유지)
+            preload_processes: 프리로드 디코딩에 쓸 프로세스 수
+                               (0이면 프리로드 스레드에서 직접 디코딩)
+            preload_workers: 프리로드 스레드 수
+                             (None이면 CPU 코어 수, 최대 MAX_PRELOAD_WORKERS개)
         """
         self.current_lane = None
         self.current_index = 0
@@ -51,24 +154,54 @@ class LaneDataViewer:
         self.fps = 12
         self.frame_delay = 1.0 / self.fps
         self.cache_size = cache_size
+        self.use_raw_cache = use_raw_cache
+        self.raw_cache_dir = None
+        self.display_max_width = display_max_width
+        self._imread_flag = None  # 첫 이미지 크기를 보고 정하는 디코딩 축소 옵션
+        self._decode_factor = 1   # 축소 디코딩 비율 (1, 2, 4, 8)
+        self._turbo_jpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._turbo_jpeg = TurboJPEG()
+            except (OSError, RuntimeError):
+                self._turbo_jpeg = None
         
         # 파일 매핑
         self.available_files = []
         self.image_map = {}
         self.annotation_map = {}
+        self.steering_map = {}  # {파일 기본 이름: steering 값} (로드 시 한 번에 읽음)
         self.image_files = []
         
         # 캐싱 시스템
-        self.image_cache = {}
-        self.annotation_cache = {}
-        self.preload_queue = deque()
+        # OrderedDict: 가장 오래 안 쓴 항목이 맨 앞 (LRU, 제거가 O(1))
+        # 키는 파일 기본 이름 (삭제로 인덱스가 밀려도 다른 프레임 캐시는 그대로 사용)
+        self.image_cache = OrderedDict()
+        self.annotation_cache = OrderedDict()
+        self.preload_queue = queue.Queue()  # 내부에 잠금이 있어 별도 lock 불필요
+        self.preload_inflight = set()  # 큐에 들어가 있거나 로드 중인 파일 이름 (중복 추가 방지)
         self.cache_lock = threading.Lock()
+        self.preload_processes = preload_processes
+        self._decode_pool = None
+        if preload_workers is None:
+            preload_workers = min(self.MAX_PRELOAD_WORKERS, os.cpu_count() or 1)
+        self.preload_workers = max(1, preload_workers)
+        self._preload_threads = []
+        
+        # 고정 UI 캐시 ((높이, 너비)별로 한 번만 생성)
+        self._overlay_cache = {}
+        self._text_cache = TextSpriteCache()
+        self._display_buf = None  # 화면 표시용 버퍼 (매 프레임 새로 할당하지 않고 재사용)
+        self._last_render_key = None  # 마지막으로 그린 화면의 상태 (같으면 다시 그리지 않음)
+        self._last_frame = None
 
         # 스레드 종료 플래그
         self.stop_preload = threading.Event()
         
         # 삭제 관련
         self.deletion_log_file = None
+        self._log_queue = queue.Queue(maxsize=self.DELETION_LOG_QUEUE_SIZE)
+        self._log_thread = None
         self.total_deleted_count = 0  # 세션 중 삭제된 총 파일 수
         self.initial_file_count = 0   # 초기 파일 개수
         
@@ -90,16 +223,38 @@ class LaneDataViewer:
         
         # 삭제 로그 파일 경로 설정
         self.deletion_log_file = os.path.join(self.current_lane, "deletion_log.csv")
+        
+        # 삭제 로그 기록 스레드 (파일 쓰기를 화면 스레드에서 분리)
+        self._log_thread = threading.Thread(target=self._log_writer, daemon=True)
+        self._log_thread.start()
+        
+        # 디코딩 프레임 캐시 폴더 (데이터 폴더 안에 숨김 폴더로 생성)
+        if self.use_raw_cache:
+            self.raw_cache_dir = os.path.join(self.current_lane, self.RAW_CACHE_DIR)
+            os.makedirs(self.raw_cache_dir, exist_ok=True)
             
         # 백그라운드 프리로딩 시작
         if self.available_files:
             try:
-                self.preload_thread = threading.Thread(
-                    target=self._preload_worker, 
-                    daemon=True
-                )
-                self.preload_thread.start()
-                print("   ✅ 프리로딩 스레드 시작됨")
+                # 디코딩을 여러 프로세스에 나눠서 실행 (GIL 영향 없이 CPU 코어 모두 사용)
+                # 이 경우 스레드는 작업을 나눠주기만 하므로 하나면 충분
+                num_threads = self.preload_workers
+                if self.preload_processes > 0:
+                    self._decode_pool = ProcessPoolExecutor(
+                        max_workers=self.preload_processes,
+                        initializer=_init_decode_process
+                    )
+                    num_threads = 1
+
+                # 디코딩 중에는 GIL이 풀리므로 여러 스레드가 같은 큐를 나눠서 처리
+                for _ in range(num_threads):
+                    thread = threading.Thread(
+                        target=self._preload_worker, 
+                        daemon=True
+                    )
+                    thread.start()
+                    self._preload_threads.append(thread)
+                print(f"   ✅ 프리로딩 스레드 {num_threads}개 시작됨")
             except Exception as e:
                 print(f"⚠️  프리로딩 스레드 시작 실패: {e}")
                 print("   프로그램은 계속 실행되지만 성능이 저하될 수 있습니다.")
@@ -135,22 +290,34 @@ class LaneDataViewer:
                 search_img_dir = lane_dir
                 search_ann_dir = lane_dir
             
-            # 이미지 파일 찾기
-            image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.bmp', '*.tiff']
+            # 이미지/JSON 파일 찾기 (폴더를 한 번만 읽고 확장자로 분류)
+            image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
             self.image_files = []
+            json_files = []
             
-            for ext in image_extensions:
-                pattern = os.path.join(search_img_dir, ext)
-                found_files = glob.glob(pattern)
-                self.image_files.extend(found_files)
+            # (glob과 같이 '.'으로 시작하는 숨김 파일은 제외)
+            with os.scandir(search_img_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext in image_extensions:
+                        self.image_files.append(entry.path)
+                    elif ext == '.json' and search_ann_dir == search_img_dir:
+                        json_files.append(entry.path)
             
             if not self.image_files:
                 print(f"❌ 이미지 파일을 찾을 수 없습니다: {search_img_dir}")
-                print(f"   지원 확장자: {image_extensions}")
+                print(f"   지원 확장자: {sorted(image_extensions)}")
                 return False
             
-            # JSON 파일 찾기
-            json_files = glob.glob(os.path.join(search_ann_dir, "*.json"))
+            if search_ann_dir != search_img_dir:
+                with os.scandir(search_ann_dir) as entries:
+                    json_files = [
+                        entry.path for entry in entries
+                        if not entry.name.startswith('.')
+                        and os.path.splitext(entry.name)[1].lower() == '.json'
+                    ]
             
             # 파일명 매핑 생성
             self.image_map = {}
@@ -164,6 +331,13 @@ class LaneDataViewer:
                 base_name = Path(json_file).stem
                 self.annotation_map[base_name] = json_file
             
+            # 모든 JSON의 steering 값을 한 번에 읽기 (재생 중에는 파일을 열지 않음)
+            # 파일 읽기는 GIL을 놓으므로 스레드로 동시에 읽으면 빨라짐
+            with ThreadPoolExecutor(max_workers=self.ANNOTATION_LOAD_WORKERS) as executor:
+                self.steering_map = dict(
+                    executor.map(self._parse_one_json, self.annotation_map.items())
+                )
+            
             # 정렬된 파일 목록 생성
             self.available_files = sorted(self.image_map.keys())
             
@@ -171,6 +345,12 @@ class LaneDataViewer:
                 print("❌ 유효한 이미지 파일이 없습니다")
                 return False
             
+            # 디코딩 축소 옵션은 첫 이미지 크기로 한 번만 결정
+            if self._imread_flag is None:
+                self._imread_flag, self._decode_factor = self._choose_imread_flag(
+                    self.image_map[self.available_files[0]]
+                )
+            
             # 통계 정보
             files_with_annotations = len([
                 name for name in self.available_files 
@@ -232,6 +412,25 @@ class LaneDataViewer:
             print("❌ 삭제할 파일이 없습니다.")
             return 0
         
+        # 디코딩 프레임 캐시도 함께 정리 (삭제 개수에는 포함하지 않음)
+        if self.raw_cache_dir:
+            file_bases = self.available_files[start_idx:end_idx + 1]
+            
+            # ⚠️ 메모리 맵으로 열려 있는 .npy는 윈도우에서 지울 수 없어요
+            #    캐시에서 먼저 빼서 맵을 닫은 뒤 지우기 (화면에는 복사본이 표시됨)
+            with self.cache_lock:
+                for file_base in file_bases:
+                    self.image_cache.pop(file_base, None)
+            
+            for file_base in file_bases:
+                try:
+                    os.remove(self._raw_cache_path(file_base))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    # 캐시 파일을 못 지워도 이미지/JSON 삭제는 계속 진행
+                    print(f"⚠️  캐시 파일 삭제 실패: {file_base} - {e}")
+        
         # 즉시 삭제 실행
         deleted_count = self._execute_deletion(files_to_delete)
         
@@ -250,14 +449,16 @@ class LaneDataViewer:
         deleted_files = []
         failed_files = []
         
-        for file_path in files_to_delete:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    deleted_files.append(file_path)
-            except Exception as e:
-                print(f"❌ 삭제 실패: {os.path.basename(file_path)} - {e}")
+        # 여러 스레드에서 동시에 삭제 (삭제 중에는 GIL이 풀려 디스크 대기 시간이 겹침)
+        with ThreadPoolExecutor(max_workers=self.DELETE_WORKERS) as executor:
+            results = list(executor.map(self._try_remove, files_to_delete))
+        
+        for file_path, removed, error in results:
+            if error is not None:
+                print(f"❌ 삭제 실패: {os.path.basename(file_path)} - {error}")
                 failed_files.append(file_path)
+            elif removed:
+                deleted_files.append(file_path)
         
         # 삭제 로그 저장
         if deleted_files:
@@ -269,14 +470,17 @@ class LaneDataViewer:
         if failed_files:
             print(f"⚠️  실패: {len(failed_files)}개 파일")
         
-        # 캐시 클리어 및 데이터 재로드
-        with self.cache_lock:
-            self.image_cache.clear()
-            self.annotation_cache.clear()
-            self.preload_queue.clear()
+        # 폴더를 다시 읽지 않고 삭제된 파일만 목록에서 제거
+        self._remove_deleted_from_maps(deleted_files)
         
-        # 데이터 재로드
-        self.load_lane_data(self.current_lane)
+        # 삭제된 프레임만 캐시에서 제거 (나머지 프레임 캐시는 그대로 사용)
+        # 큐에 남은 삭제 프레임은 프리로드 스레드가 건너뜀
+        with self.cache_lock:
+            for file_path in deleted_files:
+                base_name = Path(file_path).stem
+                if base_name not in self.image_map:
+                    self.image_cache.pop(base_name, None)
+                    self.annotation_cache.pop(base_name, None)
                 
         # 현재 인덱스를 삭제 범위 끝 다음으로 조정
         if self.current_index >= len(self.available_files):
@@ -284,19 +488,87 @@ class LaneDataViewer:
         else:
             # 삭제된 구간을 건너뛰고 다음 프레임으로 이동
             # (삭제 전 end_idx + 1에 해당하는 위치)
-            pass  # 현재 인덱스 유지 (재로드 후 자동으로 조정됨)
+            pass  # 현재 인덱스 유지 (앞쪽 삭제 구간만큼 목록이 당겨짐)
+        
+        # 새 위치 주변 다시 프리로드
+        if self.available_files:
+            self._queue_preload(
+                max(0, self.current_index - 5),
+                min(self.current_index + 20, len(self.available_files))
+            )
 
         print(f"📍 현재 위치: {self.current_index + 1}/{len(self.available_files)}")
         
         return len(deleted_files)
     
+    def _remove_deleted_from_maps(self, deleted_files):
+        """
+        삭제된 파일을 파일 매핑과 목록에서 제거 (load_lane_data 재실행 대신)
+        
+        Args:
+            deleted_files: 삭제된 파일 경로 리스트
+        """
+        deleted_paths = set(deleted_files)
+        
+        for file_path in deleted_files:
+            base_name = Path(file_path).stem
+            if self.image_map.get(base_name) == file_path:
+                del self.image_map[base_name]
+            elif self.annotation_map.get(base_name) == file_path:
+                del self.annotation_map[base_name]
+                self.steering_map.pop(base_name, None)
+        
+        self.image_files = [f for f in self.image_files if f not in deleted_paths]
+        
+        # 정렬 순서는 그대로이므로 다시 정렬할 필요 없음
+        self.available_files = [
+            name for name in self.available_files if name in self.image_map
+        ]
+    
+    @staticmethod
+    def _try_remove(file_path):
+        """
+        파일 하나 삭제 (삭제 스레드에서 실행)
+        
+        Args:
+            file_path: 삭제할 파일 경로
+            
+        Returns:
+            tuple: (파일 경로, 삭제 여부, 오류 (없으면 None))
+        """
+        try:
+            os.remove(file_path)
+            return file_path, True, None
+        except FileNotFoundError:
+            return file_path, False, None  # 이미 없는 파일은 건너뜀
+        except Exception as e:
+            return file_path, False, e
+    
     def _save_deletion_log(self, deleted_files):
         """
-        삭제 로그를 CSV 파일로 저장
+        삭제 로그를 기록 스레드에 전달 (파일 쓰기는 _log_writer에서 실행)
         
         Args:
             deleted_files: 삭제된 파일 경로 리스트
         """
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = [
+            [timestamp, self.current_index, os.path.basename(file_path)]
+            for file_path in deleted_files
+        ]
+        
+        if self._log_thread is None:
+            self._write_deletion_log(rows)
+        else:
+            self._log_queue.put(rows)  # 큐가 가득 차면 기록 스레드가 따라잡을 때까지 대기
+    
+    def _write_deletion_log(self, rows):
+        """
+        삭제 로그를 CSV 파일로 저장
+        
+        Args:
+            rows: [timestamp, frame_index, deleted_file] 행 리스트
+        """
         try:
             # 로그 파일이 없으면 헤더 작성
             file_exists = os.path.exists(self.deletion_log_file)
@@ -308,20 +580,40 @@ class LaneDataViewer:
                 if not file_exists:
                     writer.writerow(['timestamp', 'frame_index', 'deleted_file'])
                 
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                for file_path in deleted_files:
-                    writer.writerow([
-                        timestamp, 
-                        self.current_index, 
-                        os.path.basename(file_path)
-                    ])
+                writer.writerows(rows)
             
             print(f"📝 삭제 로그 저장: {self.deletion_log_file}")
             
         except Exception as e:
             print(f"⚠️  로그 저장 실패: {e}")
     
+    def _log_writer(self):
+        """
+        백그라운드 삭제 로그 기록 스레드
+        
+        연속 삭제로 쌓인 이벤트를 모아서 파일을 한 번만 열고 기록
+        (None을 받으면 남은 로그를 모두 쓰고 종료)
+        """
+        running = True
+        while running:
+            batch = self._log_queue.get()
+            if batch is None:
+                break
+            rows = list(batch)
+            
+            # 잠깐 기다리며 뒤따라온 삭제 이벤트까지 함께 기록
+            try:
+                while True:
+                    batch = self._log_queue.get(timeout=0.1)
+                    if batch is None:
+                        running = False
+                        break
+                    rows.extend(batch)
+            except queue.Empty:
+                pass
+            
+            self._write_deletion_log(rows)
+    
     def _queue_preload(self, start_idx, end_idx):
         """
         프리로딩 큐에 이미지 추가
@@ -330,24 +622,229 @@ class LaneDataViewer:
             start_idx: 시작 인덱스
             end_idx: 종료 인덱스
         """
-        for i in range(start_idx, min(end_idx, len(self.available_files))):
-            if i not in self.image_cache:
-                self.preload_queue.append(i)
+        with self.cache_lock:
+            for file_base in self.available_files[start_idx:end_idx]:
+                # 이미 캐시에 있거나 큐에 들어간 프레임은 다시 넣지 않음
+                if file_base not in self.image_cache and file_base not in self.preload_inflight:
+                    self.preload_inflight.add(file_base)
+                    self.preload_queue.put(file_base)
     
     def _preload_worker(self):
         """백그라운드 스레드로 이미지 프리로드"""
         while not self.stop_preload.is_set():  # 종료 조건 추가
             try:
-                if self.preload_queue:
-                    idx = self.preload_queue.popleft()
-                    self._load_frame_data(idx)
-                else:
-                    time.sleep(0.01)
+                # 큐가 빌 때는 잠들어 있다가 새 작업이 들어오면 바로 깨어남
+                # (timeout마다 한 번씩 종료 신호 확인)
+                try:
+                    file_base = self.preload_queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                
+                if self._decode_pool is not None:
+                    self._preload_batch_in_processes(self._take_preload_batch(file_base))
+                    continue
+                
+                try:
+                    self._load_file_data(file_base)
+                finally:
+                    with self.cache_lock:
+                        self.preload_inflight.discard(file_base)
             except Exception as e:
                 if not self.stop_preload.is_set():  # 종료 중이 아닐 때만 출력
                     print(f"⚠️  프리로드 오류: {e}")
                 time.sleep(0.1)
                 
+    def _take_preload_batch(self, first_base):
+        """큐에서 프로세스 수 x 2개까지 파일 이름을 한꺼번에 꺼내기"""
+        batch = [first_base]
+        try:
+            while len(batch) < self.preload_processes * 2:
+                batch.append(self.preload_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+    
+    def _preload_batch_in_processes(self, batch):
+        """
+        여러 프레임을 프로세스 풀에서 동시에 디코딩하여 캐시에 저장
+        
+        Args:
+            batch: 파일 기본 이름 리스트
+        """
+        try:
+            futures = {}
+            for file_base in batch:
+                img_path = self.image_map.get(file_base)
+                if img_path is None:  # 큐에 있는 동안 삭제됨
+                    continue
+                with self.cache_lock:
+                    if file_base in self.image_cache:
+                        continue
+                
+                # raw 캐시가 있으면 디코딩 없이 바로 사용
+                image = self._load_raw_cache(file_base) if self.raw_cache_dir else None
+                if image is not None:
+                    self._cache_frame(file_base, image)
+                    continue
+                
+                futures[file_base] = self._decode_pool.submit(
+                    _decode_in_process, img_path,
+                    self._imread_flag or cv2.IMREAD_COLOR, self._decode_factor,
+                    self.display_max_width
+                )
+            
+            for file_base, future in futures.items():
+                image = future.result()
+                if image is None:
+                    print(f"❌ 이미지 로드 실패: {self.image_map.get(file_base, file_base)}")
+                    continue
+                if self.raw_cache_dir:
+                    self._save_raw_cache(file_base, image)
+                self._cache_frame(file_base, image)
+        finally:
+            with self.cache_lock:
+                for file_base in batch:
+                    self.preload_inflight.discard(file_base)
+    
+    def _raw_cache_path(self, file_base):
+        """디코딩 프레임 캐시(.npy) 경로"""
+        return os.path.join(self.raw_cache_dir, f"{file_base}.npy")
+    
+    def _choose_imread_flag(self, img_path):
+        """
+        원본이 표시 너비보다 2배 이상 크면 JPEG 축소 디코딩 옵션 선택
+        
+        💡 JPEG은 1/2, 1/4, 1/8 크기로 바로 디코딩할 수 있어 전체 디코딩보다 훨씬 빠름
+           (표시 너비보다 작아지지 않는 가장 큰 축소 비율 사용)
+        
+        Args:
+            img_path: 크기를 확인할 첫 이미지 경로
+            
+        Returns:
+            tuple: (cv2.imread 플래그, 축소 비율)
+        """
+        if not self.display_max_width:
+            return cv2.IMREAD_COLOR, 1
+        
+        probe = cv2.imread(img_path)
+        if probe is None:
+            return cv2.IMREAD_COLOR, 1
+        
+        width = probe.shape[1]
+        for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                             (4, cv2.IMREAD_REDUCED_COLOR_4),
+                             (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if width // factor >= self.display_max_width:
+                print(f"   원본 너비 {width}px → 1/{factor} 크기로 디코딩")
+                return flag, factor
+        return cv2.IMREAD_COLOR, 1
+    
+    def _decode_image(self, img_path):
+        """
+        이미지 디코딩 후 화면 표시 크기로 축소
+        
+        Args:
+            img_path: 이미지 경로
+            
+        Returns:
+            numpy.ndarray: 이미지 (실패 시 None)
+        """
+        return _decode_frame(
+            img_path, self._imread_flag or cv2.IMREAD_COLOR, self._decode_factor,
+            self.display_max_width, self._turbo_jpeg
+        )
+    
+    def _load_raw_cache(self, file_base):
+        """
+        raw 캐시(.npy)를 메모리 맵으로 읽기
+        
+        Args:
+            file_base: 파일 기본 이름
+            
+        Returns:
+            numpy.ndarray: 이미지 (없거나 표시 너비보다 크면 None)
+        """
+        try:
+            # 디스크 캐시가 있으면 디코딩 없이 페이지 캐시에서 바로 읽음 (읽기 전용)
+            image = np.load(self._raw_cache_path(file_base), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return None
+        if self.display_max_width and image.shape[1] > self.display_max_width:
+            return None
+        return image
+    
+    def _save_raw_cache(self, file_base, image):
+        """
+        디코딩한 이미지를 raw 캐시(.npy)로 저장
+        
+        Args:
+            file_base: 파일 기본 이름
+            image: 디코딩된 이미지
+        """
+        raw_path = self._raw_cache_path(file_base)
+        
+        # 임시 파일에 쓴 뒤 교체 (다른 스레드가 쓰다 만 파일을 읽지 않도록)
+        tmp_path = f"{raw_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, image)
+            os.replace(tmp_path, raw_path)
+        except OSError as e:
+            print(f"⚠️  raw 캐시 저장 실패 {raw_path}: {e}")
+    
+    def _read_image(self, file_base, img_path):
+        """
+        이미지 읽기 (raw 캐시 사용 시 .npy를 메모리 맵으로 읽기)
+        
+        Args:
+            file_base: 파일 기본 이름
+            img_path: 이미지 경로
+            
+        Returns:
+            numpy.ndarray: 이미지 (실패 시 None)
+        """
+        if not self.raw_cache_dir:
+            return self._decode_image(img_path)
+        
+        image = self._load_raw_cache(file_base)
+        if image is not None:
+            return image
+        
+        image = self._decode_image(img_path)
+        if image is not None:
+            self._save_raw_cache(file_base, image)
+        return image
+    
+    def _cache_frame(self, file_base, image):
+        """
+        로드한 프레임을 캐시에 저장 (크기 제한)
+        
+        Args:
+            file_base: 파일 기본 이름
+            image: 이미지
+            
+        Returns:
+            steering 값 (load_lane_data에서 미리 읽어둔 값)
+        """
+        steering = self.steering_map.get(file_base)
+        
+        with self.cache_lock:
+            # 로드하는 동안 삭제된 프레임은 저장하지 않음
+            if file_base not in self.image_map:
+                return steering
+            
+            self.image_cache[file_base] = image
+            self.annotation_cache[file_base] = steering
+            self.image_cache.move_to_end(file_base)
+            self.annotation_cache.move_to_end(file_base)
+            
+            # 가장 오래 안 쓴 항목부터 제거 (순서대로 재생하므로 LRU가 잘 맞음)
+            while len(self.image_cache) > self.cache_size:
+                self.image_cache.popitem(last=False)
+                self.annotation_cache.popitem(last=False)
+        
+        return steering
+    
     def _load_frame_data(self, index):
         """
         단일 프레임 데이터 로드 및 캐싱
@@ -361,46 +858,54 @@ class LaneDataViewer:
         if index >= len(self.available_files):
             return None, None
         
-        current_file = self.available_files[index]
+        return self._load_file_data(self.available_files[index])
+    
+    def _load_file_data(self, file_base):
+        """
+        파일 기본 이름으로 프레임 데이터 로드 및 캐싱
         
+        Args:
+            file_base: 파일 기본 이름
+            
+        Returns:
+            tuple: (이미지, steering 값)
+        """
         # 캐시 확인
         with self.cache_lock:
-            if index in self.image_cache:
-                return self.image_cache[index], self.annotation_cache[index]
+            if file_base in self.image_cache:
+                # 최근 사용으로 표시 (맨 뒤로 이동)
+                self.image_cache.move_to_end(file_base)
+                self.annotation_cache.move_to_end(file_base)
+                return self.image_cache[file_base], self.annotation_cache[file_base]
         
         # 이미지 로드
-        img_path = self.image_map[current_file]
-        image = cv2.imread(img_path)
+        img_path = self.image_map.get(file_base)
+        if img_path is None:  # 삭제된 프레임
+            return None, None
+        image = self._read_image(file_base, img_path)
         
         if image is None:
             print(f"❌ 이미지 로드 실패: {img_path}")
             return None, None
         
-        # 어노테이션 로드
-        steering = None
-        if current_file in self.annotation_map:
-            json_path = self.annotation_map[current_file]
-            steering = self.load_annotation(json_path)
-        
-        # 캐시에 저장 (크기 제한)
-        with self.cache_lock:
-            if len(self.image_cache) >= self.cache_size:
-                # 현재 인덱스에서 먼 항목부터 제거
-                sorted_keys = sorted(
-                    self.image_cache.keys(),
-                    key=lambda k: abs(k - index) # 거리 오름차순
-                )
-                # 뒤에서 N개 = 거리가 가장 먼 N개
-                keys_to_remove = sorted_keys[-self.CACHE_REMOVE_COUNT:]
-                for key in keys_to_remove:
-                    del self.image_cache[key]
-                    del self.annotation_cache[key]
-                    
-            self.image_cache[index] = image
-            self.annotation_cache[index] = steering
+        # 캐시에 저장 (어노테이션은 load_lane_data에서 미리 읽어둔 값)
+        steering = self._cache_frame(file_base, image)
         
         return image, steering
     
+    def _parse_one_json(self, item):
+        """
+        (기본 이름, JSON 경로) → (기본 이름, steering 값)
+        
+        Args:
+            item: annotation_map의 (키, 값) 쌍
+            
+        Returns:
+            tuple: (파일 기본 이름, steering 값)
+        """
+        base_name, json_file = item
+        return base_name, self.load_annotation(json_file)
+    
     def load_annotation(self, json_file):
         """
         JSON 파일에서 steering 값 로드
@@ -419,6 +924,46 @@ class LaneDataViewer:
             print(f"⚠️  어노테이션 로드 실패 {json_file}: {e}")
             return None
     
+    def _get_static_overlay(self, height, width):
+        """
+        프레임 크기별 고정 UI 요소 (헤더/도움말 영역, 글자/표시기 위치) 가져오기
+        
+        Args:
+            height: 프레임 높이
+            width: 프레임 너비
+            
+        Returns:
+            dict: 고정 UI 요소
+        """
+        key = (height, width)
+        overlay = self._overlay_cache.get(key)
+        if overlay is None:
+            (help_w, _), _ = _text_size(self.HELP_TEXT, 0.5, 1)
+            
+            # 헤더 (0~70행), 도움말 바 (h-85 ~ h-70행) - 작은 프레임은 화면 안쪽만 사용
+            header_rows = slice(0, min(71, height))
+            help_rows = slice(max(0, height - 85), max(0, height - 69))
+            # "No Annotation" 박스는 문구가 고정이므로 좌표까지 미리 계산
+            (label_w, label_h), _ = _text_size("No Annotation", 1.0, 2)
+            box_x = (width - label_w) // 2 - 10
+            box_y = height - label_h - 25
+            
+            overlay = {
+                'header': header_rows,
+                'help': help_rows,
+                'help_org': ((width - help_w) // 2, height - 73),
+                'steer_y': int(height * 0.75),  # steering 표시 위치 (화면 하단 75%)
+                'line_start': (width // 2, height),  # steering 선 시작점 (하단 중앙)
+                'label_y': height - 20,  # 하단 문구 기준선
+                'no_annotation': (
+                    (box_x, box_y),
+                    (box_x + label_w + 20, box_y + label_h + 15),
+                    ((width - label_w) // 2, height - 20)
+                ),
+            }
+            self._overlay_cache[key] = overlay
+        return overlay
+    
     def draw_steering_indicator(self, image, steering_value):
         """
         이미지에 steering 표시기 및 UI 오버레이 그리기
@@ -428,16 +973,20 @@ class LaneDataViewer:
             steering_value: steering 값 (-1.0 ~ 1.0)
             
         Returns:
-            numpy.ndarray: 표시기가 그려진 이미지
+            numpy.ndarray: 표시기가 그려진 이미지 (재사용 버퍼이므로 다음 호출 시 덮어씀)
         """
-        # 캐시된 이미지 수정 방지를 위해 복사
-        display_image = image.copy()
+        # 캐시된 이미지 수정 방지를 위해 복사 (미리 만든 버퍼에 덮어쓰기)
+        if self._display_buf is None or self._display_buf.shape != image.shape:
+            self._display_buf = np.empty_like(image)
+        np.copyto(self._display_buf, image)
+        display_image = self._display_buf
         height, width = display_image.shape[:2]
+        static_overlay = self._get_static_overlay(height, width)
         
         # === 상단 헤더 배경 (반투명 검은색) ===
-        overlay = display_image.copy()
-        cv2.rectangle(overlay, (0, 0), (width, 70), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, display_image, 0.3, 0, display_image)
+        # 검은색과 70% 합성 = 밝기 30%로 줄이기 (헤더 영역만 제자리에서 계산)
+        header = display_image[static_overlay['header']]
+        cv2.convertScaleAbs(header, header, alpha=0.3)
         
         # === 프레임 진행률 (좌측 상단, 크고 선명하게) ===
         progress_text = (
@@ -453,9 +1002,7 @@ class LaneDataViewer:
         status_text = "PLAYING" if self.playing else "PAUSED"
         status_color = (0, 255, 0) if self.playing else (100, 100, 255)
         
-        (status_width, _), _ = cv2.getTextSize(
-            status_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2
-        )
+        (status_width, _), _ = _text_size(status_text, 0.9, 2)
         
         cv2.putText(
             display_image, status_text, 
@@ -468,9 +1015,7 @@ class LaneDataViewer:
             deleted_percent = (self.total_deleted_count / self.initial_file_count * 100)
             stats_text = f"Deleted: {self.total_deleted_count} ({deleted_percent:.1f}%)"
             
-            (stats_width, _), _ = cv2.getTextSize(
-                stats_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1
-            )
+            (stats_width, _), _ = _text_size(stats_text, 0.5, 1)
             
             cv2.putText(
                 display_image, stats_text, 
@@ -481,7 +1026,7 @@ class LaneDataViewer:
         # === Steering 표시기 ===
         if steering_value is not None:
             # 화면 하단 75% 위치
-            y_position = int(height * 0.75)
+            y_position = static_overlay['steer_y']
             
             # Steering 값을 x 좌표로 변환 (-1~1 → 0~width)
             cx = int((steering_value + 1) / 2 * width)
@@ -489,7 +1034,7 @@ class LaneDataViewer:
             # 중앙에서 steering 위치까지 선 그리기
             cv2.line(
                 display_image, 
-                (width // 2, height), 
+                static_overlay['line_start'], 
                 (cx, y_position), 
                 (0, 0, 255), 4
             )
@@ -503,9 +1048,7 @@ class LaneDataViewer:
             
             # Steering 값 표시 (하단 중앙, 배경 있음)
             text = f"Steering: {steering_value:.3f}"
-            (text_w, text_h), baseline = cv2.getTextSize(
-                text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2
-            )
+            (text_w, text_h), baseline = _text_size(text, 1.0, 2)
             
             # 배경 박스
             box_x = (width - text_w) // 2 - 10
@@ -529,59 +1072,32 @@ class LaneDataViewer:
             
             # 텍스트
             text_x = (width - text_w) // 2
-            text_y = height - 20
             
             cv2.putText(
-                display_image, text, (text_x, text_y),
+                display_image, text, (text_x, static_overlay['label_y']),
                 cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2
             )
         else:
-            # 어노테이션 없음 표시
-            text = "No Annotation"
-            (text_w, text_h), baseline = cv2.getTextSize(
-                text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2
-            )
+            # 어노테이션 없음 표시 (박스/글자 위치는 미리 계산한 값 사용)
+            box_pt1, box_pt2, text_org = static_overlay['no_annotation']
             
             # 배경 박스
-            box_x = (width - text_w) // 2 - 10
-            box_y = height - text_h - 25
-            box_w = text_w + 20
-            box_h = text_h + 15
-            
-            cv2.rectangle(
-                display_image, 
-                (box_x, box_y),
-                (box_x + box_w, box_y + box_h),
-                (0, 0, 0), -1
-            )
-            
-            cv2.rectangle(
-                display_image, 
-                (box_x, box_y),
-                (box_x + box_w, box_y + box_h),
-                (0, 0, 255), 2
-            )
+            cv2.rectangle(display_image, box_pt1, box_pt2, (0, 0, 0), -1)
+            cv2.rectangle(display_image, box_pt1, box_pt2, (0, 0, 255), 2)
             
             # 텍스트
-            text_x = (width - text_w) // 2
-            text_y = height - 20
-            
             cv2.putText(
-                display_image, text, (text_x, text_y),
+                display_image, "No Annotation", text_org,
                 cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2
             )
         
         # === 하단 단축키 안내 (간결하게 1줄) ===
-        help_overlay = display_image.copy()
-        cv2.rectangle(help_overlay, (0, height - 85), (width, height - 70), (0, 0, 0), -1)
-        cv2.addWeighted(help_overlay, 0.6, display_image, 0.4, 0, display_image)
+        help_band = display_image[static_overlay['help']]
+        cv2.convertScaleAbs(help_band, help_band, alpha=0.4)
         
-        help_text = "[W/S] 10Frames  [Shift+D] Delete +/-10Frames  [Space] Play/Pause  [Q] Quit"
-        (help_w, _), _ = cv2.getTextSize(help_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-        
-        cv2.putText(
-            display_image, help_text, 
-            ((width - help_w) // 2, height - 73),
+        # 도움말 문구는 한 번 그려둔 것을 재사용
+        self._text_cache.put_text(
+            display_image, self.HELP_TEXT, static_overlay['help_org'],
             cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1
         )
         
@@ -597,6 +1113,14 @@ class LaneDataViewer:
         if not self.available_files or self.current_index >= len(self.available_files):
             return None
         
+        # 화면에 표시되는 상태가 그대로면 마지막으로 그린 프레임 재사용
+        render_key = (
+            self.available_files[self.current_index], self.current_index,
+            len(self.available_files), self.playing, self.total_deleted_count
+        )
+        if render_key == self._last_render_key and self._last_frame is not None:
+            return self._last_frame
+        
         # 캐시에서 로드 또는 새로 로드
         image, steering = self._load_frame_data(self.current_index)
         
@@ -611,6 +1135,9 @@ class LaneDataViewer:
         # 어노테이션 그리기
         annotated_image = self.draw_steering_indicator(image, steering)
         
+        self._last_render_key = render_key
+        self._last_frame = annotated_image
+        
         return annotated_image
     
     def next_frame(self):
@@ -672,33 +1199,45 @@ class LaneDataViewer:
         print(f"\n✅ 준비 완료: {len(self.available_files)}개 프레임 로드됨\n")
         
         last_frame_time = time.time()
+        needs_redraw = True  # 프레임이나 상태가 바뀌었을 때만 다시 그림
         
         try:
             while True:
-                # 현재 프레임 표시
-                frame = self.display_current_frame()
-                
-                if frame is not None:
-                    cv2.imshow('BrainAI Car AD dataClean', frame)
-                else:
-                    # 에러 메시지 표시
-                    error_img = np.zeros((400, 800, 3), dtype=np.uint8)
-                    cv2.putText(
-                        error_img, "Failed to load current frame", 
-                        (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 
-                        1, (0, 0, 255), 2
-                    )
-                    cv2.imshow('BrainAI Car AD dataClean', error_img)
-                
                 # 자동 재생
                 if self.playing:
                     current_time = time.time()
                     if current_time - last_frame_time >= self.frame_delay:
                         self.next_frame()
                         last_frame_time = current_time
+                        needs_redraw = True
+                
+                # 현재 프레임 표시
+                if needs_redraw:
+                    frame = self.display_current_frame()
+                    
+                    if frame is not None:
+                        cv2.imshow('BrainAI Car AD dataClean', frame)
+                    else:
+                        # 에러 메시지 표시
+                        error_img = np.zeros((400, 800, 3), dtype=np.uint8)
+                        cv2.putText(
+                            error_img, "Failed to load current frame", 
+                            (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 
+                            1, (0, 0, 255), 2
+                        )
+                        cv2.imshow('BrainAI Car AD dataClean', error_img)
+                    needs_redraw = False
                 
                 # 키보드 입력 처리
-                key = cv2.waitKey(30) & 0xFF
+                # 재생 중: 다음 프레임 시각까지만 대기 / 정지 중: 키 입력이 올 때까지 길게 대기
+                if self.playing:
+                    remaining = last_frame_time + self.frame_delay - time.time()
+                    wait_ms = max(1, int(remaining * 1000) + 1)  # 올림 (일찍 깨어나 헛도는 것 방지)
+                else:
+                    wait_ms = self.PAUSED_WAIT_MS
+                key = cv2.waitKey(wait_ms) & 0xFF
+                if key != 0xFF:
+                    needs_redraw = True  # 키 입력으로 상태가 바뀌었을 수 있음
                 
                 # 종료
                 if key == ord('q') or key == ord('Q') or key == 27:  # ESC
@@ -761,8 +1300,15 @@ class LaneDataViewer:
         finally:
             # 스레드 종료 신호
             self.stop_preload.set()
-            if hasattr(self, 'preload_thread'):
-                self.preload_thread.join(timeout=1.0)
+            for thread in self._preload_threads:
+                thread.join(timeout=1.0)
+            if self._decode_pool is not None:
+                self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            
+            # 남은 삭제 로그 기록 후 종료
+            if self._log_thread is not None:
+                self._log_queue.put(None)
+                self._log_thread.join(timeout=2.0)
                 
             # 정리
             cv2.destroyAllWindows()
@@ -7,11 +7,17 @@ OpenVINO 기반 차선 인식 모델 로드 및 추론 모듈
 import os
 import time
 import logging
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
-from openvino import Core
+from openvino import Core, Tensor
+
+try:
+    from numba import njit  # 전처리 커널 JIT 컴파일 (선택)
+except ImportError:
+    njit = None
 
 
 # 로깅 설정
@@ -21,6 +27,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# uint8 픽셀 값 → [-1, 1] 변환표 (/255 → *2 - 1을 한 번의 조회로 처리)
+NORM_LUT: np.ndarray = (np.arange(256, dtype=np.float32) / 255.0) * 2.0 - 1.0
+
+
+def _normalize_into(img: np.ndarray, lut: np.ndarray, out: np.ndarray, half_height: int) -> None:
+    """
+    정규화 + 상단 절반 제거를 한 번의 순회로 처리 (numba로 컴파일해서 사용)
+
+    Args:
+        img: 리사이즈된 uint8 이미지 (H, W, C)
+        lut: uint8 → float32 변환표
+        out: 결과를 쓸 float32 버퍼 (H, W, C)
+        half_height: -1로 채울 상단 행 수
+    """
+    height, width, channels = img.shape
+    for y in range(height):
+        if y < half_height:
+            for x in range(width):
+                for c in range(channels):
+                    out[y, x, c] = -1.0
+        else:
+            for x in range(width):
+                for c in range(channels):
+                    out[y, x, c] = lut[img[y, x, c]]
+
+
+# numba가 있으면 GIL 없이 도는 컴파일 커널 사용 (없으면 np.take 경로)
+_normalize_kernel = (
+    njit(cache=True, nogil=True, boundscheck=False)(_normalize_into)
+    if njit is not None else None
+)
+
 
 class LaneDetection:
     """차선 인식 클래스 (OpenVINO 기반)"""
@@ -28,26 +66,44 @@ class LaneDetection:
     def __init__(
         self,
         models_base_dir: str = 'models',
-        video_stream: Optional[object] = None
+        video_stream: Optional[object] = None,
+        precision: str = 'fp32',
+        performance_hint: str = 'LATENCY'
     ):
         """
         Args:
             models_base_dir: 모델 디렉토리 경로
             video_stream: 비디오 스트림 객체 (선택)
+            precision: 모델 정밀도 ('fp32' 또는 'int8')
+                       int8이면 양자화된 IR(<모델명>_int8.xml)을 우선 사용
+            performance_hint: OpenVINO 성능 힌트 ('LATENCY' 또는 'THROUGHPUT')
+                              THROUGHPUT은 코어를 여러 스트림으로 나누고, 요청 수도
+                              OpenVINO가 알려주는 최적 개수(OPTIMAL_NUMBER_OF_INFER_REQUESTS)로
+                              만들어 submit/poll로 여러 프레임을 동시에 추론함
+                              (배포 추론 스레드가 이 요청들을 모두 사용,
+                              predict 단일 호출은 느려질 수 있음)
         """
         self.models_base_dir = models_base_dir
         self.video_stream = video_stream
+        self.precision = precision
+        self.performance_hint = performance_hint
 
         # 모델 경로 설정
         self.model_paths = {
-            "laneD1": os.path.join(models_base_dir, 'laneD1', 'laneD1.xml'),
-            "laneD2": os.path.join(models_base_dir, 'laneD2', 'laneD2.xml'),
+            name: self._resolve_model_path(models_base_dir, name, precision)
+            for name in ("laneD1", "laneD2")
         }
 
         # 모델 관리
         self.models: Dict = {}
         self.model_configs: Dict = {}
         self.current_model_name: str = "laneD1"
+        self._active_config: Optional[Dict] = None  # 현재 모델 설정 (전환할 때만 갱신)
+
+        # 비동기 추론 관리 (submit/poll, 제출 순서대로 결과 반환)
+        # THROUGHPUT 힌트에서는 OpenVINO가 알려주는 최적 요청 수를 사용
+        self.num_infer_slots: int = 2
+        self._pending: deque = deque()
 
         # 모델 전환 관리
         self.switch_time: float = time.time()
@@ -55,18 +111,45 @@ class LaneDetection:
         self.last_direction_model: Optional[str] = None
 
         # 방향 확인 추적
-        self.switch_requests: Dict[str, int] = {}
+        # 모델별 연속 요청 횟수 (모델 번호로 인덱싱하는 고정 크기 배열, load_models에서 생성)
+        self._model_ids: Dict[str, int] = {}
+        self._switch_counts: np.ndarray = np.zeros(0, dtype=np.int8)
         self.confirmation_count: int = 3
 
-        # 레이턴시 추적 (최근 20 프레임 평균)
-        self.latency_history: np.ndarray = np.zeros(20)
-        self.latency_idx: int = 0
+        # 레이턴시 추적 (최근 20 프레임 평균, 합계를 함께 갱신해 평균을 바로 계산)
+        self.latency_history: deque = deque(maxlen=20)
+        self._latency_sum: int = 0  # 나노초 정수 합계 (더하고 빼도 오차가 쌓이지 않음)
         self.total_predictions: int = 0
 
         # 모델 로드
         self.load_models()
         logger.info("LaneDetection 초기화 완료")
 
+    @staticmethod
+    def _resolve_model_path(models_base_dir: str, model_name: str, precision: str) -> str:
+        """
+        정밀도에 맞는 모델 파일 경로 반환 (int8 모델이 없으면 기본 모델)
+
+        Args:
+            models_base_dir: 모델 디렉토리 경로
+            model_name: 모델 이름
+            precision: 모델 정밀도
+
+        Returns:
+            모델 XML 경로
+        """
+        model_dir = os.path.join(models_base_dir, model_name)
+        default_path = os.path.join(model_dir, f'{model_name}.xml')
+
+        if precision == 'int8':
+            int8_path = os.path.join(model_dir, f'{model_name}_int8.xml')
+            if os.path.exists(int8_path):
+                return int8_path
+            if os.path.exists(default_path):
+                logger.warning(f"INT8 모델 없음: {int8_path} - 기본 모델 사용")
+
+        return default_path
+
     def load_models(self) -> None:
         """모든 사용 가능한 모델 로드"""
         logger.info("=" * 60)
@@ -84,7 +167,10 @@ class LaneDetection:
             try:
                 # 모델 로드 및 컴파일
                 model = core.read_model(model_path)
-                compiled_model = core.compile_model(model, "CPU")
+                compiled_model = core.compile_model(
+                    model, "CPU", config=self._compile_config()
+                )
+                num_slots = self._optimal_infer_requests(compiled_model)
 
                 # 모델 설정 가져오기
                 output_layer = compiled_model.output(0)
@@ -99,11 +185,27 @@ class LaneDetection:
                 n, input_height, input_width, c = input_shape
 
                 # 모델 및 설정 저장
+                # 동기 추론(predict)용 요청: 입력 버퍼를 복사 없이 감싼 Tensor를 한 번만 연결
+                infer_request, input_buf = self._create_infer_slot(
+                    compiled_model, input_height, input_width
+                )
                 self.models[model_name] = compiled_model
                 self.model_configs[model_name] = {
+                    'model': compiled_model,
                     'output_layer': output_layer,
                     'input_width': input_width,
-                    'input_height': input_height
+                    'input_height': input_height,
+                    'input_size': (input_width, input_height),
+                    # 매 프레임 재사용하는 리사이즈/입력 버퍼
+                    'resize_buf': np.empty((input_height, input_width, 3), dtype=np.uint8),
+                    'input_buf': input_buf,
+                    'infer_request': infer_request,
+                    # 비동기 추론용 요청 (전처리와 추론이 겹치도록 번갈아 사용)
+                    'infer_slots': [
+                        self._create_infer_slot(compiled_model, input_height, input_width)
+                        for _ in range(num_slots)
+                    ],
+                    'next_slot': 0,
                 }
 
                 available_models.append(model_name)
@@ -116,46 +218,135 @@ class LaneDetection:
         if not self.models:
             raise RuntimeError("차선 인식 모델을 로드할 수 없습니다!")
 
+        # 전환 요청 카운터 (모델 이름 → 배열 인덱스)
+        self._model_ids = {name: i for i, name in enumerate(self.models)}
+        self._switch_counts = np.zeros(len(self._model_ids), dtype=np.int8)
+
         # 기본 모델이 없으면 첫 번째 모델 사용
         if self.current_model_name not in self.models:
-            self.current_model_name = list(self.models.keys())[0]
+            self._activate_model(list(self.models.keys())[0])
             logger.warning(
                 f"기본 모델 없음 - {self.current_model_name} 사용"
             )
+        else:
+            self._activate_model(self.current_model_name)
+
+        # 전처리 커널을 미리 컴파일 (첫 프레임이 JIT 컴파일로 늦어지지 않도록)
+        if _normalize_kernel is not None:
+            self.preprocess(np.zeros((self._active_config['input_height'],
+                                      self._active_config['input_width'], 3), dtype=np.uint8))
 
         logger.info(f"현재 활성 모델: {self.current_model_name}")
         logger.info("=" * 60)
 
-    def preprocess(self, img: np.ndarray) -> np.ndarray:
+    def _compile_config(self) -> Dict[str, str]:
+        """
+        모델 컴파일 설정 (성능 힌트)
+
+        Returns:
+            OpenVINO compile_model 설정
+        """
+        config = {"PERFORMANCE_HINT": self.performance_hint}
+        if self.performance_hint == 'THROUGHPUT':
+            # 동시에 돌릴 요청 수만큼만 스트림을 나눔
+            config["PERFORMANCE_HINT_NUM_REQUESTS"] = str(self.num_infer_slots)
+        return config
+
+    def _optimal_infer_requests(self, compiled_model) -> int:
+        """
+        비동기 추론 요청 수 결정
+
+        Args:
+            compiled_model: 컴파일된 OpenVINO 모델
+
+        Returns:
+            만들 InferRequest 개수
+        """
+        if self.performance_hint != 'THROUGHPUT':
+            return self.num_infer_slots
+
+        try:
+            optimal = int(compiled_model.get_property("OPTIMAL_NUMBER_OF_INFER_REQUESTS"))
+        except (RuntimeError, TypeError, ValueError) as e:
+            logger.warning(f"최적 요청 수 조회 실패 ({e}) - {self.num_infer_slots}개 사용")
+            return self.num_infer_slots
+        return max(optimal, self.num_infer_slots)
+
+    @staticmethod
+    def _create_infer_slot(
+        compiled_model, input_height: int, input_width: int
+    ) -> Tuple[object, np.ndarray]:
+        """
+        비동기 추론 요청과 전용 입력 버퍼 생성
+
+        Args:
+            compiled_model: 컴파일된 OpenVINO 모델
+            input_height: 입력 높이
+            input_width: 입력 너비
+
+        Returns:
+            (InferRequest, 입력 버퍼)
+        """
+        infer_request = compiled_model.create_infer_request()
+        input_buf = np.empty((1, input_height, input_width, 3), dtype=np.float32)
+        # 버퍼를 한 번만 연결해두면 이후에는 버퍼에 쓰기만 하면 됨
+        infer_request.set_input_tensor(Tensor(input_buf, shared_memory=True))
+        return infer_request, input_buf
+
+    def _activate_model(self, model_name: str) -> None:
+        """
+        현재 모델 변경 (추론에 쓰는 설정도 함께 교체)
+
+        Args:
+            model_name: 활성화할 모델 이름
+        """
+        self.current_model_name = model_name
+        # 설정 딕셔너리를 통째로 교체 (추론 스레드는 한 번 읽은 설정을 끝까지 사용)
+        self._active_config = self.model_configs[model_name]
+
+    def preprocess(
+        self,
+        img: np.ndarray,
+        config: Optional[Dict] = None,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         이미지 전처리 (학습 파이프라인과 동일)
 
         Args:
             img: 입력 이미지
+            config: 모델 설정 (None이면 현재 모델)
+            out: 결과를 쓸 입력 버퍼 (None이면 모델 기본 입력 버퍼)
 
         Returns:
-            전처리된 이미지 (배치 차원 포함)
+            전처리된 이미지 (배치 차원 포함, 다음 호출 시 덮어쓰는 재사용 버퍼)
         """
-        config = self.model_configs[self.current_model_name]
+        if config is None:
+            config = self._active_config
+        img_expand = config['input_buf'] if out is None else out
 
-        # 1단계: 모델 입력 크기로 리사이즈
+        # 1단계: 모델 입력 크기로 리사이즈 (학습과 같은 INTER_LINEAR, 미리 만든 버퍼에 기록)
         img_resized = cv2.resize(
-            img,
-            (config['input_width'], config['input_height'])
+            img, config['input_size'], dst=config['resize_buf'],
+            interpolation=cv2.INTER_LINEAR
         )
 
-        # 2단계: [0, 1]로 정규화
-        img_normalized = img_resized.astype(np.float32) / 255.0
+        if img_resized.dtype != np.uint8:
+            # uint8이 아닌 입력은 기존 방식으로 계산
+            img_normalized = img_resized.astype(np.float32) / 255.0
+            img_normalized[:config['input_height'] // 2, :, :] = 0.0
+            img_expand[0] = img_normalized * 2.0 - 1.0
+            return img_expand
 
-        # 3단계: 상단 절반 제거 (학습과 동일)
+        # 2단계: 상단 절반 제거 (학습과 동일: 0으로 지운 뒤 스케일링한 값 = -1)
+        # 3단계: 나머지 하단 절반만 변환표로 [-1, 1] 정규화 (미리 만든 입력 버퍼에 바로 기록)
         half_height = config['input_height'] // 2
-        img_normalized[:half_height, :, :] = 0.0
-
-        # 4단계: [-1, 1] 범위로 스케일링
-        img_normalized = img_normalized * 2.0 - 1.0
-
-        # 5단계: 배치 차원 추가
-        img_expand = np.expand_dims(img_normalized, axis=0)
+        if _normalize_kernel is not None:
+            # 두 단계를 한 번의 순회로 처리
+            _normalize_kernel(img_resized, NORM_LUT, img_expand[0], half_height)
+        else:
+            img_expand[0, :half_height].fill(-1.0)
+            np.take(NORM_LUT, img_resized[half_height:], out=img_expand[0, half_height:])
 
         return img_expand
 
@@ -170,30 +361,102 @@ class LaneDetection:
             예측 결과 (raw output)
         """
         # 예측 시작 시간
-        start_time = time.perf_counter()
+        start_time = time.perf_counter_ns()
 
-        # 현재 모델 및 설정
-        current_model = self.get_current_model()
-        config = self.model_configs[self.current_model_name]
+        # 현재 모델 설정 (모델/출력 레이어/입력 버퍼를 한 번에 가져옴)
+        config = self._active_config
 
-        # 이미지 전처리
-        input_image = self.preprocess(img)
+        # 이미지 전처리 (입력 버퍼에 기록, 요청에 연결된 Tensor가 같은 메모리를 가리킴)
+        self.preprocess(img, config)
 
-        # 추론 실행
-        raw_result = current_model([input_image])[config['output_layer']][0]
+        # 추론 실행 (입력을 매번 넘기지 않고 연결해둔 버퍼로 바로 추론)
+        infer_request = config['infer_request']
+        infer_request.infer()
+        # 출력 버퍼는 다음 추론에서 덮어쓰므로 복사
+        raw_result = infer_request.get_output_tensor(0).data[0].copy()
 
         # 예측 종료 시간 및 레이턴시 기록
-        end_time = time.perf_counter()
-        frame_latency = end_time - start_time
-
-        # 레이턴시 히스토리 업데이트
-        self.latency_history[self.latency_idx] = frame_latency
-        self.latency_idx = (self.latency_idx + 1) % 20
-        self.total_predictions += 1
+        self._record_latency(time.perf_counter_ns() - start_time)
 
         # Raw 결과 반환
         return raw_result
 
+    def submit(self, img: np.ndarray) -> None:
+        """
+        비동기 추론 시작 (결과는 poll()로 받음)
+
+        💡 추론이 도는 동안 다음 프레임을 전처리할 수 있어 처리량이 늘어남
+           (submit(다음 프레임) → poll()(이전 프레임 결과) 순서로 사용)
+
+        Args:
+            img: 입력 이미지
+
+        Raises:
+            RuntimeError: 결과를 받지 않은 요청 수가 요청 슬롯 수와 같을 때
+        """
+        start_time = time.perf_counter_ns()
+        config = self._active_config
+
+        if len(self._pending) >= len(config['infer_slots']):
+            raise RuntimeError("진행 중인 추론이 가득 찼습니다 - poll()로 결과를 먼저 받으세요")
+
+        # 비어 있는 요청을 번갈아 사용 (각 요청은 자기 입력 버퍼를 가짐)
+        slot_idx = config['next_slot']
+        config['next_slot'] = (slot_idx + 1) % len(config['infer_slots'])
+        infer_request, input_buf = config['infer_slots'][slot_idx]
+
+        self.preprocess(img, config, out=input_buf)
+        infer_request.start_async()
+        self._pending.append((infer_request, start_time))
+
+    def poll(self) -> Optional[np.ndarray]:
+        """
+        가장 먼저 제출한 비동기 추론의 결과 받기 (끝날 때까지 대기)
+
+        Returns:
+            예측 결과 (raw output, 진행 중인 추론이 없으면 None)
+        """
+        if not self._pending:
+            return None
+
+        infer_request, start_time = self._pending.popleft()
+        infer_request.wait()
+
+        # 출력 버퍼는 다음 추론에서 덮어쓰므로 복사
+        raw_result = infer_request.get_output_tensor(0).data[0].copy()
+        self._record_latency(time.perf_counter_ns() - start_time)
+
+        return raw_result
+
+    @property
+    def pending_count(self) -> int:
+        """결과를 아직 받지 않은 비동기 추론 수"""
+        return len(self._pending)
+
+    def can_submit(self) -> bool:
+        """
+        지금 submit()할 수 있는지 확인
+
+        Returns:
+            비어 있는 요청이 있으면 True (False면 poll()로 결과를 먼저 받아야 함)
+        """
+        return len(self._pending) < len(self._active_config['infer_slots'])
+
+    def _record_latency(self, frame_latency: int) -> None:
+        """
+        레이턴시 히스토리 업데이트
+
+        Args:
+            frame_latency: 전처리 + 추론 시간 (나노초, 초 변환은 latency에서)
+        """
+        # 가득 찼으면 밀려나는 가장 오래된 값을 합계에서 뺌
+        history = self.latency_history
+        if len(history) == history.maxlen:
+            self._latency_sum -= history[0]
+        history.append(frame_latency)
+        self._latency_sum += frame_latency
+        self.total_predictions += 1
+
     def postprocess(self, result: float) -> float:
         """
         모델 출력을 조향 값으로 변환 (0-100 스케일)
@@ -223,7 +486,7 @@ class LaneDetection:
         # 첫 번째 사용 가능한 모델로 폴백
         available_models = list(self.models.keys())
         if available_models:
-            self.current_model_name = available_models[0]
+            self._activate_model(available_models[0])
             logger.warning(
                 f"현재 모델 없음 - {self.current_model_name}로 전환"
             )
@@ -268,7 +531,7 @@ class LaneDetection:
         # 수동 전환 (키 입력)
         if manual_override:
             if model_name != self.current_model_name:
-                self.current_model_name = model_name
+                self._activate_model(model_name)
                 self.switch_time = current_time
 
                 # 방향 기반 모델 추적
@@ -278,7 +541,7 @@ class LaneDetection:
                     self.last_direction_model = None
 
                 # 전환 요청 카운터 리셋
-                self.switch_requests = {}
+                self._switch_counts[:] = 0
                 logger.info(f"수동 전환: {model_name}")
                 return True
             else:
@@ -287,19 +550,14 @@ class LaneDetection:
                 return True
 
         # 자동 전환 (방향 감지) - 확인 필요
-        if model_name not in self.switch_requests:
-            self.switch_requests[model_name] = 0
-
-        # 다른 모델 카운터 리셋
-        for other_model in list(self.switch_requests.keys()):
-            if other_model != model_name:
-                self.switch_requests[other_model] = 0
-
-        # 요청 모델 카운터 증가
-        self.switch_requests[model_name] += 1
+        # 다른 모델 카운터는 한 번에 리셋하고 요청 모델만 증가 (int8 범위에서 멈춤)
+        model_id = self._model_ids[model_name]
+        request_count = min(int(self._switch_counts[model_id]) + 1, 127)
+        self._switch_counts[:] = 0
+        self._switch_counts[model_id] = request_count
 
         # 연속 요청 확인
-        if self.switch_requests[model_name] >= self.confirmation_count:
+        if request_count >= self.confirmation_count:
             # 확인 완료! 전환 진행
             if model_name == self.last_direction_model:
                 # 동일 방향 모델 - 쿨다운 타이머 갱신
@@ -308,7 +566,7 @@ class LaneDetection:
 
             # 새 모델로 전환
             if model_name != self.current_model_name:
-                self.current_model_name = model_name
+                self._activate_model(model_name)
                 self.switch_time = current_time
 
                 # 방향 기반 모델 추적
@@ -325,7 +583,7 @@ class LaneDetection:
                 return True
         else:
             # 아직 확인 부족
-            remaining = self.confirmation_count - self.switch_requests[model_name]
+            remaining = self.confirmation_count - request_count
             return False
 
     def check_switch_timeout(self) -> bool:
@@ -339,9 +597,9 @@ class LaneDetection:
             if time.time() - self.switch_time >= self.switch_duration:
                 # 기본 모델(laneD1)로 복귀
                 if "laneD1" in self.models:
-                    self.current_model_name = "laneD1"
+                    self._activate_model("laneD1")
                     self.last_direction_model = None
-                    self.switch_requests = {}
+                    self._switch_counts[:] = 0
                     logger.info("타임아웃 - laneD1로 복귀")
                     return True
                 else:
@@ -359,15 +617,23 @@ class LaneDetection:
         Returns:
             평균 레이턴시
         """
-        if self.total_predictions == 0:
+        count = len(self.latency_history)
+        if count == 0:
             return 0.00
-        elif self.total_predictions < 20:
-            valid_entries = self.latency_history[:self.total_predictions]
-            avg_seconds = np.mean(valid_entries)
-            return round(avg_seconds, 3)
-        else:
-            avg_seconds = np.mean(self.latency_history)
-            return round(avg_seconds, 3)
+        return round(self._latency_sum / count / 1e9, 3)
+
+    @property
+    def switch_requests(self) -> Dict[str, int]:
+        """
+        모델별 연속 전환 요청 횟수 반환
+
+        Returns:
+            {모델 이름: 요청 횟수}
+        """
+        return {
+            name: int(self._switch_counts[model_id])
+            for name, model_id in self._model_ids.items()
+        }
 
     @property
     def current_model(self) -> str:
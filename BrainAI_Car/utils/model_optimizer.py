@@ -8,11 +8,18 @@ import os
 import logging
 import shutil 
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
+import cv2
+import numpy as np
 import tensorflow as tf
 import openvino as ov
 
+try:
+    import nncf  # INT8 양자화 (선택)
+except ImportError:
+    nncf = None
+
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,16 +28,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# uint8 픽셀 값 → [-1, 1] 변환표 (LaneDetection.preprocess와 동일)
+NORM_LUT = (np.arange(256, dtype=np.float32) / 255.0) * 2.0 - 1.0
+
 
 class ModelOptimizer:
     """TensorFlow 모델을 OpenVINO IR 형식으로 변환하는 클래스"""
 
-    def __init__(self, input_shape: Tuple[int, int, int, int] = (1, 224, 224, 3)):
+    def __init__(
+        self,
+        input_shape: Tuple[int, int, int, int] = (1, 224, 224, 3),
+        keep_fp32: bool = False
+    ):
         """
         Args:
             input_shape: 모델 입력 shape (batch, height, width, channels)
+            keep_fp32: True면 가중치를 FP32 그대로 저장 (기본은 FP16으로 압축 저장)
         """
         self.input_shape = input_shape
+        self.keep_fp32 = keep_fp32
         logger.info(f"ModelOptimizer 초기화 완료 - Input shape: {input_shape}")
 
     def load_keras_model(self, model_path: str) -> tf.keras.Model:
@@ -70,12 +86,57 @@ class ModelOptimizer:
         example_input: Optional[tf.Tensor] = None
     ) -> ov.Model:
         """
-        TensorFlow 모델을 OpenVINO IR 형식으로 변환 (SavedModel 경로 사용)
+        TensorFlow 모델을 OpenVINO IR 형식으로 변환
+
+        메모리에 있는 모델을 바로 변환하고, 실패할 때만 SavedModel 경로를 사용합니다.
+        (SavedModel 경로는 모델 전체를 디스크에 썼다가 다시 읽으므로 느림)
 
         Args:
             model: TensorFlow Keras 모델
             example_input: 예제 입력 텐서 (None일 경우 기본값 사용)
 
+        Returns:
+            변환된 OpenVINO 모델
+        """
+        if example_input is None:
+            example_input = tf.zeros(self.input_shape, dtype=tf.float32)
+
+        # 1. Keras 모델 직접 변환
+        try:
+            logger.info("OpenVINO 형식으로 변환 중 (Keras 모델 직접 변환)...")
+            ov_model = ov.convert_model(model, example_input=example_input)
+            logger.info("OpenVINO 변환 완료")
+            return ov_model
+        except Exception as e:
+            logger.warning(f"Keras 모델 직접 변환 실패: {str(e)}")
+
+        # 2. 고정 입력 shape의 tf.function으로 감싸서 변환
+        try:
+            logger.info("OpenVINO 형식으로 변환 중 (tf.function 사용)...")
+            concrete_func = tf.function(lambda x: model(x)).get_concrete_function(
+                tf.TensorSpec(self.input_shape, tf.float32)
+            )
+            ov_model = ov.convert_model(concrete_func)
+            logger.info("OpenVINO 변환 완료")
+            return ov_model
+        except Exception as e:
+            logger.warning(f"tf.function 변환 실패: {str(e)}")
+
+        # 3. 둘 다 실패하면 SavedModel로 저장 후 변환
+        return self._convert_via_saved_model(model, example_input)
+
+    def _convert_via_saved_model(
+        self,
+        model: tf.keras.Model,
+        example_input: tf.Tensor
+    ) -> ov.Model:
+        """
+        임시 SavedModel을 거쳐 OpenVINO IR 형식으로 변환 (직렬화 문제 대비용)
+
+        Args:
+            model: TensorFlow Keras 모델
+            example_input: 예제 입력 텐서
+
         Returns:
             변환된 OpenVINO 모델
         """
@@ -101,9 +162,6 @@ class ModelOptimizer:
             raise # 저장 실패 시 변환 진행 불가
         
         # 3. SavedModel 경로를 사용하여 OpenVINO로 변환
-        if example_input is None:
-            example_input = tf.zeros(self.input_shape, dtype=tf.float32)
-
         try:
             logger.info("OpenVINO 형식으로 변환 중 (SavedModel 경로 사용)...")
             ov_model = ov.convert_model(
@@ -141,24 +199,103 @@ class ModelOptimizer:
             if output_dir != Path('.'):
                 output_dir.mkdir(parents=True, exist_ok=True)
 
+            # FP16 압축: .bin 크기와 가중치 로드량이 절반 (추론 시 FP32로 풀어서 계산)
+            compress_to_fp16 = not self.keep_fp32
             logger.info(f"OpenVINO 모델 저장 중: {output_path}")
-            ov.save_model(ov_model, output_path)
+            ov.save_model(ov_model, output_path, compress_to_fp16=compress_to_fp16)
             logger.info("OpenVINO 모델 저장 완료")
 
             # .bin 파일도 생성되었는지 확인
             bin_path = Path(output_path).with_suffix('.bin')
             if bin_path.exists():
-                logger.info(f"관련 파일 생성됨: {bin_path}")
+                bin_mb = bin_path.stat().st_size / (1024 * 1024)
+                weight_format = "FP16 압축" if compress_to_fp16 else "FP32"
+                logger.info(f"관련 파일 생성됨: {bin_path} ({bin_mb:.2f} MB, {weight_format})")
+                if compress_to_fp16:
+                    logger.info(f"FP32로 저장했다면 약 {bin_mb * 2:.2f} MB (keep_fp32=True)")
             else:
                 logger.warning(f"관련 .bin 파일이 생성되지 않았거나 경로가 다릅니다.")
         except Exception as e:
             raise OSError(f"모델 저장 실패: {str(e)}")
 
+    def _calibration_transform(self, frame: np.ndarray) -> np.ndarray:
+        """
+        보정용 프레임 전처리 (LaneDetection.preprocess와 동일)
+
+        Args:
+            frame: BGR uint8 카메라 이미지
+
+        Returns:
+            모델 입력 (배치 차원 포함)
+        """
+        _, height, width, _ = self.input_shape
+
+        # 리사이즈 → [-1, 1] 정규화 → 상단 절반 제거 (0으로 지운 뒤 스케일링한 값 = -1)
+        resized = cv2.resize(frame, (width, height))
+        normalized = NORM_LUT[resized]
+        normalized[:height // 2] = -1.0
+
+        return normalized[np.newaxis, ...]
+
+    def quantize_model(
+        self,
+        ov_model: ov.Model,
+        calibration_dataset: Iterable[np.ndarray],
+        subset_size: int = 300
+    ) -> ov.Model:
+        """
+        NNCF 학습 후 양자화(PTQ)로 INT8 모델 생성
+
+        Args:
+            ov_model: OpenVINO 모델 (FP32)
+            calibration_dataset: 보정용 BGR uint8 카메라 이미지 목록
+            subset_size: 보정에 사용할 최대 이미지 수
+
+        Returns:
+            INT8 양자화된 OpenVINO 모델
+
+        Raises:
+            ImportError: nncf가 설치되어 있지 않을 때
+        """
+        if nncf is None:
+            raise ImportError("INT8 양자화에는 nncf가 필요합니다: pip install nncf")
+
+        # NNCF는 데이터셋을 여러 번 순회하므로 generator는 리스트로 변환
+        if not hasattr(calibration_dataset, '__len__'):
+            calibration_dataset = list(calibration_dataset)
+
+        logger.info(f"INT8 양자화 중 (보정 이미지 최대 {subset_size}장)...")
+        calibration = nncf.Dataset(calibration_dataset, self._calibration_transform)
+        quantized_model = nncf.quantize(
+            ov_model,
+            calibration,
+            preset=nncf.QuantizationPreset.PERFORMANCE,
+            subset_size=subset_size
+        )
+        logger.info("INT8 양자화 완료")
+        return quantized_model
+
+    @staticmethod
+    def int8_output_path(output_path: str) -> str:
+        """
+        INT8 모델 저장 경로 (<모델명>_int8.xml, LaneDetection이 찾는 이름)
+
+        Args:
+            output_path: FP32 모델 출력 경로 (.xml)
+
+        Returns:
+            INT8 모델 출력 경로
+        """
+        path = Path(output_path)
+        return str(path.with_name(f"{path.stem}_int8{path.suffix}"))
+
     def optimize_model(
         self,
         keras_model_path: str,
         output_path: str,
-        example_input: Optional[tf.Tensor] = None
+        example_input: Optional[tf.Tensor] = None,
+        quantize: bool = False,
+        calibration_dataset: Optional[Iterable[np.ndarray]] = None
     ) -> None:
         """
         전체 최적화 프로세스 실행
@@ -167,7 +304,15 @@ class ModelOptimizer:
             keras_model_path: Keras 모델 파일 경로
             output_path: OpenVINO 모델 출력 경로
             example_input: 예제 입력 텐서
+            quantize: INT8 모델도 함께 만들지 여부 (<모델명>_int8.xml로 저장)
+            calibration_dataset: 양자화 보정용 BGR uint8 카메라 이미지 목록
+
+        Raises:
+            ValueError: quantize=True인데 보정 이미지가 없을 때
         """
+        if quantize and calibration_dataset is None:
+            raise ValueError("INT8 양자화에는 calibration_dataset이 필요합니다")
+
         logger.info("=" * 60)
         logger.info("모델 최적화 프로세스 시작")
         logger.info("=" * 60)
@@ -178,9 +323,14 @@ class ModelOptimizer:
         # 2. OpenVINO로 변환
         ov_model = self.convert_to_openvino(model, example_input)
 
-        # 3. 저장
+        # 3. 저장 (FP32 모델은 INT8을 쓸 수 없을 때의 기본 모델로 항상 저장)
         self.save_openvino_model(ov_model, output_path)
 
+        # 4. INT8 양자화 (선택)
+        if quantize:
+            int8_model = self.quantize_model(ov_model, calibration_dataset)
+            self.save_openvino_model(int8_model, self.int8_output_path(output_path))
+
         logger.info("=" * 60)
         logger.info("모델 최적화 프로세스 완료")
         logger.info("=" * 60)
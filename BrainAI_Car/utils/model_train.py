@@ -20,6 +20,8 @@ utils/model_model.py
 
 import os
 import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
@@ -29,6 +31,14 @@ import matplotlib.pyplot as plt
 from datetime import datetime
 import platform
 
+try:
+    from numba import njit, prange  # 데이터 증강 커널 JIT 컴파일 (선택)
+except ImportError:
+    njit = None
+    prange = range
+
+from .training_utils import load_json, remove_stale_tf_caches
+
 
 # ============================================================================
 # 🎓 1단계: 설정 클래스 (Configuration)
@@ -45,6 +55,12 @@ class TrainingConfig:
     [새로운 기능 - A에서 가져옴]
     - use_augmentation: 데이터 증강 사용 여부
     - augmentation_options: 증강 옵션 선택
+    - stream_dataset: 전체 데이터를 메모리에 올리지 않고 tf.data로 배치마다 읽기
+    - fast_decode: 큰 JPEG를 1/2, 1/4, 1/8 크기로 바로 디코딩 (원본이 입력 크기의 2배 이상일 때)
+    - augment_on_device: 데이터 증강을 모델 안의 Keras 레이어로 GPU에서 처리
+    - mixed_precision: GPU에서 float16 혼합 정밀도로 훈련 (메모리 절약, 속도 향상)
+    - cache_preprocessed: 전처리한 이미지를 .npy 캐시로 저장해 다음 실행부터 바로 읽기
+    - jit_compile: XLA로 훈련 단계를 하나의 커널로 묶어 컴파일 (입력 크기가 고정일 때 빠름)
     """
     
     def __init__(
@@ -57,7 +73,13 @@ class TrainingConfig:
         img_width=224,               # 이미지 너비
         learning_rate=0.001,         # 학습 속도
         use_augmentation=False,      # 데이터 증강 사용
-        augmentation_options=None    # 증강 옵션
+        augmentation_options=None,   # 증강 옵션
+        stream_dataset=False,        # tf.data 스트리밍 사용 (큰 데이터셋용)
+        fast_decode=False,           # 축소 디코딩 사용 (고해상도 원본용)
+        augment_on_device=False,     # 증강을 GPU(Keras 레이어)에서 처리
+        mixed_precision=False,       # 혼합 정밀도 훈련 (GPU 전용)
+        cache_preprocessed=True,     # 전처리 결과 캐시 사용
+        jit_compile=False            # XLA 컴파일 강제 사용
     ):
         
         self.dataset_laneD1_path = dataset_laneD1_path
@@ -72,6 +94,12 @@ class TrainingConfig:
             'COLOR_JITTER': False,      # ✅ 색상/밝기 변화 (안전)
             'GAUSSIAN_NOISE': False     # ✅ 노이즈 추가 (안전)
         }
+        self.stream_dataset = stream_dataset
+        self.fast_decode = fast_decode
+        self.augment_on_device = augment_on_device
+        self.mixed_precision = mixed_precision
+        self.cache_preprocessed = cache_preprocessed
+        self.jit_compile = jit_compile
         
     def print_summary(self):
         """설정 요약 출력"""
@@ -85,8 +113,14 @@ class TrainingConfig:
         print(f"🖼️  이미지 크기: {self.img_width}x{self.img_height}")
         print(f"⚡ 학습률: {self.learning_rate}")
         print(f"🎨 데이터 증강: {'사용' if self.use_augmentation else '미사용'}")
+        print(f"🌊 데이터 스트리밍(tf.data): {'사용' if self.stream_dataset else '미사용'}")
+        print(f"⚡ 축소 디코딩: {'사용' if self.fast_decode else '미사용'}")
+        print(f"🧮 혼합 정밀도: {'사용' if self.mixed_precision else '미사용'}")
+        print(f"💾 전처리 캐시: {'사용' if self.cache_preprocessed else '미사용'}")
+        print(f"🧩 XLA 컴파일: {'사용' if self.jit_compile else '자동'}")
         
         if self.use_augmentation:
+            print(f"\n  🖥️ 증강 위치: {'GPU (Keras 레이어)' if self.augment_on_device else 'CPU (데이터 로드)'}")
             print("\n  📊 증강 옵션 (자율주행 안전 증강만):")
             
             # 안전한 옵션
@@ -110,6 +144,55 @@ class TrainingConfig:
 # 🎓 2단계: 데이터 처리 클래스 (Data Utilities)
 # ============================================================================
 
+def _augment_images(images, brightness, contrast, noisy, noise_std):
+    """
+    밝기 → 대비 → 노이즈를 이미지마다 픽셀 순회 두 번으로 처리 (numba로 컴파일해서 사용)
+    
+    Args:
+        images: 이미지 묶음 (N, H, W, 3, -1~1), 제자리에서 수정
+        brightness: 이미지별 밝기 배율 (1이면 변화 없음)
+        contrast: 이미지별 대비 배율 (1이면 변화 없음)
+        noisy: 이미지별 노이즈 추가 여부
+        noise_std: 노이즈 표준편차 (-1~1 범위 기준)
+    """
+    count, height, width, channels = images.shape
+    for n in prange(count):
+        img = images[n]
+        scale = brightness[n]
+        
+        # 1번째 순회: 밝기 적용 + 대비 계산용 평균 구하기
+        total = 0.0
+        for y in range(height):
+            for x in range(width):
+                for c in range(channels):
+                    value = img[y, x, c] * scale + (scale - 1.0)
+                    value = min(max(value, -1.0), 1.0)
+                    img[y, x, c] = value
+                    total += value
+        
+        # 2번째 순회: 대비 + 노이즈 (필요한 이미지만)
+        factor = contrast[n]
+        add_noise = noisy[n]
+        if factor != 1.0 or add_noise:
+            mean = total / (height * width * channels)
+            for y in range(height):
+                for x in range(width):
+                    for c in range(channels):
+                        value = (img[y, x, c] - mean) * factor + mean
+                        value = min(max(value, -1.0), 1.0)
+                        if add_noise:
+                            value += np.random.standard_normal() * noise_std
+                            value = min(max(value, -1.0), 1.0)
+                        img[y, x, c] = value
+
+
+# numba가 있으면 여러 코어에서 도는 컴파일 커널 사용 (없으면 NumPy 배열 연산 경로)
+_augment_kernel = (
+    njit(parallel=True, fastmath=True, cache=True)(_augment_images)
+    if njit is not None else None
+)
+
+
 class DataLoader:
     """
     데이터를 불러오고 전처리하는 클래스
@@ -123,6 +206,22 @@ class DataLoader:
     - 상단 마스킹: 하늘/배경 부분 제거
     """
     
+    # 축소 디코딩 배율 → cv2.imread 플래그 (JPEG 디코더가 1/2, 1/4, 1/8 크기로 바로 풀어줌)
+    REDUCED_READ_FLAGS = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+    
+    # 💡 OpenCV 4.10 이상은 JPEG를 처음부터 RGB 순서로 디코딩할 수 있어요 (BGR → RGB 변환 생략)
+    READ_RGB = hasattr(cv2, 'IMREAD_COLOR_RGB')
+    if READ_RGB:
+        REDUCED_READ_FLAGS = {
+            scale: (flag & ~cv2.IMREAD_COLOR) | cv2.IMREAD_COLOR_RGB
+            for scale, flag in REDUCED_READ_FLAGS.items()
+        }
+    
     def __init__(self, config: TrainingConfig):
         self.config = config
         
@@ -131,8 +230,69 @@ class DataLoader:
         self.train_annotations_path = os.path.join(config.dataset_laneD1_path, "train", "annotations")
         self.val_images_path = os.path.join(config.dataset_laneD1_path, "validation", "images")
         self.val_annotations_path = os.path.join(config.dataset_laneD1_path, "validation", "annotations")
+        
+        # 이미지 로드 스레드 수 (cv2 디코딩/파일 읽기는 GIL을 풀기 때문에 스레드로도 병렬 처리됨)
+        self.num_workers = os.cpu_count() or 1
+        
+        # 💡 메모리에 올려둘 이미지 자료형: float16 (float32의 절반 크기)
+        #    -1~1 범위에서는 float16 오차(약 0.0005)가 픽셀 한 단계(약 0.008)보다 훨씬 작고,
+        #    모델에 들어갈 때 Keras가 float32로 바꿔주므로 모델/배포 입력 형식은 그대로예요
+        self.image_dtype = np.float16
+        
+        # 💡 픽셀값(0~255) → MobileNet 입력값(-1~1) 변환표
+        #    계산 대신 표에서 찾아 한 번에 변환해요
+        self._norm_lut = ((np.arange(256, dtype=np.float32) / 255.0) * 2.0 - 1.0).astype(self.image_dtype)
+        
+        # 데이터 증강을 한 번에 처리할 이미지 수 (노이즈 배열 크기 제한용)
+        self.augment_chunk = 64
+        
+        # 데이터 증강용 난수 생성기와 노이즈 버퍼 (버퍼는 처음 쓸 때 한 번만 만들고 계속 재사용)
+        self._rng = np.random.default_rng()
+        self._noise_buf = None
+        
+        # numba 커널 사용 여부 (컴파일에 실패하면 NumPy 경로로 전환)
+        self._use_augment_kernel = _augment_kernel is not None
+        
+        # tf.data 스트리밍에서 섞기에 사용할 이미지 수 (uint8 224x224 기준 약 150MB)
+        self.shuffle_buffer = 1000
+        
+        # JPEG 축소 디코딩 배율 (1 = 원본 크기, 데이터 폴더마다 _pick_decode_scale로 결정)
+        self.decode_scale = 1
+    
+    def _pick_decode_scale(self, sample_paths):
+        """
+        원본 JPEG 크기를 보고 축소 디코딩 배율 정하기
+        
+        💡 640x480 원본을 224x224로 줄일 거라면 처음부터 1/2 크기로 디코딩해도 충분해요
+        - JPEG 디코더가 작은 크기로 바로 풀어주므로 계산량이 크게 줄어듦
+        - 축소한 뒤에도 입력 크기(img_width x img_height)보다 작아지지 않는 배율만 사용
+        
+        Args:
+            sample_paths: 크기를 확인할 이미지 경로 목록
+                          (데이터 폴더의 이미지는 모두 같은 크기라고 가정, 읽히는 첫 이미지 사용)
+        
+        Returns:
+            int: 1, 2, 4, 8 중 하나
+        """
+        if not self.config.fast_decode:
+            return 1
+        
+        for sample_path in sample_paths[:5]:
+            sample = cv2.imread(sample_path)
+            if sample is not None:
+                break
+        else:
+            return 1
+        
+        height, width = sample.shape[:2]
+        scale = 1
+        while (scale < 8
+               and height // (scale * 2) >= self.config.img_height
+               and width // (scale * 2) >= self.config.img_width):
+            scale *= 2
+        return scale
     
-    def apply_augmentation(self, img):
+    def apply_augmentation(self, images):
         """
         데이터 증강 적용
         
@@ -162,145 +322,488 @@ class DataLoader:
         → 오른쪽인데 조향값은 30도(왼쪽) (위험!)
         → 조향값을 70도(오른쪽)로 바꿔야 하는데
             이 함수에서는 이미지만 처리하므로 불가능
+        
+        💡 이미지 묶음 images(N, H, W, 3, -1~1)를 제자리에서 수정합니다
+        - 이미지마다 따로 계산하지 않고 여러 장을 배열 연산 한 번으로 처리
+        - 이미지마다 적용 여부와 강도는 각각 무작위로 정해요
+        - 0~1 범위 기준의 밝기/대비/노이즈 값을 -1~1 범위에 맞게 바꿔서 적용
         """
-        if not self.config.use_augmentation:
-            return img
+        if not self.config.use_augmentation or self.config.augment_on_device:
+            return images
         
-        # ✅ Color Jitter (색상 변화) - 안전함
-        if self.config.augmentation_options.get('COLOR_JITTER', False):
-            if np.random.random() > 0.5:
-                # 밝기 조정 (0.8~1.2배)
-                brightness_factor = np.random.uniform(0.8, 1.2)
-                img = np.clip(img * brightness_factor, 0, 1)
+        options = self.config.augmentation_options
+        
+        for start in range(0, len(images), self.augment_chunk):
+            batch = images[start:start + self.augment_chunk]
+            count = len(batch)
+            
+            # 이미지별 증강 값 정하기 (배율 1 = 변화 없음)
+            brightness = np.ones(count, dtype=np.float32)
+            contrast = np.ones(count, dtype=np.float32)
+            noisy = np.zeros(count, dtype=bool)
+            
+            # 💡 필요한 난수를 한 번에 뽑아서 나눠 씀 (0: 색상 변화 여부, 1: 밝기, 2: 대비 여부, 3: 대비, 4: 노이즈 여부)
+            rand = self._rng.random((5, count), dtype=np.float32)
+            
+            # ✅ Color Jitter (색상 변화) - 안전함: 밝기/대비 0.8~1.2배
+            if options.get('COLOR_JITTER', False):
+                jitter = rand[0] > 0.5
+                brightness[jitter] = 0.8 + 0.4 * rand[1][jitter]
+                use_contrast = jitter & (rand[2] > 0.5)
+                contrast[use_contrast] = 0.8 + 0.4 * rand[3][use_contrast]
+            
+            # ✅ Gaussian Noise (가우시안 노이즈) - 안전함
+            if options.get('GAUSSIAN_NOISE', False):
+                noisy = rand[4] > 0.5
+            
+            # 💡 float16은 CPU 계산이 느려서 묶음 단위로 float32로 바꿔 계산한 뒤 되돌려 저장
+            work = batch if batch.dtype == np.float32 else batch.astype(np.float32)
+            
+            # 💡 numba가 있으면 모든 단계를 한 번에 처리하는 컴파일 커널 사용
+            done = False
+            if self._use_augment_kernel:
+                try:
+                    _augment_kernel(work, brightness, contrast, noisy, np.float32(0.1))
+                    done = True
+                except Exception as e:
+                    print(f"  ⚠️ numba 증강 커널을 사용할 수 없어 NumPy로 계산합니다: {e}")
+                    self._use_augment_kernel = False
+            
+            if not done:
+                self._augment_numpy(work, brightness, contrast, noisy)
+            if work is not batch:
+                batch[...] = work
+        
+        return images
+    
+    def _augment_numpy(self, batch, brightness, contrast, noisy):
+        """
+        NumPy 배열 연산으로 데이터 증강 적용 (numba가 없을 때 사용)
+        
+        Args:
+            batch: 이미지 묶음 (N, H, W, 3, -1~1), 제자리에서 수정
+            brightness: 이미지별 밝기 배율
+            contrast: 이미지별 대비 배율
+            noisy: 이미지별 노이즈 추가 여부
+        """
+        # 밝기 조정: 0~1 범위의 x*b는 -1~1 범위에서 y*b + (b-1)
+        if np.any(brightness != 1.0):
+            scale = brightness.reshape(-1, 1, 1, 1)
+            batch *= scale
+            batch += scale - 1.0
+            np.clip(batch, -1, 1, out=batch)
+        
+        # 대비 조정: 이미지 평균을 기준으로 늘이거나 줄이기
+        if np.any(contrast != 1.0):
+            factor = contrast.reshape(-1, 1, 1, 1)
+            mean = batch.mean(axis=(1, 2, 3), keepdims=True)
+            batch -= mean
+            batch *= factor
+            batch += mean
+            np.clip(batch, -1, 1, out=batch)
+        
+        noisy = np.flatnonzero(noisy)
+        if noisy.size:
+            # 💡 노이즈는 미리 만들어 둔 float32 버퍼에 바로 채워서 사용 (매번 새로 만들지 않음)
+            if (self._noise_buf is None
+                    or self._noise_buf.shape[1:] != batch.shape[1:]
+                    or len(self._noise_buf) < len(batch)):
+                self._noise_buf = np.empty(batch.shape, dtype=np.float32)
+            noise = self._noise_buf[:noisy.size]
+            
+            # 센서 노이즈 시뮬레이션 (0~1 범위 표준편차 0.05 = -1~1 범위 0.1)
+            self._rng.standard_normal(dtype=np.float32, out=noise)
+            noise *= 0.1
+            for noise_idx, img_idx in enumerate(noisy):
+                batch[img_idx] += noise[noise_idx]
+            np.clip(batch, -1, 1, out=batch)
+    
+    def _read_steering(self, json_path):
+        """
+        JSON 파일에서 조향값 읽기 및 검증
+        
+        Args:
+            json_path: 라벨 JSON 파일 경로
+        
+        Returns:
+            float: 조향값 (-1~1로 클리핑), 문제가 있으면 None
+        """
+        try:
+            data = load_json(json_path)
+            
+            # 'steering' 키 확인
+            if 'steering' not in data:
+                print(f"  ⚠️ 'steering' 키가 없음: {os.path.basename(json_path)}")
+                return None
+            
+            steering = data['steering']
+            
+            # 조향값 타입 검증
+            if not isinstance(steering, (int, float)):
+                print(f"  ⚠️ 잘못된 조향값 타입: {os.path.basename(json_path)}")
+                return None
+            
+            # 조향값 범위 검증 및 클리핑
+            if not (-1.0 <= steering <= 1.0):
+                print(f"  ⚠️ 조향값 범위 초과 ({steering}): {os.path.basename(json_path)}")
+                steering = max(-1.0, min(1.0, steering))
+
+            return steering
                 
-                # 대비 조정 (0.8~1.2배)
-                if np.random.random() > 0.5:
-                    contrast_factor = np.random.uniform(0.8, 1.2)
-                    mean = np.mean(img)
-                    img = np.clip((img - mean) * contrast_factor + mean, 0, 1)
+        except json.JSONDecodeError:
+            print(f"  ⚠️ JSON 파싱 실패: {os.path.basename(json_path)}")
+            return None
+        except FileNotFoundError:
+            print(f"  ⚠️ JSON 파일 없음: {os.path.basename(json_path)}")
+            return None
+        except Exception as e:
+            print(f"  ⚠️ 예상치 못한 오류: {os.path.basename(json_path)} - {e}")
+            return None
+    
+    def _load_or_build_label_cache(self, annotations_dir):
+        """
+        라벨 캐시(_labels.npz) 불러오기, 없거나 오래됐으면 새로 만들기
         
-        # ✅ Gaussian Noise (가우시안 노이즈) - 안전함
-        if self.config.augmentation_options.get('GAUSSIAN_NOISE', False):
-            if np.random.random() > 0.5:
-                # 센서 노이즈 시뮬레이션
-                noise = np.random.normal(0, 0.05, img.shape)
-                img = np.clip(img + noise, 0, 1)
+        💡 작은 JSON 파일 수천 개를 매번 여는 대신 파일 하나만 읽어요
+        - 캐시 위치: annotations 폴더 옆 (예: train/_labels.npz)
+        - 폴더/파일 수정 시각과 파일 수가 바뀌면 자동으로 다시 만듦
+        - 문제가 있는 라벨은 NaN으로 저장
         
-        return img
+        Args:
+            annotations_dir: 라벨 JSON 폴더 경로
+        
+        Returns:
+            dict: {파일 기본 이름: 조향값(float, 문제 있으면 NaN)}
+        """
+        if not os.path.isdir(annotations_dir):
+            return {}
+        
+        # 현재 라벨 폴더 상태 (캐시가 최신인지 확인용)
+        json_entries = []
+        latest_mtime = 0
+        with os.scandir(annotations_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json') and entry.is_file():
+                    json_entries.append(entry)
+                    latest_mtime = max(latest_mtime, entry.stat().st_mtime_ns)
+        stamp = np.array(
+            [os.stat(annotations_dir).st_mtime_ns, latest_mtime, len(json_entries)], dtype=np.int64
+        )
+        
+        cache_path = os.path.join(os.path.dirname(os.path.normpath(annotations_dir)), "_labels.npz")
+        
+        # 캐시가 최신이면 그대로 사용
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cache:
+                    if np.array_equal(cache['stamp'], stamp):
+                        print(f"🏷️ 라벨 캐시 사용: {len(cache['names'])}개")
+                        return dict(zip(cache['names'].tolist(), cache['steering'].tolist()))
+            except Exception as e:
+                print(f"  ⚠️ 라벨 캐시 읽기 실패 (다시 만듭니다): {e}")
+        
+        # JSON을 한 번씩 읽어서 캐시 만들기
+        # 💡 파일 열기/읽기는 디스크를 기다리는 시간이 대부분이라 여러 스레드로 동시에 읽음
+        #    (이미지 디코딩보다 먼저 끝나서 라벨 없는 이미지는 디코딩하지 않음)
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            results = executor.map(self._read_steering, [entry.path for entry in json_entries])
+            names = [os.path.splitext(entry.name)[0] for entry in json_entries]
+            steering_values = [np.nan if steering is None else steering for steering in results]
+        
+        try:
+            np.savez_compressed(
+                cache_path,
+                names=np.array(names, dtype=str),
+                steering=np.array(steering_values, dtype=np.float64),
+                stamp=stamp
+            )
+            print(f"🏷️ 라벨 캐시 생성: {len(names)}개 → {cache_path}")
+        except OSError as e:
+            print(f"  ⚠️ 라벨 캐시 저장 실패: {e}")
+        
+        return dict(zip(names, steering_values))
     
-    def load_image_and_label(self, img_path, json_path):
+    def load_image_and_label(self, img_path, json_path, out=None, steering=None):
         """
         이미지와 라벨(조향값) 한 쌍을 불러오기
         
         [MobileNet 전처리 과정]
         1. 이미지 파일 읽기
         2. 크기 조정 (모든 이미지를 같은 크기로)
-        3. 색상 변환 (BGR → RGB)
-        4. 정규화 (0~255 → 0~1)
-        5. 데이터 증강 적용 (선택사항)
-        6. 상단 마스킹 (하늘 부분 제거)
-        7. MobileNet 정규화 (0~1 → -1~1)
-        8. JSON에서 조향값 읽기 (-1~1 범위)
-        """
-        # 1. 이미지 읽기
-        img = cv2.imread(img_path)
+        3. 색상 변환 (BGR → RGB, OpenCV가 지원하면 디코딩할 때 바로 RGB로 읽음)
+        4. MobileNet 정규화 (0~255 → -1~1, 변환표로 한 번에 out에 기록)
+        5. 상단 마스킹 (하늘 부분 제거)
+        6. JSON에서 조향값 읽기 (-1~1 범위)
+        
+        데이터 증강은 전체를 불러온 뒤 apply_augmentation에서 묶음으로 적용합니다
+        
+        Args:
+            img_path: 이미지 파일 경로
+            json_path: 라벨 JSON 파일 경로
+            out: 결과를 바로 써넣을 image_dtype 배열 (H, W, 3), None이면 새로 생성
+            steering: 라벨 캐시에서 이미 읽은 조향값 (None이면 JSON 파일에서 읽음)
+        """
+        # 6. 조향값 먼저 확인 (라벨이 없으면 이미지를 읽을 필요 없음)
+        if steering is None:
+            steering = self._read_steering(json_path)
+            if steering is None:
+                return None, None
+        
+        # 1. 이미지 읽기 (fast_decode면 축소 크기로 바로 디코딩)
+        img = cv2.imread(img_path, self.REDUCED_READ_FLAGS[self.decode_scale])
         if img is None:
             print(f"  ⚠️ 이미지 로드 실패: {os.path.basename(img_path)}")
             return None, None
         
-        # 2. 크기 조정
+        # 2. 크기 조정 (uint8 그대로)
         img = cv2.resize(img, (self.config.img_width, self.config.img_height))
         
-        # 3. BGR → RGB 변환
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        
-        # 4. 정규화: 0~255 → 0~1
-        img = img.astype(np.float32) / 255.0
+        # 3. BGR → RGB 변환 (제자리 변환, RGB로 바로 디코딩했으면 생략)
+        if not self.READ_RGB:
+            cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
         
-        # 5. 데이터 증강 적용
-        img = self.apply_augmentation(img)
-               
-        # 6. MobileNet 전처리: 0~1 → -1~1
-        img = img * 2.0 - 1.0
+        # 4. MobileNet 정규화: 0~255 → -1~1
+        # 💡 계산 대신 변환표에서 찾아 out 배열에 바로 기록 (새 배열을 만들지 않음)
+        if out is None:
+            out = np.empty(img.shape, dtype=self.image_dtype)
+        np.take(self._norm_lut, img, out=out, mode='clip')
+        img = out
         
-        # 7. JSON 읽기 및 검증
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # 'steering' 키 확인
-                if 'steering' not in data:
-                    print(f"  ⚠️ 'steering' 키가 없음: {os.path.basename(json_path)}")
-                    return None, None
-                
-                steering = data['steering']
-                
-                # 조향값 타입 검증
-                if not isinstance(steering, (int, float)):
-                    print(f"  ⚠️ 잘못된 조향값 타입: {os.path.basename(json_path)}")
-                    return None, None
-                
-                # 조향값 범위 검증 및 클리핑
-                if not (-1.0 <= steering <= 1.0):
-                    print(f"  ⚠️ 조향값 범위 초과 ({steering}): {os.path.basename(json_path)}")
-                    steering = max(-1.0, min(1.0, steering))
-
-                return img, steering
-                
-        except json.JSONDecodeError:
-            print(f"  ⚠️ JSON 파싱 실패: {os.path.basename(json_path)}")
-            return None, None
-        except FileNotFoundError:
-            print(f"  ⚠️ JSON 파일 없음: {os.path.basename(json_path)}")
-            return None, None
-        except Exception as e:
-            print(f"  ⚠️ 예상치 못한 오류: {os.path.basename(json_path)} - {e}")
-            return None, None
+        return img, steering
     
-    def load_dataset_laneD1(self, images_dir, annotations_dir):
-        """전체 데이터셋 불러오기 (검증 강화)"""
-        images = []
-        labels = []
-        failed_files = []
+    def _collect_labeled_files(self, images_dir, annotations_dir):
+        """
+        라벨(조향값)이 있는 이미지 파일 목록 만들기
         
-        if not os.path.exists(images_dir):
-            print(f"⚠️ 경로가 존재하지 않습니다: {images_dir}")
-            return np.array([]), np.array([])
+        Args:
+            images_dir: 이미지 폴더 경로
+            annotations_dir: 라벨 JSON 폴더 경로
+        
+        Returns:
+            tuple: (전체 이미지 수, [(파일 이름, 이미지 경로, JSON 경로, 조향값), ...], 실패 파일 목록)
+                   이미지가 없으면 None
+        """
+        failed_files = []
         
         # 이미지 파일 목록 가져오기
-        image_files = sorted([f for f in os.listdir(images_dir) if f.endswith('.jpg')])
-        total_files = len(image_files)
+        # 💡 os.scandir: 이름, 경로, 파일 종류를 한 번에 알려줘서 항목마다 따로 물어볼 필요가 없어요
+        #    (폴더가 없는지도 따로 확인하지 않고 scandir 오류로 바로 알 수 있음)
+        try:
+            with os.scandir(images_dir) as entries:
+                image_entries = [
+                    e for e in entries if e.name.endswith('.jpg') and e.is_file()
+                ]
+        except FileNotFoundError:
+            print(f"⚠️ 경로가 존재하지 않습니다: {images_dir}")
+            return None
+        image_entries.sort(key=lambda e: e.name)  # 실행할 때마다 같은 순서
+        total_files = len(image_entries)
         
         if total_files == 0:
             print(f"⚠️ 이미지 파일이 없습니다: {images_dir}")
-            return np.array([]), np.array([])
+            return None
         
         print(f"📂 {total_files}개 이미지 발견...")
         
+        # 라벨은 캐시 파일에서 한 번에 읽음
+        label_cache = self._load_or_build_label_cache(annotations_dir)
+        
+        # (파일 이름, 이미지 경로, JSON 경로, 조향값) 목록을 미리 만들어 둠
+        # 💡 라벨이 없거나 잘못된 이미지는 여기서 바로 실패 처리 (읽고 변환할 필요 없음)
+        jobs = []
+        for entry in image_entries:
+            base_name = os.path.splitext(entry.name)[0]
+            steering = label_cache.get(base_name)
+            if steering is None:
+                print(f"  ⚠️ JSON 파일 없음: {base_name}.json")
+                failed_files.append(entry.name)
+            elif steering != steering:  # NaN: 캐시 만들 때 문제가 확인된 라벨
+                failed_files.append(entry.name)
+            else:
+                jobs.append((
+                    entry.name,
+                    entry.path,
+                    os.path.join(annotations_dir, f"{base_name}.json"),
+                    steering
+                ))
+        
+        # 축소 디코딩 배율 결정 (앞쪽 이미지 기준)
+        if jobs:
+            self.decode_scale = self._pick_decode_scale([job[1] for job in jobs[:5]])
+            if self.decode_scale > 1:
+                print(f"⚡ 축소 디코딩: 1/{self.decode_scale} 크기로 읽기")
+        
+        return total_files, jobs, failed_files
+    
+    def load_dataset_laneD1(self, images_dir, annotations_dir):
+        """
+        전체 데이터셋 불러오기 (검증 강화)
+        
+        💡 처음 불러온 결과는 전처리 캐시(.npy)로 저장해 두고,
+           파일 목록/라벨/이미지 크기가 같으면 다음부터는 JPEG 디코딩 없이 캐시에서 바로 읽어요
+        
+        Returns:
+            tuple: (이미지 배열 (N, H, W, 3), 조향값 배열 (N,))
+                   - 미리 만든 배열의 앞부분(view) 또는 캐시 파일을 그대로 돌려주므로 추가 복사 없음
+        """
+        image_shape = (self.config.img_height, self.config.img_width, 3)
+        
+        collected = self._collect_labeled_files(images_dir, annotations_dir)
+        if collected is None:
+            # 데이터가 없어도 모양/자료형은 같은 빈 배열
+            return np.empty((0,) + image_shape, dtype=self.image_dtype), np.empty(0, dtype=np.float32)
+        total_files, jobs, failed_files = collected
+        
+        cached = self._load_preprocessed_cache(images_dir, jobs)
+        if cached is not None:
+            images, labels, decode_failed = cached
+        else:
+            images, labels, decode_failed = self._decode_jobs(jobs)
+            self._save_preprocessed_cache(images_dir, jobs, images, labels, decode_failed)
+        failed_files.extend(decode_failed)
+        
+        # 데이터 증강 (불러온 이미지 전체에 묶음 단위로 적용)
+        if self.config.use_augmentation and not self.config.augment_on_device:
+            print("🎨 데이터 증강 적용 중...")
+            self.apply_augmentation(images)
+        
+        self._report_load_result(total_files, len(images), failed_files)
+        
+        return images, labels
+    
+    def _decode_jobs(self, jobs):
+        """
+        이미지 목록을 여러 스레드로 읽어서 하나의 배열에 채우기
+        
+        Args:
+            jobs: _collect_labeled_files가 만든 (파일 이름, 이미지 경로, JSON 경로, 조향값) 목록
+        
+        Returns:
+            tuple: (이미지 배열, 조향값 배열, 읽기에 실패한 파일 이름 목록)
+        """
+        image_shape = (self.config.img_height, self.config.img_width, 3)
+        
+        # 💡 결과 배열을 한 번에 만들어 두고 각 이미지를 제자리에 기록
+        #    (리스트에 모은 뒤 np.array로 복사하면 메모리가 두 배로 필요해요)
+        images = np.empty((len(jobs),) + image_shape, dtype=self.image_dtype)
+        labels = np.empty(len(jobs), dtype=np.float32)
+        failed_files = []
+        
+        # 💡 여러 스레드가 동시에 이미지를 읽고 변환 (executor.map은 결과 순서를 유지)
         loaded_count = 0
-        for idx, img_file in enumerate(image_files, 1):
-            # 이미지 경로
-            img_path = os.path.join(images_dir, img_file)
-            
-            # JSON 경로
-            base_name = os.path.splitext(img_file)[0]
-            json_path = os.path.join(annotations_dir, f"{base_name}.json")
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            results = executor.map(
+                lambda i: self.load_image_and_label(
+                    jobs[i][1], jobs[i][2], out=images[i], steering=jobs[i][3]
+                ),
+                range(len(jobs))
+            )
             
-            # 이미지와 라벨 로드
-            img, label = self.load_image_and_label(img_path, json_path)
+            for idx, (job, (img, label)) in enumerate(zip(jobs, results), 1):
+                if img is not None and label is not None:
+                    # 앞에서 실패한 파일이 있으면 빈 자리로 당겨서 저장
+                    if loaded_count != idx - 1:
+                        images[loaded_count] = images[idx - 1]
+                    labels[loaded_count] = label
+                    loaded_count += 1
+                else:
+                    failed_files.append(job[0])
+                                
+                # 10%마다 표시
+                if idx % max(1, len(jobs) // 10) == 0:
+                    progress = (idx / len(jobs)) * 100
+                    print(f"⏳ 진행중... {progress:.0f}%")
+        
+        return images[:loaded_count], labels[:loaded_count], failed_files
+    
+    def _preprocessed_cache_paths(self, images_dir):
+        """전처리 캐시 파일 경로 (이미지, 라벨, 설명서) - 이미지 크기별로 따로 저장"""
+        base = os.path.join(
+            os.path.dirname(os.path.normpath(images_dir)),
+            f"_preprocessed_{self.config.img_width}x{self.config.img_height}"
+        )
+        return f"{base}.npy", f"{base}_labels.npy", f"{base}.json"
+    
+    def _preprocessed_cache_key(self, jobs):
+        """
+        전처리 캐시가 지금 데이터와 같은지 확인하는 기준값
+        
+        파일 목록/조향값, 이미지 크기, 축소 디코딩 배율, 저장 자료형이 모두 같아야 캐시를 사용
+        """
+        file_list = "\n".join(f"{job[0]}:{job[3]!r}" for job in jobs)
+        return {
+            'files_crc': zlib.crc32(file_list.encode('utf-8')),
+            'count': len(jobs),
+            'width': self.config.img_width,
+            'height': self.config.img_height,
+            'decode_scale': self.decode_scale,
+            'dtype': np.dtype(self.image_dtype).name,
+        }
+    
+    def _load_preprocessed_cache(self, images_dir, jobs):
+        """
+        전처리 캐시 불러오기 (memmap: 필요한 부분만 디스크에서 읽음)
+        
+        Returns:
+            tuple: (이미지 배열, 조향값 배열, 읽기 실패 파일 목록), 캐시가 없거나 오래됐으면 None
+        """
+        if not self.config.cache_preprocessed:
+            return None
+        
+        images_path, labels_path, manifest_path = self._preprocessed_cache_paths(images_dir)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('key') != self._preprocessed_cache_key(jobs):
+                return None
             
-            if img is not None and label is not None:
-                images.append(img)
-                labels.append(label)
-                loaded_count += 1
-            else:
-                failed_files.append(img_file)
-                            
-            # 10%마다 표시
-            if idx % max(1, total_files // 10) == 0:
-                progress = (idx / total_files) * 100
-                print(f"⏳ 진행중... {progress:.0f}%")
+            # 증강은 배열을 직접 수정하므로 복사-쓰기(c) 모드, 아니면 읽기 전용(r) 모드
+            augment_here = self.config.use_augmentation and not self.config.augment_on_device
+            images = np.load(images_path, mmap_mode='c' if augment_here else 'r')
+            labels = np.load(labels_path)
+        except (OSError, ValueError):
+            return None
+        
+        print(f"💾 전처리 캐시 사용: {len(images)}개 (JPEG 디코딩 생략)")
+        return images, labels, manifest.get('decode_failed', [])
+    
+    def _save_preprocessed_cache(self, images_dir, jobs, images, labels, decode_failed):
+        """전처리 결과를 캐시로 저장 (설명서 JSON을 마지막에 써서 중간에 끊겨도 안전)"""
+        if not self.config.cache_preprocessed or len(images) == 0:
+            return
+        
+        images_path, labels_path, manifest_path = self._preprocessed_cache_paths(images_dir)
+        try:
+            # 이전 설명서를 먼저 지워서 저장 도중에는 캐시가 사용되지 않게 함
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            with open(images_path, 'wb') as f:
+                np.save(f, images)
+            with open(labels_path, 'wb') as f:
+                np.save(f, labels)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'key': self._preprocessed_cache_key(jobs),
+                    'decode_failed': decode_failed,
+                    'created': datetime.now().isoformat(timespec='seconds'),
+                }, f, ensure_ascii=False, indent=2)
+            size_mb = os.path.getsize(images_path) / (1024 * 1024)
+            print(f"💾 전처리 캐시 저장: {images_path} ({size_mb:.0f}MB)")
+        except OSError as e:
+            print(f"  ⚠️ 전처리 캐시 저장 실패: {e}")
+    
+    def _report_load_result(self, total_files, loaded_count, failed_files):
+        """
+        로드 결과(성공률, 실패 파일, 데이터 수) 출력 및 검증
+        
+        Args:
+            total_files: 발견한 전체 이미지 수
+            loaded_count: 학습에 사용할 수 있는 이미지 수
+            failed_files: 실패한 파일 이름 목록
         
+        Raises:
+            ValueError: 성공률이 50% 미만이거나 데이터가 100개 미만일 때
+        """
         print(f"\n  ✅ {loaded_count}개 로드 완료! (100.0%)              ")
         
         # 로드 성공률 계산
@@ -364,52 +867,200 @@ class DataLoader:
         else:
             print(f"     🌟 우수: {loaded_count}개")
             print(f"        → 매우 좋은 학습 성능 기대")
+    
+    def _decode_tf(self, path, label):
+        """
+        tf.data용 이미지 읽기: 파일 → RGB 디코딩 → 크기 조정 → uint8
         
-        return np.array(images), np.array(labels)
+        💡 uint8로 저장해두면 캐시 파일과 섞기(shuffle) 버퍼가 float32보다 4배 작아요
+        💡 decode_jpeg는 바로 RGB로 풀어주고, ratio로 축소 디코딩도 할 수 있어요
+        """
+        image = tf.io.decode_jpeg(
+            tf.io.read_file(path), channels=3, ratio=self.decode_scale
+        )
+        image = tf.image.resize(image, (self.config.img_height, self.config.img_width))
+        image = tf.cast(tf.clip_by_value(tf.round(image), 0.0, 255.0), tf.uint8)
+        return image, label
+    
+    def _normalize_tf(self, image, label):
+        """tf.data용 MobileNet 정규화: 0~255 → -1~1"""
+        image = tf.cast(image, tf.float32) * (2.0 / 255.0) - 1.0
+        return image, label
+    
+    def _augment_tf(self, image, label):
+        """
+        tf.data용 데이터 증강 (apply_augmentation과 같은 규칙, -1~1 범위 이미지)
+        
+        💡 에포크마다 새로 무작위 적용되므로 같은 사진도 매번 조금씩 달라져요
+        """
+        options = self.config.augmentation_options
+        
+        # ✅ Color Jitter (색상 변화) - 안전함
+        if options.get('COLOR_JITTER', False):
+            draws = tf.random.uniform([4])
+            jitter = draws[0] > 0.5
+            
+            # 밝기 조정 (0.8~1.2배)
+            brightness = tf.where(jitter, 0.8 + 0.4 * draws[1], 1.0)
+            image = tf.clip_by_value(image * brightness + (brightness - 1.0), -1.0, 1.0)
+            
+            # 대비 조정 (0.8~1.2배)
+            contrast = tf.where(jitter & (draws[2] > 0.5), 0.8 + 0.4 * draws[3], 1.0)
+            mean = tf.reduce_mean(image)
+            image = tf.clip_by_value((image - mean) * contrast + mean, -1.0, 1.0)
+        
+        # ✅ Gaussian Noise (가우시안 노이즈) - 안전함
+        if options.get('GAUSSIAN_NOISE', False):
+            noise_on = tf.cast(tf.random.uniform([]) > 0.5, tf.float32)
+            noise = tf.random.normal(tf.shape(image), stddev=0.1) * noise_on
+            image = tf.clip_by_value(image + noise, -1.0, 1.0)
+        
+        return image, label
+    
+    def build_tf_dataset(self, paths, labels, training=False, cache_path=None):
+        """
+        이미지 파일 목록으로 tf.data 파이프라인 만들기
+        
+        [파이프라인]
+        파일 읽기/디코딩 (병렬) → 캐시 → 섞기 → 정규화/증강 → 배치 → 미리 준비(prefetch)
+        
+        💡 전체 데이터를 메모리에 올리지 않고 배치 단위로 흘려보내요
+        - GPU가 학습하는 동안 CPU가 다음 배치를 미리 준비
+        - 첫 에포크에 디코딩한 결과는 cache_path 파일에 저장해서 다시 사용
+        
+        Args:
+            paths: 이미지 파일 경로 목록
+            labels: 조향값 배열
+            training: True면 매 에포크 섞고 데이터 증강 적용
+            cache_path: 디코딩 결과 캐시 파일 경로 (None이면 캐시 안 함)
+        
+        Returns:
+            tf.data.Dataset: (이미지, 조향값) 배치
+        """
+        autotune = tf.data.AUTOTUNE
+        
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (list(paths), np.asarray(labels, dtype=np.float32))
+        )
+        dataset = dataset.map(self._decode_tf, num_parallel_calls=autotune)
+        dataset = dataset.ignore_errors()  # 손상된 이미지는 건너뛰기
+        if cache_path is not None:
+            dataset = dataset.cache(cache_path)
+        
+        if training:
+            dataset = dataset.shuffle(min(len(paths), self.shuffle_buffer))
+        
+        dataset = dataset.map(self._normalize_tf, num_parallel_calls=autotune)
+        if training and self.config.use_augmentation and not self.config.augment_on_device:
+            dataset = dataset.map(self._augment_tf, num_parallel_calls=autotune)
+        
+        # 💡 XLA는 입력 크기마다 새로 컴파일하므로 훈련 데이터의 마지막 자투리 배치는 버림
+        drop_remainder = (training and self.config.jit_compile
+                          and len(paths) > self.config.batch_size)
+        return dataset.batch(self.config.batch_size, drop_remainder=drop_remainder).prefetch(autotune)
+    
+    def load_tf_dataset(self, images_dir, annotations_dir, training=False):
+        """
+        데이터셋을 tf.data 파이프라인으로 준비 (이미지는 학습 중에 읽음)
+        
+        Args:
+            images_dir: 이미지 폴더 경로
+            annotations_dir: 라벨 JSON 폴더 경로
+            training: True면 섞기/데이터 증강 적용
+        
+        Returns:
+            tuple: (tf.data.Dataset 또는 None, 이미지 수)
+        """
+        collected = self._collect_labeled_files(images_dir, annotations_dir)
+        if collected is None:
+            return None, 0
+        total_files, jobs, failed_files = collected
+        
+        self._report_load_result(total_files, len(jobs), failed_files)
+        
+        paths = [job[1] for job in jobs]
+        labels = [job[3] for job in jobs]
+        
+        # 캐시 파일 이름에 이미지 크기, 디코딩 배율, 파일 목록과 조향값을 넣어서 바뀌면 새로 만들게 함
+        # 💡 캐시에는 조향값도 같이 저장되므로, 라벨만 고쳐도 캐시를 새로 만들어야 해요
+        cache_crc = zlib.crc32("\n".join(paths).encode('utf-8'))
+        cache_crc = zlib.crc32(np.asarray(labels, dtype=np.float32).tobytes(), cache_crc)
+        cache_path = os.path.join(
+            os.path.dirname(os.path.normpath(images_dir)),
+            f"_tfcache_{self.config.img_width}x{self.config.img_height}"
+            f"_r{self.decode_scale}_{cache_crc:08x}"
+        )
+        remove_stale_tf_caches(cache_path)
+        
+        dataset = self.build_tf_dataset(paths, labels, training=training, cache_path=cache_path)
+        return dataset, len(jobs)
 
     def load_all_data(self):
-        """훈련 및 검증 데이터 모두 로드"""
+        """
+        훈련 및 검증 데이터 모두 로드
+        
+        Returns:
+            tuple: (훈련 이미지, 훈련 라벨, 검증 이미지, 검증 라벨)
+                   stream_dataset이면 이미지 자리에 tf.data.Dataset, 라벨 자리에 None
+        """
         print("\n" + "=" * 60)
         print("📥 데이터 로드 중...")
         print("=" * 60)
         
-        # 훈련 데이터
-        print("\n[훈련 데이터]")
-        train_images, train_labels = self.load_dataset_laneD1(
-            self.train_images_path,
-            self.train_annotations_path
-        )
-        
-        # 검증 데이터
-        print("\n[검증 데이터]")
-        val_images, val_labels = self.load_dataset_laneD1(
-            self.val_images_path,
-            self.val_annotations_path
-        )
+        if self.config.stream_dataset:
+            # 💡 스트리밍: 이미지는 학습 중에 tf.data가 배치 단위로 읽음 (라벨 자리는 None)
+            print("\n[훈련 데이터]")
+            train_images, train_count = self.load_tf_dataset(
+                self.train_images_path,
+                self.train_annotations_path,
+                training=True
+            )
+            
+            print("\n[검증 데이터]")
+            val_images, val_count = self.load_tf_dataset(
+                self.val_images_path,
+                self.val_annotations_path
+            )
+            train_labels = val_labels = None
+        else:
+            # 훈련 데이터
+            print("\n[훈련 데이터]")
+            train_images, train_labels = self.load_dataset_laneD1(
+                self.train_images_path,
+                self.train_annotations_path
+            )
+            
+            # 검증 데이터
+            print("\n[검증 데이터]")
+            val_images, val_labels = self.load_dataset_laneD1(
+                self.val_images_path,
+                self.val_annotations_path
+            )
+            train_count, val_count = len(train_images), len(val_images)
         
-        if len(train_images) == 0:
+        if train_count == 0:
             raise ValueError("❌ 훈련 데이터가 없습니다!")
         
         # 🆕 전체 요약 추가
-        total_data = len(train_images) + len(val_images)
+        total_data = train_count + val_count
         
         print(f"\n" + "=" * 60)
         print(f"✅ 전체 데이터 로드 완료")
         print("=" * 60)
-        print(f"  📊 훈련 데이터: {len(train_images):,}개")
-        print(f"  📊 검증 데이터: {len(val_images):,}개")
+        print(f"  📊 훈련 데이터: {train_count:,}개")
+        print(f"  📊 검증 데이터: {val_count:,}개")
         print(f"  📊 전체 합계: {total_data:,}개")
-        print(f"  📊 훈련/검증 비율: {len(train_images)/total_data*100:.1f}% / {len(val_images)/total_data*100:.1f}%")
+        print(f"  📊 훈련/검증 비율: {train_count/total_data*100:.1f}% / {val_count/total_data*100:.1f}%")
         
         # 데이터셋 균형 확인
-        if len(val_images) == 0:
+        if val_count == 0:
             print(f"\n  ⚠️ 경고: 검증 데이터가 없습니다!")
             print(f"     모델 성능 평가가 불가능합니다")
-        elif len(val_images) / total_data < 0.1:
-            print(f"\n  ⚠️ 주의: 검증 데이터 비율이 낮습니다 ({len(val_images)/total_data*100:.1f}%)")
+        elif val_count / total_data < 0.1:
+            print(f"\n  ⚠️ 주의: 검증 데이터 비율이 낮습니다 ({val_count/total_data*100:.1f}%)")
             print(f"     일반적으로 10-20% 권장")
-        elif len(val_images) / total_data > 0.3:
-            print(f"\n  ⚠️ 주의: 검증 데이터 비율이 높습니다 ({len(val_images)/total_data*100:.1f}%)")
+        elif val_count / total_data > 0.3:
+            print(f"\n  ⚠️ 주의: 검증 데이터 비율이 높습니다 ({val_count/total_data*100:.1f}%)")
             print(f"     훈련 데이터가 부족할 수 있습니다")
         
         print("=" * 60)
@@ -445,6 +1096,38 @@ class ModelBuilder:
     def __init__(self, config: TrainingConfig):
         self.config = config
     
+    def build_augmentation_layers(self):
+        """
+        GPU에서 실행할 데이터 증강 레이어 만들기 (augment_on_device일 때만)
+        
+        💡 Keras 증강 레이어는 훈련할 때만 동작하고 예측(추론)할 때는 그대로 통과시켜요
+        - CPU는 이미지를 넘겨주기만 하고, 증강은 GPU에서 모델 계산과 함께 처리
+        - 저장된 모델의 입력 형식(-1~1)은 그대로라서 배포 코드는 바꿀 필요 없음
+        
+        Returns:
+            list: 모델 맨 앞에 넣을 레이어 목록 (사용하지 않으면 빈 목록)
+        """
+        if not (self.config.use_augmentation and self.config.augment_on_device):
+            return []
+        
+        options = self.config.augmentation_options
+        augmentation_layers = []
+        
+        # ✅ Color Jitter: 밝기/대비 ±20%
+        if options.get('COLOR_JITTER', False):
+            augmentation_layers.append(
+                layers.RandomBrightness(0.2, value_range=(-1.0, 1.0), name='aug_brightness')
+            )
+            augmentation_layers.append(
+                layers.RandomContrast(0.2, value_range=(-1.0, 1.0), name='aug_contrast')
+            )
+        
+        # ✅ Gaussian Noise: 센서 노이즈 (-1~1 범위 표준편차 0.1 = 0~1 범위 0.05)
+        if options.get('GAUSSIAN_NOISE', False):
+            augmentation_layers.append(layers.GaussianNoise(0.1, name='aug_noise'))
+        
+        return augmentation_layers
+    
     def build_mobilenet_model(self):
         """
         MobileNet 기반 모델 구축
@@ -501,7 +1184,15 @@ class ModelBuilder:
         # ===== 3. 조향 예측 레이어 추가 =====
         print("\n🔧 조향 예측 레이어 추가 중...")
         
-        model = keras.Sequential([
+        # 🎨 GPU 데이터 증강 레이어 (augment_on_device일 때만, 훈련 중에만 동작)
+        augmentation_layers = self.build_augmentation_layers()
+        if augmentation_layers:
+            print(f"  🎨 GPU 증강 레이어 {len(augmentation_layers)}개 추가")
+            augmentation_layers = [
+                keras.Input(shape=(self.config.img_height, self.config.img_width, 3))
+            ] + augmentation_layers
+        
+        model = keras.Sequential(augmentation_layers + [
             # 🔒 고정된 특징 추출 (MobileNet)
             base_model,
             
@@ -514,15 +1205,18 @@ class ModelBuilder:
             
             layers.Dense(32, activation='relu', name='steering_fc2'),
             
-            # 최종 조향 출력: -1 ~ 1
-            layers.Dense(1, activation='tanh', name='steering_output')
+            # 최종 조향 출력: -1 ~ 1 (혼합 정밀도에서도 출력은 float32로 계산)
+            layers.Dense(1, activation='tanh', dtype='float32', name='steering_output')
         ], name='BrainAI_Car_MobileNet')
         
         # ===== 4. 모델 컴파일 =====
+        # 💡 jit_compile=True: XLA가 MobileNet 연산들을 합쳐 한 번에 실행 (입력 크기 고정일 때 효과적)
+        #    False면 Keras 기본값('auto')에 맡김
         model.compile(
             optimizer=keras.optimizers.Adam(learning_rate=self.config.learning_rate),
             loss='mse',      # Mean Squared Error
-            metrics=['mae']  # Mean Absolute Error
+            metrics=['mae'],  # Mean Absolute Error
+            jit_compile=True if self.config.jit_compile else 'auto'
         )
         
         print("  ✅ 조향 예측 레이어 추가 완료")
@@ -534,7 +1228,8 @@ class ModelBuilder:
         
         # 파라미터 통계
         total_params = model.count_params()
-        trainable_params = sum([tf.size(w).numpy() for w in model.trainable_weights])
+        # 💡 가중치 모양(shape)만으로 계산 (텐서 값을 가져오지 않아 장치와 동기화하지 않음)
+        trainable_params = int(sum(int(np.prod(w.shape)) for w in model.trainable_weights))
         non_trainable_params = total_params - trainable_params
         
         print(f"\n📊 모델 통계:")
@@ -643,6 +1338,9 @@ class ModelTrainer:
         ✅ loss와 val_loss가 비슷하게 감소
         ✅ mae가 2도 이하로 수렴
         ❌ val_loss가 증가 → 과적합!
+        
+        train_images/val_images 자리에 tf.data.Dataset을 주면 (라벨은 None)
+        배치 크기는 데이터셋에 정해진 값을 사용합니다
         """
         print("\n" + "=" * 60)
         print(f"🚀 MobileNet 모델 훈련 시작 - {self.config.epochs} 에포크")
@@ -656,15 +1354,25 @@ class ModelTrainer:
         callbacks = self.setup_callbacks()
         
         # 훈련 시작!
-        self.history = model.fit(
-            train_images,
-            train_labels,
-            batch_size=self.config.batch_size,
-            epochs=self.config.epochs,
-            validation_data=(val_images, val_labels),
-            callbacks=callbacks,
-            verbose=1
-        )
+        if isinstance(train_images, tf.data.Dataset):
+            # 🌊 tf.data 스트리밍: 배치는 데이터셋이 만들어 줌
+            self.history = model.fit(
+                train_images,
+                epochs=self.config.epochs,
+                validation_data=val_images,
+                callbacks=callbacks,
+                verbose=1
+            )
+        else:
+            self.history = model.fit(
+                train_images,
+                train_labels,
+                batch_size=self.config.batch_size,
+                epochs=self.config.epochs,
+                validation_data=(val_images, val_labels),
+                callbacks=callbacks,
+                verbose=1
+            )
         
         self.model = model
         
@@ -678,7 +1386,13 @@ class ModelTrainer:
         print("📊 MobileNet 모델 평가")
         print("=" * 60)
         
-        loss, mae = self.model.evaluate(val_images, val_labels, verbose=0)
+        if isinstance(val_images, tf.data.Dataset):
+            loss, mae = self.model.evaluate(val_images, verbose=0)
+            # 예측 샘플용으로 첫 배치만 꺼내기
+            for sample_images, sample_labels in val_images.take(1):
+                val_images, val_labels = sample_images.numpy(), sample_labels.numpy()
+        else:
+            loss, mae = self.model.evaluate(val_images, val_labels, verbose=0)
                 
         print(f"\n검증 데이터 성능:")
         print(f"  📉 Loss (MSE): {loss:.4f}")
@@ -698,7 +1412,7 @@ class ModelTrainer:
         print(f"\n🎯 예측 샘플 (5개):")
         predictions = self.model.predict(val_images[:5], verbose=0)
         
-        for i in range(5):
+        for i in range(min(5, len(val_labels))):
             actual = val_labels[i]
             predicted = predictions[i][0]
             error = abs(actual - predicted)
@@ -820,6 +1534,17 @@ def model_train(config: TrainingConfig, models_dir="models"):
     else:
         print("ℹ️ GPU 없음 - CPU로 훈련 (시간이 오래 걸릴 수 있습니다)")
     
+    # 💡 혼합 정밀도: 대부분의 계산은 float16, 가중치와 최종 출력은 float32
+    #    GPU 텐서 코어에서 빨라지고 메모리도 절약됨 (CPU에서는 오히려 느려서 GPU일 때만 사용)
+    # ⚠️ 전역 설정이라 훈련이 끝나면 원래 정책으로 되돌려요 (아래 finally)
+    previous_policy = keras.mixed_precision.global_policy()
+    if config.mixed_precision:
+        if gpus:
+            keras.mixed_precision.set_global_policy('mixed_float16')
+            print("✅ 혼합 정밀도(mixed_float16) 활성화")
+        else:
+            print("ℹ️ GPU가 없어 혼합 정밀도를 사용하지 않습니다")
+    
     # Transfer Learning 안내
     print("\n" + "=" * 60)
     print("🎓 Transfer Learning with MobileNet")
@@ -901,6 +1626,10 @@ def model_train(config: TrainingConfig, models_dir="models"):
         print("  1. 오류 메시지를 잘 읽어보세요")
         print("  2. 선생님께 오류 메시지를 보여주세요")
         print("  3. TensorFlow가 제대로 설치되었는지 확인")
+    
+    finally:
+        # 같은 프로그램에서 다른 모델을 만들 때 float16이 따라가지 않도록 되돌리기
+        keras.mixed_precision.set_global_policy(previous_policy)
 
 
 # 버전 정보
@@ -31,6 +31,8 @@ utils/update_model.py
 
 import os
 import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
@@ -38,6 +40,39 @@ import cv2
 import matplotlib.pyplot as plt
 from datetime import datetime
 
+try:
+    from numba import njit  # 전처리 커널 JIT 컴파일 (선택)
+except ImportError:
+    njit = None
+
+from .training_utils import load_json, remove_stale_tf_caches
+
+
+def _normalize_masked(img, lut, out, half_height):
+    """
+    uint8 이미지를 -1~1로 정규화하면서 상단은 -1로 채우기 (픽셀 순회 한 번, numba로 컴파일해서 사용)
+    
+    Args:
+        img: RGB uint8 이미지 (H, W, 3)
+        lut: 0~255 → -1~1 정규화 변환표 (float32, 256개)
+        out: 결과를 써넣을 float32 배열 (H, W, 3)
+        half_height: 마스킹할 상단 높이 (이 줄 위는 -1)
+    """
+    height, width, channels = img.shape
+    for y in range(height):
+        if y < half_height:
+            for x in range(width):
+                for c in range(channels):
+                    out[y, x, c] = -1.0
+        else:
+            for x in range(width):
+                for c in range(channels):
+                    out[y, x, c] = lut[img[y, x, c]]
+
+
+# numba가 있으면 컴파일 커널 사용 (nogil: 이미지 읽기 스레드들이 동시에 실행 가능)
+_normalize_kernel = njit(nogil=True, cache=True)(_normalize_masked) if njit else None
+
 
 # ============================================================================
 # 🎓 1단계: MobileNet Fine-tuner 클래스
@@ -59,7 +94,15 @@ class MobileNetFineTuner:
     - 적은 에포크로 학습 (10~30)
     """
     
-    def __init__(self, model_path, new_data_path, models_dir="models"):
+    # 축소 디코딩 배율별 OpenCV 읽기 플래그 (fast_decode용)
+    REDUCED_READ_FLAGS = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+    
+    def __init__(self, model_path, new_data_path, models_dir="models", stream_dataset=None):
         """
         초기화
         
@@ -67,12 +110,27 @@ class MobileNetFineTuner:
             model_path: 기존 MobileNet 모델 파일 경로 (.keras)
             new_data_path: 새로운 데이터셋 경로
             models_dir: 모델 저장 폴더
+            stream_dataset: True면 전체 데이터를 메모리에 올리지 않고 tf.data로 배치마다 읽기
+                            None이면 데이터 크기를 보고 자동 선택 (max_in_memory_bytes 초과 시 스트리밍)
         """
         self.model_path = model_path
         self.new_data_path = new_data_path
         self.model = None
         self.base_model = None
         self.history = None
+        self.finetuned_model_path = None  # 최고 성능 모델 저장 경로 (콜백 설정 때 정해짐)
+        self.input_size = None  # 모델 입력 크기 (높이, 너비) - 모델을 불러올 때 한 번만 저장
+        self.stream_dataset = stream_dataset
+        self.max_in_memory_bytes = 2 * 1024 ** 3  # 자동 선택 기준: float32 이미지 배열 2GB
+        self.batch_size = 16  # 작은 배치로 안정적 학습
+        self.num_workers = os.cpu_count() or 1  # 이미지 읽기 스레드 수
+        self.cache_preprocessed = True  # 전처리 결과를 .npy 캐시로 저장해 다음 실행부터 바로 읽기
+        self.fast_decode = False  # 큰 JPEG를 1/2, 1/4, 1/8 크기로 바로 디코딩 (원본이 입력 크기의 2배 이상일 때)
+        self.decode_scale = 1     # 현재 데이터의 축소 디코딩 배율 (_pick_decode_scale이 정함)
+        
+        # 💡 MobileNet 정규화 변환표: 0~255 픽셀값 → -1~1 (256개 값을 미리 계산)
+        self._norm_lut = (np.arange(256, dtype=np.float32) / 255.0) * 2.0 - 1.0
+        self._use_normalize_kernel = _normalize_kernel is not None
         
         # 모델 저장 폴더
         self.models_dir = models_dir
@@ -97,6 +155,7 @@ class MobileNetFineTuner:
         
         # 모델 로드
         self.model = keras.models.load_model(self.model_path)
+        self.input_size = tuple(self.model.input_shape[1:3])
         
         # MobileNet 기본 모델 찾기
         for layer in self.model.layers:
@@ -148,8 +207,16 @@ class MobileNetFineTuner:
         total_layers = len(self.base_model.layers)
         freeze_until = total_layers - num_layers
         
+        # 💡 BatchNormalization은 해동 구간에서도 고정
+        #    - 학습 모드의 BN은 작은 배치(16장)로 평균/분산을 다시 계산해서 기존 학습을 망가뜨림
+        #    - 고정(trainable=False)된 BN은 추론 모드로 동작해서 계산도 줄어듦
+        bn_count = 0
         for i, layer in enumerate(self.base_model.layers):
-            if i < freeze_until:
+            if isinstance(layer, keras.layers.BatchNormalization):
+                layer.trainable = False
+                if i >= freeze_until:
+                    bn_count += 1
+            elif i < freeze_until:
                 layer.trainable = False
             else:
                 layer.trainable = True
@@ -159,7 +226,7 @@ class MobileNetFineTuner:
         frozen_count = len(self.base_model.layers) - trainable_count
         
         print(f"\n📊 레이어 상태:")
-        print(f"  🔒 고정: {frozen_count}개 (하위 레이어)")
+        print(f"  🔒 고정: {frozen_count}개 (하위 레이어 + 해동 구간의 BatchNorm {bn_count}개)")
         print(f"  🔓 해동: {trainable_count}개 (상위 레이어)")
         print(f"  📈 해동 비율: {trainable_count/total_layers*100:.1f}%")
         
@@ -188,102 +255,458 @@ class MobileNetFineTuner:
         val_images_path = os.path.join(self.new_data_path, "validation", "images")
         val_annotations_path = os.path.join(self.new_data_path, "validation", "annotations")
         
-        # 훈련 데이터
-        print("\n[새 훈련 데이터]")
-        train_images, train_labels = self._load_dataset(
-            train_images_path,
-            train_annotations_path
-        )
-        
-        # 검증 데이터
-        print("\n[새 검증 데이터]")
-        val_images, val_labels = self._load_dataset(
-            val_images_path,
-            val_annotations_path
-        )
+        stream = self.stream_dataset
+        if stream is None:
+            stream = self._should_stream([train_images_path, val_images_path])
+        
+        if stream:
+            # 💡 스트리밍: 이미지는 학습 중에 tf.data가 배치 단위로 읽음 (라벨 자리는 None)
+            print("\n[새 훈련 데이터]")
+            train_images, train_count = self._load_tf_dataset(
+                train_images_path,
+                train_annotations_path,
+                training=True
+            )
+            
+            print("\n[새 검증 데이터]")
+            val_images, val_count = self._load_tf_dataset(
+                val_images_path,
+                val_annotations_path
+            )
+            train_labels = val_labels = None
+        else:
+            # 훈련 데이터
+            print("\n[새 훈련 데이터]")
+            train_images, train_labels = self._load_dataset(
+                train_images_path,
+                train_annotations_path
+            )
+            
+            # 검증 데이터
+            print("\n[새 검증 데이터]")
+            val_images, val_labels = self._load_dataset(
+                val_images_path,
+                val_annotations_path
+            )
+            train_count, val_count = len(train_images), len(val_images)
         
-        if len(train_images) == 0:
+        if train_count == 0:
             raise ValueError("❌ 새로운 훈련 데이터가 없습니다!")
         
         print(f"\n✅ 새 데이터 로드 완료:")
-        print(f"  - 훈련: {len(train_images)}개")
-        print(f"  - 검증: {len(val_images)}개")
+        print(f"  - 훈련: {train_count}개")
+        print(f"  - 검증: {val_count}개")
         
         return train_images, train_labels, val_images, val_labels
     
-    def _load_dataset(self, images_dir, annotations_dir):
+    def _should_stream(self, images_dirs):
         """
-        데이터셋 로드 (MobileNet 전처리 적용)
+        이미지 수로 메모리 사용량을 계산해서 tf.data 스트리밍이 필요한지 판단
         
-        [전처리]
-        1. 0~255 → 0~1 정규화
-        2. 상단 마스킹 (하늘 제거)
-        3. 0~1 → -1~1 (MobileNet 표준)
+        💡 224x224 float32 이미지는 한 장에 약 0.6MB - 수천 장이면 몇 GB가 돼요
+        
+        Args:
+            images_dirs: 이미지 폴더 경로 목록 (훈련, 검증)
+        
+        Returns:
+            bool: 메모리에 올리기에 너무 크면 True
+        """
+        img_height, img_width = self.input_size
+        
+        image_count = 0
+        for images_dir in images_dirs:
+            if os.path.isdir(images_dir):
+                with os.scandir(images_dir) as it:
+                    image_count += sum(1 for entry in it if entry.name.endswith('.jpg'))
+        
+        needed_bytes = image_count * img_height * img_width * 3 * 4
+        if needed_bytes <= self.max_in_memory_bytes:
+            return False
+        
+        print(f"💡 이미지 {image_count:,}장 = 약 {needed_bytes / 1024 ** 3:.1f}GB → "
+              f"tf.data 스트리밍으로 읽습니다")
+        return True
+    
+    def _pick_decode_scale(self, sample_paths):
+        """
+        원본 JPEG 크기를 보고 축소 디코딩 배율 정하기 (fast_decode일 때만)
+        
+        💡 640x480 원본을 224x224로 줄일 거라면 처음부터 1/2 크기로 디코딩해도 충분해요
+        - 축소한 뒤에도 모델 입력 크기보다 작아지지 않는 배율만 사용
+        
+        Args:
+            sample_paths: 크기를 확인할 이미지 경로 목록 (읽히는 첫 이미지 사용)
+        
+        Returns:
+            int: 1, 2, 4, 8 중 하나
         """
-        images = []
-        labels = []
+        if not self.fast_decode:
+            return 1
         
+        for sample_path in sample_paths[:5]:
+            sample = cv2.imread(sample_path)
+            if sample is not None:
+                break
+        else:
+            return 1
+        
+        img_height, img_width = self.input_size
+        height, width = sample.shape[:2]
+        scale = 1
+        while (scale < 8
+               and height // (scale * 2) >= img_height
+               and width // (scale * 2) >= img_width):
+            scale *= 2
+        return scale
+    
+    def _read_steering(self, json_path):
+        """
+        JSON 파일에서 조향값 읽기 (범위 클리핑은 _collect_labeled_files에서 한 번에)
+        
+        Returns:
+            float: 조향값, 파일이 없거나 읽을 수 없으면 None
+        """
+        try:
+            steering = load_json(json_path)['steering']
+            
+            # 숫자가 아닌 조향값은 사용하지 않음
+            if not isinstance(steering, (int, float)):
+                return None
+            return steering
+        except:
+            return None
+    
+    def _collect_labeled_files(self, images_dir, annotations_dir):
+        """
+        이미지 목록을 만들고 라벨(JSON)을 먼저 읽어서 조향값이 있는 이미지만 남기기
+        
+        💡 JSON은 작아서 빨리 읽혀요 - 라벨이 없는 이미지는 디코딩하지 않음
+        
+        Args:
+            images_dir: 이미지 폴더 경로
+            annotations_dir: 라벨 JSON 폴더 경로
+        
+        Returns:
+            tuple: (이미지 경로 목록, 조향값 float32 배열), 폴더가 없으면 None
+        """
         if not os.path.exists(images_dir):
             print(f"⚠️ 경로가 존재하지 않습니다: {images_dir}")
+            return None
+        
+        # 💡 os.scandir는 폴더를 한 번 훑으면서 파일 정보까지 같이 가져와요 (listdir + join보다 빠름)
+        with os.scandir(images_dir) as it:
+            image_entries = sorted(
+                (entry.name, entry.path) for entry in it if entry.name.endswith('.jpg')
+            )
+        print(f"📂 {len(image_entries)}개 이미지 발견...")
+        
+        # 라벨 폴더도 한 번만 훑어서 {파일 이름: JSON 경로} 목록 만들기 (없는 JSON은 열어보지 않음)
+        json_paths = {}
+        if os.path.isdir(annotations_dir):
+            with os.scandir(annotations_dir) as it:
+                json_paths = {
+                    entry.name[:-5]: entry.path for entry in it if entry.name.endswith('.json')
+                }
+        
+        paths = []
+        steering_values = []
+        for img_file, img_path in image_entries:
+            json_path = json_paths.get(img_file[:-4])  # '.jpg' 떼기
+            steering = None if json_path is None else self._read_steering(json_path)
+            if steering is not None:
+                paths.append(img_path)
+                steering_values.append(steering)
+        
+        # 범위 체크 및 클리핑 (-1~1, 전체를 한 번에)
+        labels = np.array(steering_values, dtype=np.float32)
+        np.clip(labels, -1.0, 1.0, out=labels)
+        
+        return paths, labels
+    
+    def _decode_tf(self, path, label):
+        """
+        tf.data용 이미지 읽기: 파일 → RGB 디코딩 → 크기 조정 → uint8
+        
+        💡 uint8로 저장해두면 캐시 파일과 섞기(shuffle) 버퍼가 float32보다 4배 작아요
+        💡 224x224로 줄일 이미지라서 가장 빠른 디코딩 방식 사용 (정수 DCT, 색 보간 생략)
+        """
+        img_height, img_width = self.input_size
+        
+        image = tf.io.decode_jpeg(
+            tf.io.read_file(path), channels=3, ratio=self.decode_scale,
+            fancy_upscaling=False, dct_method='INTEGER_FAST'
+        )
+        image = tf.image.resize(image, (img_height, img_width))
+        image = tf.cast(tf.clip_by_value(tf.round(image), 0.0, 255.0), tf.uint8)
+        return image, label
+    
+    def _normalize_tf(self, image, label):
+        """tf.data용 MobileNet 전처리: 0~255 → -1~1, 상단 마스킹 (_load_dataset과 동일)"""
+        half_height = image.shape[0] // 2
+        
+        image = tf.cast(image, tf.float32) * (2.0 / 255.0) - 1.0
+        image = tf.concat(
+            [tf.fill([half_height, image.shape[1], 3], -1.0), image[half_height:]], axis=0
+        )
+        return image, label
+    
+    def _load_tf_dataset(self, images_dir, annotations_dir, training=False):
+        """
+        데이터셋을 tf.data 파이프라인으로 준비 (이미지는 학습 중에 읽음)
+        
+        [파이프라인]
+        파일 읽기/디코딩 (병렬) → 캐시 → 섞기 → 전처리 → 배치 → 미리 준비(prefetch)
+        
+        💡 GPU가 학습하는 동안 CPU가 다음 배치를 미리 준비해요
+        - 라벨(JSON)은 처음에 한 번만 읽음
+        - 첫 에포크에 디코딩한 결과는 캐시 파일에 저장해서 다시 사용
+        
+        Args:
+            images_dir: 이미지 폴더 경로
+            annotations_dir: 라벨 JSON 폴더 경로
+            training: True면 매 에포크 섞기
+        
+        Returns:
+            tuple: (tf.data.Dataset 또는 None, 이미지 수)
+        """
+        collected = self._collect_labeled_files(images_dir, annotations_dir)
+        if collected is None:
+            return None, 0
+        paths, labels = collected
+        
+        print(f"  ✅ {len(paths)}개 준비 완료! (이미지는 학습 중에 읽음)")
+        if not paths:
+            return None, 0
+        self.decode_scale = self._pick_decode_scale(paths)
+        
+        # 캐시 파일 이름에 이미지 크기, 디코딩 배율, 파일 목록과 조향값을 넣어서 바뀌면 새로 만들게 함
+        # 💡 캐시에는 조향값도 같이 저장되므로, 라벨만 고쳐도 캐시를 새로 만들어야 해요
+        img_height, img_width = self.input_size
+        cache_crc = zlib.crc32("\n".join(paths).encode('utf-8'))
+        cache_crc = zlib.crc32(np.asarray(labels, dtype=np.float32).tobytes(), cache_crc)
+        cache_path = os.path.join(
+            os.path.dirname(os.path.normpath(images_dir)),
+            f"_tfcache_{img_width}x{img_height}_r{self.decode_scale}_{cache_crc:08x}"
+        )
+        remove_stale_tf_caches(cache_path)
+        
+        autotune = tf.data.AUTOTUNE
+        dataset = tf.data.Dataset.from_tensor_slices((paths, labels))
+        dataset = dataset.map(self._decode_tf, num_parallel_calls=autotune)
+        dataset = dataset.ignore_errors()  # 손상된 이미지는 건너뛰기
+        dataset = dataset.cache(cache_path)
+        if training:
+            dataset = dataset.shuffle(min(len(paths), 1000))
+        dataset = dataset.map(self._normalize_tf, num_parallel_calls=autotune)
+        
+        return dataset.batch(self.batch_size).prefetch(autotune), len(paths)
+    
+    def _load_dataset(self, images_dir, annotations_dir):
+        """
+        데이터셋 로드 (MobileNet 전처리 적용)
+        
+        [전처리]
+        1. 0~255 → -1~1 정규화 (MobileNet 표준, 변환표로 한 번에)
+        2. 상단 마스킹 (하늘 제거, 검은색 = -1)
+        
+        💡 한 번 전처리한 결과는 캐시 파일로 저장해두고 다음 실행부터 바로 읽어요
+        - 파일 목록/조향값/입력 크기가 같을 때만 사용 (바뀌면 자동으로 다시 만듦)
+        """
+        collected = self._collect_labeled_files(images_dir, annotations_dir)
+        if collected is None:
             return np.array([]), np.array([])
+        paths, labels = collected
+        self.decode_scale = self._pick_decode_scale(paths)
+        
+        # 캐시 기준값은 디코딩 전에 계산 (디코딩 중에 labels 배열이 당겨질 수 있음)
+        cache_key = self._preprocessed_cache_key(paths, labels)
+        cached = self._load_preprocessed_cache(images_dir, cache_key)
+        if cached is not None:
+            return cached
+        
+        images, labels = self._decode_images(paths, labels)
+        self._save_preprocessed_cache(images_dir, cache_key, images, labels)
+        return images, labels
+    
+    def _decode_images(self, paths, labels):
+        """
+        이미지 목록을 여러 스레드로 읽어서 하나의 배열에 채우기
+        
+        💡 라벨이 있는 이미지 수만큼 배열을 미리 만들어 두고 바로 채워요
+        - 리스트에 모았다가 np.array로 한 번 더 복사하지 않음 (메모리 절반)
+        
+        Args:
+            paths: 이미지 파일 경로 목록
+            labels: 조향값 배열 (읽지 못한 이미지를 빼면서 제자리에서 당겨짐)
+        
+        Returns:
+            tuple: (이미지 배열, 조향값 배열)
+        """
+        total_files = len(paths)
         
-        # 모델의 입력 크기 가져오기
-        img_height, img_width = self.model.input_shape[1:3]
+        # 모델의 입력 크기
+        img_height, img_width = self.input_size
         
-        image_files = sorted([f for f in os.listdir(images_dir) if f.endswith('.jpg')])
-        total_files = len(image_files)
+        # 결과 배열 미리 만들기
+        images = np.empty((total_files, img_height, img_width, 3), dtype=np.float32)
         
-        print(f"📂 {total_files}개 이미지 발견...")
+        # 💡 여러 스레드가 동시에 이미지를 읽고 변환 (OpenCV는 계산 중에 GIL을 풀어줘요)
+        #    executor.map은 결과 순서를 유지해요
+        # 💡 스레드마다 OpenCV가 자기 스레드 풀을 또 띄우면 코어보다 스레드가 많아져 느려짐
+        #    → 읽는 동안만 OpenCV 내부 병렬 처리를 끄고 끝나면 원래대로 되돌림
+        cv2_threads = cv2.getNumThreads()
+        cv2.setNumThreads(0)
+        try:
+            loaded_count = self._decode_into(paths, labels, images)
+        finally:
+            cv2.setNumThreads(cv2_threads)
         
+        print(f"\n  ✅ {loaded_count}개 로드 완료!")
+        
+        return images[:loaded_count], labels[:loaded_count]
+    
+    def _decode_into(self, paths, labels, images):
+        """
+        스레드 풀로 이미지를 읽어 images에 순서대로 채우기 (읽지 못한 이미지는 건너뛰며 앞으로 당김)
+        
+        Returns:
+            int: 읽기에 성공한 이미지 수
+        """
+        total_files = len(paths)
         loaded_count = 0
-        for idx, img_file in enumerate(image_files, 1):
-            img_path = os.path.join(images_dir, img_file)
-            base_name = os.path.splitext(img_file)[0]
-            json_path = os.path.join(annotations_dir, f"{base_name}.json")
-            
-            # 이미지 로드
-            img = cv2.imread(img_path)
-            if img is None:
-                continue
-            
-            img = cv2.resize(img, (img_width, img_height))
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            img = img.astype(np.float32) / 255.0
-            
-            # 상단 마스킹
-            half_height = img_height // 2
-            img[:half_height, :, :] = 0
-            
-            # MobileNet 정규화: -1 ~ 1
-            img = img * 2.0 - 1.0
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            results = executor.map(
+                lambda i: self._process_one(paths[i], images[i]), range(total_files)
+            )
             
-            # JSON 로드
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    steering = data['steering']
-                    
-                    # 범위 체크 및 클리핑                    
-                    if not (-1.0 <= steering <= 1.0):
-                        steering = max(-1.0, min(1.0, steering))
-
-                    images.append(img)
-                    labels.append(steering)
+            for idx, loaded in enumerate(results, 1):
+                if loaded:
+                    # 앞에서 읽지 못한 이미지가 있으면 빈 자리로 당겨서 저장
+                    if loaded_count != idx - 1:
+                        images[loaded_count] = images[idx - 1]
+                        labels[loaded_count] = labels[idx - 1]
                     loaded_count += 1
-                    
-                    # 진행상황 표시
-                    if idx % 100 == 0 or idx == total_files:
-                        progress = (idx / total_files) * 100
-                        print(f"  ⏳ 진행중... {idx}/{total_files} ({progress:.1f}%)", end='\r')
-            except:
-                continue
+                
+                # 진행상황 표시
+                if idx % 100 == 0 or idx == total_files:
+                    progress = (idx / total_files) * 100
+                    print(f"  ⏳ 진행중... {idx}/{total_files} ({progress:.1f}%)", end='\r')
         
-        print(f"\n  ✅ {loaded_count}개 로드 완료!")
+        return loaded_count
+    
+    def _preprocessed_cache_paths(self, images_dir):
+        """전처리 캐시 파일 경로 (이미지, 라벨, 설명서) - 모델 입력 크기별로 따로 저장"""
+        img_height, img_width = self.input_size
+        base = os.path.join(
+            os.path.dirname(os.path.normpath(images_dir)),
+            f"_finetune_preprocessed_{img_width}x{img_height}"
+        )
+        return f"{base}.npy", f"{base}_labels.npy", f"{base}.json"
+    
+    def _preprocessed_cache_key(self, paths, labels):
+        """전처리 캐시가 지금 데이터와 같은지 확인하는 기준값 (파일 목록/조향값, 입력 크기)"""
+        img_height, img_width = self.input_size
+        file_list = "\n".join(
+            f"{os.path.basename(path)}:{float(label)!r}" for path, label in zip(paths, labels)
+        )
+        return {
+            'files_crc': zlib.crc32(file_list.encode('utf-8')),
+            'count': len(paths),
+            'width': img_width,
+            'height': img_height,
+            'decode_scale': self.decode_scale,
+        }
+    
+    def _load_preprocessed_cache(self, images_dir, cache_key):
+        """
+        전처리 캐시 불러오기 (memmap: 필요한 부분만 디스크에서 읽음)
+        
+        Returns:
+            tuple: (이미지 배열, 조향값 배열), 캐시가 없거나 오래됐으면 None
+        """
+        if not self.cache_preprocessed:
+            return None
+        
+        images_path, labels_path, manifest_path = self._preprocessed_cache_paths(images_dir)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('key') != cache_key:
+                return None
+            
+            images = np.load(images_path, mmap_mode='r')
+            labels = np.load(labels_path)
+        except (OSError, ValueError):
+            return None
+        
+        print(f"💾 전처리 캐시 사용: {len(images)}개 (JPEG 디코딩 생략)")
+        return images, labels
+    
+    def _save_preprocessed_cache(self, images_dir, cache_key, images, labels):
+        """전처리 결과를 캐시로 저장 (설명서 JSON을 마지막에 써서 중간에 끊겨도 안전)"""
+        if not self.cache_preprocessed or len(images) == 0:
+            return
+        
+        images_path, labels_path, manifest_path = self._preprocessed_cache_paths(images_dir)
+        try:
+            # 이전 설명서를 먼저 지워서 저장 도중에는 캐시가 사용되지 않게 함
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            with open(images_path, 'wb') as f:
+                np.save(f, images)
+            with open(labels_path, 'wb') as f:
+                np.save(f, labels)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'key': cache_key,
+                    'created': datetime.now().isoformat(timespec='seconds'),
+                }, f, ensure_ascii=False, indent=2)
+            size_mb = os.path.getsize(images_path) / (1024 * 1024)
+            print(f"💾 전처리 캐시 저장: {images_path} ({size_mb:.0f}MB)")
+        except OSError as e:
+            print(f"  ⚠️ 전처리 캐시 저장 실패: {e}")
+    
+    def _process_one(self, img_path, out):
+        """
+        이미지 한 장을 읽어서 MobileNet 전처리 후 out 배열에 기록
+        
+        Args:
+            img_path: 이미지 파일 경로
+            out: 결과를 써넣을 float32 배열 (H, W, 3)
+        
+        Returns:
+            bool: 읽기에 성공하면 True
+        """
+        img = cv2.imread(img_path, self.REDUCED_READ_FLAGS[self.decode_scale])
+        if img is None:
+            return False
+        
+        img_height, img_width = out.shape[:2]
+        img = cv2.resize(img, (img_width, img_height))
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+        
+        half_height = img_height // 2
         
-        return np.array(images), np.array(labels)
+        # 💡 numba가 있으면 정규화 + 상단 마스킹을 픽셀 순회 한 번으로 처리
+        if self._use_normalize_kernel:
+            try:
+                _normalize_kernel(img, self._norm_lut, out, half_height)
+                return True
+            except Exception as e:
+                print(f"  ⚠️ numba 전처리 커널을 사용할 수 없어 NumPy로 계산합니다: {e}")
+                self._use_normalize_kernel = False
+        
+        # MobileNet 정규화: 0~255 → -1~1 (마스킹할 상단은 계산하지 않음)
+        # 💡 픽셀마다 나누기/곱하기 대신 변환표에서 찾아 결과 배열에 바로 기록
+        np.take(self._norm_lut, img[half_height:], out=out[half_height:])
+        
+        # 상단 마스킹 (0~1 범위의 0 = -1~1 범위의 -1)
+        out[:half_height] = -1.0
+        return True
     
     def fine_tune(self, train_images, train_labels, val_images, val_labels,
-                  epochs=20, learning_rate=0.00005, unfreeze_layers=20):
+                  epochs=20, learning_rate=0.00005, unfreeze_layers=20,
+                  mixed_precision=False, jit_compile=False):
         """
         MobileNet Fine-tuning 실행
         
@@ -297,10 +720,15 @@ class MobileNetFineTuner:
         - 미세하게 조정만 하는 것이 목표
         - 너무 크면 과적합 위험
         
+        train_images/val_images 자리에 tf.data.Dataset을 주면 (라벨은 None)
+        배치 크기는 데이터셋에 정해진 값을 사용합니다
+        
         Args:
             epochs: Fine-tuning 에포크 수 (기본 20)
             learning_rate: 학습률 (기본 0.00005, 매우 낮음!)
             unfreeze_layers: 해동할 레이어 수 (기본 20)
+            mixed_precision: GPU에서 float16 혼합 정밀도로 학습 (메모리 절약, 속도 향상)
+            jit_compile: XLA로 학습 단계를 하나의 커널로 묶어 컴파일 (입력 크기가 고정일 때 빠름)
         """
         print("\n" + "=" * 60)
         print(f"🔧 MobileNet Fine-tuning 시작")
@@ -314,61 +742,116 @@ class MobileNetFineTuner:
         print(f"  - 학습률: {learning_rate} (매우 낮음!)")
         print(f"  - 손실 함수: MSE")
         print(f"  - 평가 지표: MAE")
+        if jit_compile:
+            print(f"  - XLA 컴파일: 사용")
+        
+        # ⚠️ 혼합 정밀도는 전역 설정이라 학습이 끝나면 원래 정책으로 되돌려요 (아래 finally)
+        previous_policy = keras.mixed_precision.global_policy()
+        try:
+            optimizer = keras.optimizers.Adam(learning_rate=learning_rate)
+            if mixed_precision and self._enable_mixed_precision():
+                # 💡 float16은 아주 작은 기울기가 0이 되기 쉬워서 손실을 키웠다가 다시 줄여서 계산
+                optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
+            
+            # 💡 jit_compile=True: XLA가 MobileNet 연산들을 합쳐 한 번에 실행 (입력 크기 고정일 때 효과적)
+            #    False면 Keras 기본값('auto')에 맡김
+            self.model.compile(
+                optimizer=optimizer,
+                loss='mse',
+                metrics=['mae'],
+                jit_compile=True if jit_compile else 'auto'
+            )
+            
+            # 3. Fine-tuning 전략 안내
+            print(f"\n💡 Fine-tuning 전략:")
+            print(f"  - 에포크: {epochs}회 (짧게)")
+            print(f"  - 학습률: {learning_rate} (매우 낮게)")
+            print(f"  - 목표: 기존 지식 유지 + 도로 특화")
+            print("=" * 60)
+            
+            # 4. 콜백 설정
+            callbacks = self._setup_callbacks()
+            
+            # 5. Fine-tuning 실행!
+            print(f"\n🚀 Fine-tuning 시작...")
+            
+            if isinstance(train_images, tf.data.Dataset):
+                # 🌊 tf.data 스트리밍: 배치는 데이터셋이 만들어 줌
+                self.history = self.model.fit(
+                    train_images,
+                    epochs=epochs,
+                    validation_data=val_images,
+                    callbacks=callbacks,
+                    verbose=1
+                )
+            else:
+                self.history = self.model.fit(
+                    train_images,
+                    train_labels,
+                    batch_size=self.batch_size,
+                    epochs=epochs,
+                    validation_data=(val_images, val_labels),
+                    callbacks=callbacks,
+                    verbose=1
+                )
+            
+            # 6. 최고 성능 모델 저장 (EarlyStopping이 최고 성능 가중치로 되돌려 둔 상태)
+            self.model.save(self.finetuned_model_path)
+            print(f"\n💾 최고 성능 모델 저장: {self.finetuned_model_path}")
         
-        self.model.compile(
-            optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
-            loss='mse',
-            metrics=['mae']
-        )
+        finally:
+            # 같은 프로그램에서 다른 모델을 불러올 때 float16이 따라가지 않도록 되돌리기
+            keras.mixed_precision.set_global_policy(previous_policy)
         
-        # 3. Fine-tuning 전략 안내
-        print(f"\n💡 Fine-tuning 전략:")
-        print(f"  - 에포크: {epochs}회 (짧게)")
-        print(f"  - 학습률: {learning_rate} (매우 낮게)")
-        print(f"  - 목표: 기존 지식 유지 + 도로 특화")
-        print("=" * 60)
+        print("\n✅ Fine-tuning 완료!")
         
-        # 4. 콜백 설정
-        callbacks = self._setup_callbacks()
+        return self.history
+    
+    def _enable_mixed_precision(self):
+        """
+        불러온 모델을 혼합 정밀도(mixed_float16)로 바꾸기
         
-        # 5. Fine-tuning 실행!
-        print(f"\n🚀 Fine-tuning 시작...")
+        💡 대부분의 계산은 float16, 가중치와 최종 출력은 float32
+        - GPU 텐서 코어에서 빨라지고 메모리도 절약됨
+        - CPU에서는 오히려 느려서 GPU일 때만 사용
+        - 이미 만들어진 모델이라 레이어마다 정밀도 설정을 바꿔줘요 (가중치는 그대로 float32)
         
-        self.history = self.model.fit(
-            train_images,
-            train_labels,
-            batch_size=16,  # 작은 배치로 안정적 학습
-            epochs=epochs,
-            validation_data=(val_images, val_labels),
-            callbacks=callbacks,
-            verbose=1
-        )
+        Returns:
+            bool: 적용했으면 True
+        """
+        if not tf.config.list_physical_devices('GPU'):
+            print("  ℹ️ GPU가 없어 혼합 정밀도를 사용하지 않습니다")
+            return False
         
-        print("\n✅ Fine-tuning 완료!")
+        keras.mixed_precision.set_global_policy('mixed_float16')
         
-        return self.history
+        # 최종 조향 출력 레이어는 float32로 유지 (손실 계산 정밀도)
+        pending = list(self.model.layers[:-1])
+        while pending:
+            layer = pending.pop()
+            if isinstance(layer, keras.layers.InputLayer):
+                continue
+            layer.dtype_policy = 'mixed_float16'
+            pending.extend(getattr(layer, 'layers', []))
+        
+        print("  - 혼합 정밀도: mixed_float16 (출력층은 float32)")
+        return True
     
     def _setup_callbacks(self):
         """Fine-tuning 콜백 설정"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Fine-tuned 모델 저장 경로
+        # Fine-tuned 모델 저장 경로 (학습이 끝난 뒤 최고 성능 모델을 한 번만 저장)
         base_name = os.path.splitext(os.path.basename(self.model_path))[0]
-        finetuned_model_path = os.path.join(
+        self.finetuned_model_path = os.path.join(
             self.models_dir,
             f"{base_name}_finetuned_{timestamp}.keras"
         )
         
+        # 💡 성능이 좋아질 때마다 .keras 파일 전체를 다시 쓰지 않아요 (SD 카드에서 특히 느림)
+        #    최고 성능 가중치는 EarlyStopping이 메모리에 보관했다가 학습이 끝나면 되돌려 줌
         callbacks = [
-            # 최고 성능 모델 저장
-            keras.callbacks.ModelCheckpoint(
-                filepath=finetuned_model_path,
-                monitor='val_loss',
-                save_best_only=True,
-                verbose=1
-            ),
-            
-            # 조기 종료 (5 에포크, 짧게)
+            # 조기 종료 (5 에포크, 짧게) + 최고 성능 가중치 복원
             keras.callbacks.EarlyStopping(
                 monitor='val_loss',
                 patience=5,
@@ -386,8 +869,8 @@ class MobileNetFineTuner:
             )
         ]
         
-        print(f"\n💾 Fine-tuned 모델 저장 경로:")
-        print(f"   {finetuned_model_path}")
+        print(f"\n💾 Fine-tuned 모델 저장 경로 (학습 종료 후 저장):")
+        print(f"   {self.finetuned_model_path}")
         
         return callbacks
     
@@ -397,7 +880,23 @@ class MobileNetFineTuner:
         print("📊 Fine-tuned 모델 평가")
         print("=" * 60)
         
-        loss, mae = self.model.evaluate(val_images, val_labels, verbose=0)
+        # 💡 예측은 한 번만 하고, 같은 예측값으로 MSE/MAE와 예측 샘플을 모두 계산
+        #    (evaluate + predict를 따로 부르면 검증 데이터를 두 번 통과시켜야 해요)
+        if isinstance(val_images, tf.data.Dataset):
+            # 배치마다 예측과 라벨을 같이 모으면 이미지 디코딩도 한 번만 일어나요
+            batch_predictions, batch_labels = [], []
+            for images, labels in val_images:
+                batch_predictions.append(np.asarray(self.model.predict_on_batch(images)))
+                batch_labels.append(labels.numpy())
+            predictions = np.concatenate(batch_predictions)
+            val_labels = np.concatenate(batch_labels)
+        else:
+            predictions = self.model.predict(val_images, batch_size=64, verbose=0)
+        
+        predictions = predictions.reshape(-1).astype(np.float64)
+        errors = predictions - np.asarray(val_labels, dtype=np.float64)
+        loss = float(np.mean(errors ** 2))
+        mae = float(np.mean(np.abs(errors)))
         
         print(f"\n검증 데이터 성능:")
         print(f"  📉 Loss (MSE): {loss:.4f}")
@@ -413,14 +912,12 @@ class MobileNetFineTuner:
         else:
             print(f"\n  ⚠️ 추가 데이터나 Fine-tuning 조정 필요")
         
-        # 예측 샘플 (이미 올바르게 수정되어 있음!)
+        # 예측 샘플 (위에서 구한 예측값 재사용)
         print(f"\n🎯 예측 샘플 (5개):")
-        predictions = self.model.predict(val_images[:5], verbose=0)
-        
-        for i in range(5):
+        for i in range(min(5, len(val_labels))):
             actual = val_labels[i]
-            predicted = predictions[i][0]
-            error = abs(actual - predicted)
+            predicted = predictions[i]
+            error = abs(errors[i])
             
             print(f"  {i+1}. 실제: {actual:6.3f} | "
                 f"예측: {predicted:6.3f} | "
@@ -432,29 +929,28 @@ class MobileNetFineTuner:
             print("⚠️ 훈련 기록이 없습니다!")
             return
         
-        plt.figure(figsize=(12, 4))
+        # 💡 그래프 두 개를 한 번에 만들고 각 축(ax)에 직접 그리기
+        fig, (loss_ax, mae_ax) = plt.subplots(1, 2, figsize=(12, 4))
         
         # Loss
-        plt.subplot(1, 2, 1)
-        plt.plot(self.history.history['loss'], label='훈련 Loss', linewidth=2)
-        plt.plot(self.history.history['val_loss'], label='검증 Loss', linewidth=2)
-        plt.title('Fine-tuning Loss', fontsize=14, fontweight='bold')
-        plt.xlabel('에포크', fontsize=12)
-        plt.ylabel('Loss', fontsize=12)
-        plt.legend(fontsize=10)
-        plt.grid(True, alpha=0.3)
+        loss_ax.plot(self.history.history['loss'], label='훈련 Loss', linewidth=2)
+        loss_ax.plot(self.history.history['val_loss'], label='검증 Loss', linewidth=2)
+        loss_ax.set_title('Fine-tuning Loss', fontsize=14, fontweight='bold')
+        loss_ax.set_xlabel('에포크', fontsize=12)
+        loss_ax.set_ylabel('Loss', fontsize=12)
+        loss_ax.legend(fontsize=10)
+        loss_ax.grid(True, alpha=0.3)
         
         # MAE
-        plt.subplot(1, 2, 2)
-        plt.plot(self.history.history['mae'], label='훈련 MAE', linewidth=2)
-        plt.plot(self.history.history['val_mae'], label='검증 MAE', linewidth=2)
-        plt.title('Fine-tuning MAE', fontsize=14, fontweight='bold')
-        plt.xlabel('에포크', fontsize=12)
-        plt.ylabel('MAE', fontsize=12)
-        plt.legend(fontsize=10)
-        plt.grid(True, alpha=0.3)
+        mae_ax.plot(self.history.history['mae'], label='훈련 MAE', linewidth=2)
+        mae_ax.plot(self.history.history['val_mae'], label='검증 MAE', linewidth=2)
+        mae_ax.set_title('Fine-tuning MAE', fontsize=14, fontweight='bold')
+        mae_ax.set_xlabel('에포크', fontsize=12)
+        mae_ax.set_ylabel('MAE', fontsize=12)
+        mae_ax.legend(fontsize=10)
+        mae_ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # 저장
         base_name = os.path.splitext(os.path.basename(self.model_path))[0]
@@ -462,10 +958,13 @@ class MobileNetFineTuner:
             self.models_dir,
             f"{base_name}_finetuning_history.png"
         )
-        plt.savefig(plot_path, dpi=150)
+        fig.savefig(plot_path, dpi=150)
         print(f"\n📊 Fine-tuning 그래프 저장: {plot_path}")
         
-        plt.show()
+        # 화면이 없는 환경(Agg 백엔드, 예: 모니터 없는 Jetson)에서는 파일 저장만 하고 표시는 생략
+        if plt.get_backend().lower() != 'agg':
+            plt.show()
+        plt.close(fig)  # 그래프 메모리 정리
     
     def save_final_model(self):
         """최종 Fine-tuned 모델 저장"""
@@ -511,7 +1010,8 @@ class ModelUpdater:
 # ============================================================================
 
 def update_model(model_path, new_data_path, models_dir="models",
-                epochs=20, learning_rate=0.00005, unfreeze_layers=20):
+                epochs=20, learning_rate=0.00005, unfreeze_layers=20,
+                stream_dataset=None, mixed_precision=False, jit_compile=False):
     """
     MobileNet 모델 업데이트 (Fine-tuning)
     
@@ -544,6 +1044,9 @@ def update_model(model_path, new_data_path, models_dir="models",
         epochs: Fine-tuning 에포크 수 (기본 20)
         learning_rate: 학습률 (기본 0.00005, 매우 낮음!)
         unfreeze_layers: 해동할 레이어 수 (기본 20)
+        stream_dataset: True면 tf.data로 배치마다 이미지 읽기 (큰 데이터셋용), None이면 자동 선택
+        mixed_precision: GPU에서 혼합 정밀도로 학습 (기본 False)
+        jit_compile: XLA 컴파일 강제 사용 (기본 False)
     """
     try:
         print("\n" + "=" * 60)
@@ -560,7 +1063,7 @@ def update_model(model_path, new_data_path, models_dir="models",
         print(f"  - 에포크: {epochs}회")
         
         # 1️⃣ Fine-tuner 생성
-        finetuner = MobileNetFineTuner(model_path, new_data_path, models_dir)
+        finetuner = MobileNetFineTuner(model_path, new_data_path, models_dir, stream_dataset)
         
         # 2️⃣ 기존 모델 로드
         finetuner.load_existing_model()
@@ -574,7 +1077,9 @@ def update_model(model_path, new_data_path, models_dir="models",
             val_images, val_labels,
             epochs=epochs,
             learning_rate=learning_rate,
-            unfreeze_layers=unfreeze_layers
+            unfreeze_layers=unfreeze_layers,
+            mixed_precision=mixed_precision,
+            jit_compile=jit_compile
         )
         
         # 5️⃣ 성능 평가
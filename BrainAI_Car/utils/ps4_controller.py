@@ -22,6 +22,9 @@ AXIS_LEFT_STICK_X = 0   # 좌측 스틱 좌우
 AXIS_L2_TRIGGER = 4     # L2 트리거
 AXIS_R2_TRIGGER = 5     # R2 트리거
 
+# 전진 속도가 이 값보다 크게 바뀔 때만 전송 (트리거 떨림으로 인한 과도한 명령 방지)
+SPEED_DEADBAND = 20
+
 
 class PS4Controller:
     """PS4 컨트롤러 입력을 처리하는 클래스"""
@@ -75,12 +78,13 @@ class PS4Controller:
             return 0.0
         
         # 좌측 스틱의 X축 값
-        steering = self.controller.get_axis(AXIS_LEFT_STICK_X)
-        
-        # 데드존 적용 (미세한 흔들림 제거)
+        return self._apply_deadzone(self.controller.get_axis(AXIS_LEFT_STICK_X))
+    
+    @staticmethod
+    def _apply_deadzone(steering):
+        """조향 값에 데드존 적용 (미세한 흔들림 제거)"""
         if abs(steering) < 0.1:
             steering = 0.0
-        
         return steering
     
     def get_trigger_value(self, trigger_axis):
@@ -103,6 +107,21 @@ class PS4Controller:
         raw_value = self.controller.get_axis(trigger_axis)
         return (raw_value + 1.0) / 2.0
     
+    def _rising_edge(self, current_state, state_attr):
+        """
+        버튼이 방금 눌렸는지 확인 (이전: 안눌림 → 현재: 눌림)
+        
+        Args:
+            current_state: 이번에 읽은 버튼 상태
+            state_attr: 이전 상태를 저장하는 속성 이름 (예: 'r1_was_pressed')
+        
+        Returns:
+            bool: 버튼이 방금 눌렸으면 True
+        """
+        was_pressed = getattr(self, state_attr)
+        setattr(self, state_attr, bool(current_state))
+        return bool(current_state) and not was_pressed
+    
     def is_r1_pressed(self):
         """
         R1 버튼이 눌렸는지 확인 (토글 방식)
@@ -113,16 +132,7 @@ class PS4Controller:
         if not self.connected:
             return False
         
-        current_state = self.controller.get_button(BUTTON_R1)
-        
-        # 버튼이 눌린 순간 감지 (이전: 안눌림 → 현재: 눌림)
-        if current_state and not self.r1_was_pressed:
-            self.r1_was_pressed = True
-            return True
-        elif not current_state:
-            self.r1_was_pressed = False
-        
-        return False
+        return self._rising_edge(self.controller.get_button(BUTTON_R1), 'r1_was_pressed')
     
     def is_l1_pressed(self):
         """
@@ -134,16 +144,7 @@ class PS4Controller:
         if not self.connected:
             return False
         
-        current_state = self.controller.get_button(BUTTON_L1)
-        
-        # 버튼이 눌린 순간 감지 (이전: 안눌림 → 현재: 눌림)
-        if current_state and not self.l1_was_pressed:
-            self.l1_was_pressed = True
-            return True
-        elif not current_state:
-            self.l1_was_pressed = False
-        
-        return False
+        return self._rising_edge(self.controller.get_button(BUTTON_L1), 'l1_was_pressed')
     
     def process_events(self, frame=None):
         """
@@ -159,19 +160,27 @@ class PS4Controller:
         if not self.connected or not self.car:
             return
         
+        # 💡 이번 반복에서 쓸 입력을 한 번에 읽어두기 (버튼 2개 + 축 3개)
+        controller = self.controller
+        r1_state = controller.get_button(BUTTON_R1)
+        l1_state = controller.get_button(BUTTON_L1)
+        stick_x = controller.get_axis(AXIS_LEFT_STICK_X)
+        r2_raw = controller.get_axis(AXIS_R2_TRIGGER)
+        l2_raw = controller.get_axis(AXIS_L2_TRIGGER)
+        
         # R1 버튼 처리 (녹화 토글)
-        if self.is_r1_pressed():
+        if self._rising_edge(r1_state, 'r1_was_pressed'):
             if frame is not None:
                 self.car.toggle_recording(frame)
             else:
                 print("⚠ 녹화하려면 프레임이 필요합니다")
         
         # L1 버튼 처리 (삭제)
-        if self.is_l1_pressed():
+        if self._rising_edge(l1_state, 'l1_was_pressed'):
             self.car.delete_last_frames(10)
         
         # 1. 조향 처리 (좌측 스틱)
-        steering = self.get_steering()
+        steering = self._apply_deadzone(stick_x)
 
         # 조향 값을 서보 각도로 변환
         new_angle = steering_to_angle(steering)
@@ -182,23 +191,29 @@ class PS4Controller:
             self.car.control_steering(steering)
         
         # 2. 속도 처리 (R2, L2 트리거)
-        r2_value = self.get_trigger_value(AXIS_R2_TRIGGER)  # R2 (전진)
-        l2_value = self.get_trigger_value(AXIS_L2_TRIGGER)  # L2 (후진)  
+        # PS4 트리거는 -1.0~1.0 범위이므로 0.0~1.0으로 변환
+        r2_value = (r2_raw + 1.0) / 2.0  # R2 (전진)
+        l2_value = (l2_raw + 1.0) / 2.0  # L2 (후진)
         new_speed = 0  # 기본: 정지
         
         # R2를 누르면 전진 (아날로그 속도 제어)
         if r2_value > 0.1:  # 데드존
             # 트리거 값(0.0~1.0)을 속도(min_speed~max_speed)로 매핑
-            speed_range = self.max_speed - self.min_speed
-            new_speed = int(self.min_speed + (speed_range * r2_value))
-            new_speed = max(self.min_speed, min(self.max_speed, new_speed))
+            # 💡 r2_value > 0.1이면 결과가 min_speed보다 작을 수 없어서 최대값만 제한
+            min_speed = self.min_speed
+            new_speed = min(self.max_speed, int(min_speed + (self.max_speed - min_speed) * r2_value))
         
         # L2를 누르면 후진 (우선순위 높음)
         elif l2_value > 0.1:
             new_speed = -1  # 마이크로비트가 -1을 후진으로 인식
         
         # 속도가 변경되었을 때만 전송
-        if new_speed != self.speed:
+        # 💡 전진 중 작은 변화는 무시하고, 정지/후진 전환과 최대 속도 도달은 바로 전송
+        if new_speed != self.speed and (
+            new_speed <= 0 or self.speed <= 0
+            or new_speed == self.max_speed
+            or abs(new_speed - self.speed) > SPEED_DEADBAND
+        ):
             self.speed = new_speed
             self.car.control_speed(self.speed)
     
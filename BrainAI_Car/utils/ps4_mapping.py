@@ -6,8 +6,10 @@ BrainAI Car 조정을 위한 PS4 컨트롤러 클래스
 """
 
 import pygame
+import numpy as np
 import time
 import os
+import sys
 
 
 class PS4ControllerConnector:
@@ -32,6 +34,12 @@ class PS4ControllerConnector:
         14: "→ (오른쪽 방향키)"
     }
     
+    # 상태 갱신에 사용하는 조이스틱 이벤트
+    INPUT_EVENTS = [pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP]
+    
+    # 연결 중 큐에 쌓이도록 허용하는 이벤트 (입력 + 종료 요청, 컨트롤러 연결/해제)
+    ALLOWED_EVENTS = INPUT_EVENTS + [pygame.QUIT, pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED]
+    
     # 축 이름 매핑
     AXIS_NAMES = {
         0: "좌 스틱 X축 (좌우)",
@@ -44,11 +52,23 @@ class PS4ControllerConnector:
     
     def __init__(self):
         """컨트롤러 초기화"""
-        pygame.init()
-        pygame.joystick.init()
+        # 이미 초기화되어 있으면 다시 하지 않기 (다시 연결할 때 비용 절약)
+        if not pygame.get_init():
+            pygame.init()
+        if not pygame.joystick.get_init():
+            pygame.joystick.init()
         self.controller = None
         self.deadzone = 0.1
         
+        # 💡 마지막 refresh() 시점의 버튼/축 상태 (getter는 이 값만 읽음)
+        self._instance_id = None
+        self._num_buttons = 0
+        self._btn_mask = 0  # 버튼 상태 비트마스크 (i번 비트 = i번 버튼)
+        self._axis_state = None
+        self._axes = None  # get_all_axes 결과 버퍼 (재사용)
+        self._axes_abs = None  # 데드존 계산용 버퍼 (재사용)
+        self._axes_mask = None
+        
     def connect(self):
         """컨트롤러 연결 시도"""
         if pygame.joystick.get_count() == 0:
@@ -56,6 +76,93 @@ class PS4ControllerConnector:
         
         self.controller = pygame.joystick.Joystick(0)
         self.controller.init()
+        
+        self._num_buttons = self.controller.get_numbuttons()
+        self._axis_state = np.zeros(self.controller.get_numaxes(), dtype=np.float32)
+        self._axes = np.empty_like(self._axis_state)
+        self._axes_abs = np.empty_like(self._axis_state)
+        self._axes_mask = np.empty(self._axis_state.shape, dtype=bool)
+        
+        # 필요한 이벤트만 큐에 쌓이도록 설정 (refresh, wait_for_input에서 사용)
+        # ⚠️ pygame 전체에 적용되는 설정이라 종료 요청과 연결/해제 이벤트는 막지 않고,
+        #    close()에서 원래대로 되돌려요
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.ALLOWED_EVENTS)
+        
+        self._instance_id = self.controller.get_instance_id()
+        
+        self.refresh(full_scan=True)
+        return True
+    
+    def refresh(self, full_scan=False):
+        """
+        입력 상태 갱신 (루프 한 번에 한 번만 호출)
+        
+        pygame 이벤트 큐는 여기서 한 번만 처리하고, 버튼/축 값을 저장해둡니다.
+        get_button, get_axis 등은 저장된 값을 읽기만 합니다.
+        
+        💡 평소에는 큐에 쌓인 조이스틱 이벤트만 반영하므로, 입력이 없으면 거의 할 일이 없습니다.
+        
+        Args:
+            full_scan: True면 이벤트 대신 모든 버튼/축을 직접 다시 읽기 (연결 직후 등)
+        """
+        if not full_scan:
+            for event in pygame.event.get(self.INPUT_EVENTS):
+                self._apply_event(event)
+            return
+        
+        pygame.event.pump()
+        pygame.event.clear(self.INPUT_EVENTS)  # 아래에서 현재 상태를 직접 읽으므로 밀린 이벤트는 버림
+        
+        controller = self.controller
+        btn_mask = 0
+        for i in range(self._num_buttons):
+            if controller.get_button(i):
+                btn_mask |= 1 << i
+        self._btn_mask = btn_mask
+        
+        axis_state = self._axis_state
+        for i in range(len(axis_state)):
+            axis_state[i] = controller.get_axis(i)
+    
+    def _apply_event(self, event):
+        """
+        조이스틱 이벤트 하나를 저장된 버튼/축 상태에 반영
+        
+        Args:
+            event: JOYAXISMOTION / JOYBUTTONDOWN / JOYBUTTONUP 이벤트
+        """
+        if event.instance_id != self._instance_id:
+            return  # 다른 컨트롤러의 입력
+        
+        if event.type == pygame.JOYAXISMOTION:
+            if event.axis < len(self._axis_state):
+                self._axis_state[event.axis] = event.value
+        elif event.type == pygame.JOYBUTTONDOWN:
+            self._btn_mask |= 1 << event.button
+        else:
+            self._btn_mask &= ~(1 << event.button)
+    
+    def wait_for_input(self, timeout_ms=100):
+        """
+        입력 이벤트가 올 때까지 대기한 뒤 refresh()
+        
+        💡 time.sleep으로 계속 깨어나는 대신, 입력이 없으면 최대 timeout_ms 동안 쉽니다.
+        
+        Args:
+            timeout_ms: 최대 대기 시간 (밀리초)
+            
+        Returns:
+            bool: 대기 중 입력 이벤트가 있었는지 여부
+        """
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return False
+        
+        # 깨어나게 한 이벤트 + 그 사이 쌓인 이벤트 반영
+        if event.type in self.INPUT_EVENTS:
+            self._apply_event(event)
+        self.refresh()
         return True
     
     def get_info(self):
@@ -79,45 +186,86 @@ class PS4ControllerConnector:
         return value
     
     def get_button(self, button_id):
-        """특정 버튼의 상태 반환"""
-        pygame.event.pump()
-        return self.controller.get_button(button_id)
+        """특정 버튼의 상태 반환 (마지막 refresh() 기준)"""
+        return bool(self._btn_mask >> button_id & 1)
     
     def get_all_buttons(self):
-        """모든 버튼의 상태 반환"""
-        pygame.event.pump()
-        pressed = []
-        for i in range(self.controller.get_numbuttons()):
-            if self.controller.get_button(i):
-                pressed.append(i)
-        return pressed
+        """눌린 버튼 번호 목록 반환 (마지막 refresh() 기준)"""
+        return list(self.pressed_buttons(self._btn_mask))
+    
+    def get_button_mask(self):
+        """
+        모든 버튼의 상태를 비트마스크로 반환 (마지막 refresh() 기준)
+        
+        💡 목록을 만들지 않아서 매 루프 변화 감지에 쓰기 좋아요 (정수 비교 한 번)
+        
+        Returns:
+            int: 버튼 비트마스크 (i번 비트가 1이면 i번 버튼이 눌림, 0이면 눌린 버튼 없음)
+        """
+        return self._btn_mask
+    
+    @staticmethod
+    def pressed_buttons(btn_mask):
+        """
+        버튼 비트마스크에서 눌린 버튼 번호를 작은 번호부터 꺼내기
+        
+        Args:
+            btn_mask: get_button_mask()가 반환한 비트마스크
+            
+        Yields:
+            int: 눌린 버튼 번호
+        """
+        while btn_mask:
+            yield (btn_mask & -btn_mask).bit_length() - 1  # 가장 낮은 1 비트 위치
+            btn_mask &= btn_mask - 1  # 가장 낮은 1 비트 지우기
     
     def get_axis(self, axis_id):
-        """특정 축의 값 반환 (데드존 적용)"""
-        pygame.event.pump()
-        value = self.controller.get_axis(axis_id)
-        return self.apply_deadzone(value)
+        """특정 축의 값 반환 (데드존 적용, 마지막 refresh() 기준)"""
+        return self.apply_deadzone(float(self._axis_state[axis_id]))
     
     def get_all_axes(self):
-        """모든 축의 값 반환 (데드존 적용)"""
-        pygame.event.pump()
-        values = []
-        for i in range(self.controller.get_numaxes()):
-            value = self.controller.get_axis(i)
-            values.append(self.apply_deadzone(value))
-        return values
+        """
+        모든 축의 값 반환 (데드존 적용, 마지막 refresh() 기준)
+        
+        💡 매번 같은 배열을 재사용하므로, 값을 보관하려면 복사해서 사용하세요.
+        
+        Returns:
+            np.ndarray: 축 값 배열 (float32)
+        """
+        axes = self._axes
+        np.copyto(axes, self._axis_state)
+        
+        # 데드존을 한 번에 적용 (미리 만든 버퍼에 계산해서 임시 배열 없음)
+        # 💡 값 * (|값| >= 데드존) 방식은 -0.0이 생겨 화면에 "-0.000"으로 보이므로 0.0을 직접 대입
+        np.abs(axes, out=self._axes_abs)
+        np.less(self._axes_abs, self.deadzone, out=self._axes_mask)
+        np.putmask(axes, self._axes_mask, 0.0)
+        return axes
     
     def close(self):
-        """컨트롤러 연결 종료"""
-        pygame.quit()
+        """
+        컨트롤러 연결 종료
+        
+        💡 pygame 전체가 아니라 조이스틱 기능만 종료합니다. (다른 pygame 기능은 그대로 사용 가능)
+        """
+        pygame.event.set_allowed(None)  # connect()에서 막은 이벤트를 다시 모두 허용
+        pygame.joystick.quit()
+        self.controller = None
 
 
 class PS4ControllerTester:
     """PS4 컨트롤러 테스트 클래스"""
     
+    # 화면 갱신 최소 간격 (초) - 입력이 몰려도 초당 30번까지만 다시 그림
+    REDRAW_INTERVAL = 1 / 30
+    
     def __init__(self, controller):
         """테스터 초기화"""
         self.controller = controller
+        
+        # 💡 막대 그래프 문자열을 칸 수별로 미리 만들어두기 (축 30칸, 트리거 20칸)
+        self._axis_bars = ["█" * k + "░" * (30 - k) for k in range(31)]
+        self._trigger_bars = ["█" * k + "░" * (20 - k) for k in range(21)]
     
     @staticmethod
     def clear_screen():
@@ -135,7 +283,7 @@ class PS4ControllerTester:
         
         try:
             while True:
-                pygame.event.pump()
+                self.controller.wait_for_input(50)
                 
                 # 모든 버튼 확인
                 for i in range(self.controller.controller.get_numbuttons()):
@@ -143,7 +291,7 @@ class PS4ControllerTester:
                     
                     # 버튼이 눌렸을 때
                     if current and not last_states[i]:
-                        button_name = PS4Controller.BUTTON_NAMES.get(i, "알 수 없음")
+                        button_name = self.controller.BUTTON_NAMES.get(i, "알 수 없음")
                         print(f"✓ 버튼 {i:2d} 눌림 - {button_name}")
                         
                         # R1 버튼 강조
@@ -153,8 +301,6 @@ class PS4ControllerTester:
                             print("  " + "="*60)
                     
                     last_states[i] = current
-                
-                time.sleep(0.05)
         
         except KeyboardInterrupt:
             print("\n\n버튼 테스트 종료")
@@ -172,50 +318,54 @@ class PS4ControllerTester:
         print("="*70)
         print()
         
-        # 이전 값 저장 (변화 감지용)
-        prev_values = [0.0] * 10
-        
         try:
             line_count = self.controller.controller.get_numaxes()
             first_run = True
+            last_draw = 0.0
+            bar_length = 30
+            axis_bars = self._axis_bars
+            
+            # 이전 값 저장 (변화 감지용)
+            prev_values = np.zeros(line_count, dtype=np.float32)
             
             while True:
-                pygame.event.pump()
-                time.sleep(0.1)
+                self.controller.wait_for_input(100)
                 
-                # 변화 감지
-                has_change = False
-                current_values = self.controller.get_all_axes()
+                # 너무 자주 다시 그리지 않기 (최대 초당 30번)
+                if time.monotonic() - last_draw < self.REDRAW_INTERVAL:
+                    continue
                 
-                for i in range(len(current_values)):
-                    # 0.05 이상 변화가 있으면 갱신
-                    if abs(current_values[i] - prev_values[i]) > 0.05:
-                        has_change = True
+                # 변화 감지 (0.05 이상 변화가 있으면 갱신)
+                current_values = self.controller.get_all_axes()
+                has_change = bool(np.any(np.abs(current_values - prev_values) > 0.05))
                 
                 # 변화가 있을 때만 화면 갱신
                 if has_change or first_run:
                     # 첫 실행이 아니면 커서를 위로 올려서 덮어쓰기
-                    if not first_run:
-                        print("\033[F" * line_count, end='')
+                    lines = [] if first_run else ["\033[F" * line_count]
+                    
+                    # 값 시각화 (바 그래프): -1.0~1.0 → 0~bar_length 칸
+                    filled_all = ((current_values + 1.0) * (bar_length / 2)).astype(int)
+                    np.clip(filled_all, 0, bar_length, out=filled_all)
                     
                     for i in range(len(current_values)):
                         value = current_values[i]
-                        
-                        # 값 시각화 (바 그래프)
-                        bar_length = 30
-                        normalized = (value + 1.0) / 2.0
-                        filled = int(normalized * bar_length)
-                        bar = "█" * filled + "░" * (bar_length - filled)
+                        bar = axis_bars[filled_all[i]]
                         
                         # 축 레이블
-                        axis_label = PS4Controller.AXIS_NAMES.get(i, f"축 {i}")
+                        axis_label = self.controller.AXIS_NAMES.get(i, f"축 {i}")
                         
                         # 한 줄로 출력: 축 번호 + 레이블 | 바 | 값
                         # 줄 전체를 지우고 새로 쓰기
-                        print(f"\r\033[K축 {i}: {axis_label:25s} | [{bar}] {value:+.3f}")
+                        lines.append(f"\r\033[K축 {i}: {axis_label:25s} | [{bar}] {value:+.3f}\n")
+                    
+                    # 💡 화면 전체를 한 번에 출력 (줄마다 print하면 깜빡임 + 출력 호출 증가)
+                    sys.stdout.write("".join(lines))
+                    sys.stdout.flush()
                     
-                    prev_values = current_values[:]
+                    np.copyto(prev_values, current_values)
                     first_run = False
+                    last_draw = time.monotonic()
                 
         except KeyboardInterrupt:
             print("\n\n축 테스트 종료")
@@ -234,90 +384,101 @@ class PS4ControllerTester:
         print()
         
         # 이전 상태 저장
-        prev_buttons = set()
-        prev_axes = [0.0] * 10
+        prev_buttons = 0
+        prev_axes = np.zeros(self.controller.controller.get_numaxes(), dtype=np.float32)
         
         # 초기 화면 출력
         for _ in range(15):
             print()
         
+        last_draw = 0.0
+        
         try:
             while True:
-                pygame.event.pump()
-                time.sleep(0.1)
+                self.controller.wait_for_input(100)
+                
+                # 너무 자주 다시 그리지 않기 (최대 초당 30번)
+                if time.monotonic() - last_draw < self.REDRAW_INTERVAL:
+                    continue
                 
                 # 현재 상태 수집
-                current_buttons = set(self.controller.get_all_buttons())
+                current_buttons = self.controller.get_button_mask()
                 current_axes = self.controller.get_all_axes()
                 
-                # 변화 감지
-                buttons_changed = current_buttons != prev_buttons
-                axes_changed = any(abs(current_axes[i] - prev_axes[i]) > 0.05 
-                                 for i in range(len(current_axes)))
+                # 변화 감지 (버튼이 그대로일 때만 축 비교)
+                changed = (
+                    current_buttons != prev_buttons
+                    or bool(np.any(np.abs(current_axes - prev_axes) > 0.05))
+                )
                 
                 # 변화가 있을 때만 갱신
-                if buttons_changed or axes_changed:
+                if changed:
                     # 화면 갱신 (덮어쓰기)
-                    print("\033[F" * 15)
+                    lines = ["\033[F" * 15]
                     
                     # 버튼 상태
-                    print("🎮 버튼 상태:")
-                    print("-" * 70)
+                    lines.append("🎮 버튼 상태:")
+                    lines.append("-" * 70)
                     
                     if current_buttons:
                         button_list = []
-                        for btn_id in sorted(current_buttons):
-                            btn_name = PS4Controller.BUTTON_NAMES.get(btn_id, "알 수 없음")
+                        for btn_id in self.controller.pressed_buttons(current_buttons):
+                            btn_name = self.controller.BUTTON_NAMES.get(btn_id, "알 수 없음")
                             button_list.append(f"{btn_id} 눌림 - {btn_name}")
-                        print(f"\r\033[K  눌린 버튼: {', '.join(button_list)}")
+                        lines.append(f"\r\033[K  눌린 버튼: {', '.join(button_list)}")
                     else:
-                        print("\r\033[K  눌린 버튼: 없음")
+                        lines.append("\r\033[K  눌린 버튼: 없음")
                     
-                    print()
+                    lines.append("")
                     
                     # 축 상태
-                    print("🕹️  축(Axis) 상태:")
-                    print("-" * 70)
+                    lines.append("🕹️  축(Axis) 상태:")
+                    lines.append("-" * 70)
                     
                     # 좌 스틱
                     if len(current_axes) > 1:
                         lx = current_axes[0]
                         ly = current_axes[1]
-                        print(f"  좌 스틱   - X: {lx:+.3f}  Y: {ly:+.3f}")
+                        lines.append(f"  좌 스틱   - X: {lx:+.3f}  Y: {ly:+.3f}")
                     
                     # 우 스틱
                     if len(current_axes) > 3:
                         rx = current_axes[2]
                         ry = current_axes[3]
-                        print(f"  우 스틱   - X: {rx:+.3f}  Y: {ry:+.3f}")
+                        lines.append(f"  우 스틱   - X: {rx:+.3f}  Y: {ry:+.3f}")
                     elif len(current_axes) > 2:
                         rx = current_axes[2]
-                        print(f"  우 스틱   - X: {rx:+.3f}")
+                        lines.append(f"  우 스틱   - X: {rx:+.3f}")
                     
-                    print()
+                    lines.append("")
                     
                     # 트리거
                     if len(current_axes) > 4:
                         # L2 (축 4)
                         l2_raw = current_axes[4]
                         l2 = (l2_raw + 1.0) / 2.0
-                        l2_bar = "█" * int(l2 * 20) + "░" * (20 - int(l2 * 20))
-                        print(f"  L2 트리거 - [{l2_bar}] {l2:.3f}")
+                        l2_bar = self._trigger_bars[int(l2 * 20)]
+                        lines.append(f"  L2 트리거 - [{l2_bar}] {l2:.3f}")
                         
                         # R2 (축 5)
                         if len(current_axes) > 5:
                             r2_raw = current_axes[5]
                             r2 = (r2_raw + 1.0) / 2.0
-                            r2_bar = "█" * int(r2 * 20) + "░" * (20 - int(r2 * 20))
-                            print(f"  R2 트리거 - [{r2_bar}] {r2:.3f}")
+                            r2_bar = self._trigger_bars[int(r2 * 20)]
+                            lines.append(f"  R2 트리거 - [{r2_bar}] {r2:.3f}")
+                    
+                    lines.append("-" * 70)
+                    lines.append("")
+                    lines.append("")
                     
-                    print("-" * 70)
-                    print()
-                    print()
+                    # 💡 화면 전체를 한 번에 출력 (줄마다 print하면 깜빡임 + 출력 호출 증가)
+                    sys.stdout.write("\n".join(lines) + "\n")
+                    sys.stdout.flush()
                     
                     # 상태 저장
                     prev_buttons = current_buttons
-                    prev_axes = current_axes[:]
+                    np.copyto(prev_axes, current_axes)
+                    last_draw = time.monotonic()
                 
         except KeyboardInterrupt:
             print("\n\n모니터링 종료")
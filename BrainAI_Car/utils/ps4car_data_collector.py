@@ -10,12 +10,24 @@ PS4 컨트롤러로 BrainAI Car를 운전하면서 데이터를 획득하는 핵
 """
 
 import time
+import threading
 import cv2
 import math
 
 from .constants import SPEED_DEFAULT
 from .car_controller import BrainAICarController
 from .ps4_controller import PS4Controller
+from .sprites import TextSpriteCache
+
+
+# 스티어링 휠 표시 (반지름 + 서보 각도 0~180도별 표시선 끝점 오프셋)
+# 💡 매 프레임 sin/cos를 계산하지 않도록 미리 만들어 둡니다. (90도가 중앙)
+WHEEL_RADIUS = 60
+WHEEL_OFFSETS = [
+    (WHEEL_RADIUS * math.sin(math.radians(angle - 90)),
+     WHEEL_RADIUS * math.cos(math.radians(angle - 90)))
+    for angle in range(181)
+]
 
 class PS4CarDataCollector:
     """PS4 컨트롤러로 자동차를 운전하면서 데이터를 수집하는 클래스"""
@@ -53,6 +65,29 @@ class PS4CarDataCollector:
         
         # 카메라 실패 카운터 추가
         self.frame_fail_count = 0
+        
+        # 캡처 스레드 (최신 프레임 1장만 보관, 처리 못한 이전 프레임은 버림)
+        self._capture_thread = None
+        self._capturing = False
+        self._frame_lock = threading.Lock()
+        self._frame_event = threading.Event()
+        self._latest_frame = None
+        
+        # 화면 루프 1회 목표 시간 (초) - 남는 시간은 waitKey에서 쉬기
+        self.frame_budget = 1 / 30
+        
+        # 정지 + 녹화 안 함 + 상태 변화 없음이면 N프레임마다 한 번만 화면 갱신
+        self.idle_display_interval = 6
+        self._last_render_key = None
+        
+        # 상태 글자 캐시 (같은 조향/속도/FPS 문구는 한 번만 그리고 이후에는 붙여넣기만)
+        self._text_cache = TextSpriteCache(max_entries=256)
+        
+        # 상태 문구 캐시 (값이 바뀔 때만 문자열을 새로 만듦)
+        self._steering_angle = None
+        self._steering_text = None
+        self._fps_value = None
+        self._fps_text = None
     
     def run(self):
         """메인 제어 루프를 실행합니다."""
@@ -81,60 +116,84 @@ class PS4CarDataCollector:
         print('\n✓ 모든 준비 완료!')
         print('컨트롤러로 자동차를 조종하고 R1으로 녹화하세요!\n')
         
+        # 💡 카메라 읽기는 캡처 스레드가 담당 (카메라가 늦어도 컨트롤러 입력 처리가 밀리지 않음)
+        self._start_capture()
+        
         # 메인 루프
         frame_count = 0
         fps_start_time = time.time()
         fps = 0
+        last_frame = None  # 마지막으로 잘 읽은 프레임 (카메라가 멈췄을 때 재사용)
         
         try:
             while True:
-                # 프레임 읽기
-                ret, frame = self.car.video_capture.read()
-
-                if not ret:  # ← 실패 확인
-                    self.frame_fail_count += 1
-                    print(f'⚠ 프레임 읽기 실패 ({self.frame_fail_count}번째)')
-                    
-                    # 100번 연속 실패하면 종료
-                    if self.frame_fail_count > 100:
-                        print('\n❌ 카메라 연결 끊김 - 프로그램 종료합니다')
-                        self.cleanup()
-                        return
+                loop_start = time.monotonic()
+                
+                # 최신 프레임 가져오기 (새 프레임이 없으면 None)
+                latest = self._get_latest_frame()
+                new_frame = False
+                
+                if latest is not None:
+                    ret, frame = latest
                     
-                    time.sleep(0.1)
-                    continue  # ← 다음 반복으로
-
-                # 성공하면 카운터 초기화
-                self.frame_fail_count = 0
+                    if ret:
+                        # 성공하면 카운터 초기화
+                        self.frame_fail_count = 0
+                        last_frame = frame
+                        new_frame = True
+                    else:  # ← 실패 확인 (재시도 간격은 캡처 스레드가 조절)
+                        self.frame_fail_count += 1
+                        print(f'⚠ 프레임 읽기 실패 ({self.frame_fail_count}번째)')
+                        
+                        # 100번 연속 실패하면 종료
+                        if self.frame_fail_count > 100:
+                            print('\n❌ 카메라 연결 끊김 - 프로그램 종료합니다')
+                            self.cleanup()
+                            return
                 
                 # FIXED: PS4 컨트롤러 입력 처리 (R1, L1 자동 처리)
                 # R1: 녹화 토글
                 # L1: 최근 10개 프레임 삭제
-                self.ps4.process_events(frame)  # ← Pass frame here!
-                
-                # 녹화 중이면 프레임 저장
-                self.car.save_data_frame(frame)
-                
-                # FPS 계산
-                frame_count += 1
-                if frame_count % 30 == 0:
-                    elapsed = time.time() - fps_start_time
-                    fps = 30 / elapsed if elapsed > 0 else 0
-                    fps_start_time = time.time()
-                
-                # 화면에 상태 정보 표시
-                frame = self._draw_status(frame, fps)
+                # 💡 카메라가 멈춰도 컨트롤러 입력은 매번 처리해요 (마지막 정상 프레임 사용)
+                #    그래야 카메라가 멈춘 동안에도 차를 세우거나 녹화를 끌 수 있어요
+                self.ps4.process_events(last_frame)
                 
-                # 녹화 표시 추가
-                if self.car.data_collector:
-                    frame = self.car.data_collector.draw_recording_indicator(frame)
-                    frame = self.car.data_collector.draw_stats(frame)
-                
-                # 화면 표시
-                cv2.imshow('BrainAI Car - Data Collection', frame)
+                # 새 프레임이 있을 때만 저장하고 화면 갱신 (같은 프레임을 두 번 저장하지 않기)
+                if new_frame:
+                    # 녹화 중이면 프레임 저장
+                    self.car.save_data_frame(frame)
+                    
+                    # FPS 계산
+                    frame_count += 1
+                    if frame_count % 30 == 0:
+                        elapsed = time.time() - fps_start_time
+                        fps = 30 / elapsed if elapsed > 0 else 0
+                        fps_start_time = time.time()
+                    
+                    # 💡 차가 멈춰 있고 녹화도 안 하는데 표시할 상태도 그대로면 화면 갱신을 줄이기
+                    data_collector = self.car.data_collector
+                    recording = bool(data_collector and data_collector.recording)
+                    render_key = (self.ps4.servo_angle, self.ps4.speed, recording, int(fps))
+                    idle = (not recording and self.ps4.speed == 0
+                            and render_key == self._last_render_key)
+                    self._last_render_key = render_key
+                    
+                    if not idle or frame_count % self.idle_display_interval == 0:
+                        # 화면에 상태 정보 표시
+                        frame = self._draw_status(frame, fps)
+                        
+                        # 녹화 표시 추가
+                        if data_collector:
+                            frame = data_collector.draw_recording_indicator(frame)
+                            frame = data_collector.draw_stats(frame)
+                        
+                        # 화면 표시
+                        cv2.imshow('BrainAI Car - Data Collection', frame)
                 
                 # 키보드 입력 처리
-                key = cv2.waitKey(1) & 0xFF
+                # 💡 1ms 고정 대신 이번 루프의 남은 시간만큼 대기 (카메라가 더 빨라도 화면은 초당 30번)
+                remaining_ms = int((self.frame_budget - (time.monotonic() - loop_start)) * 1000)
+                key = cv2.waitKey(max(1, remaining_ms)) & 0xFF
                 if key == ord('q'):
                     print('\n프로그램 종료 요청...')
                     break
@@ -145,6 +204,44 @@ class PS4CarDataCollector:
         finally:
             self.cleanup()
     
+    def _start_capture(self):
+        """백그라운드 캡처 스레드 시작"""
+        self._capturing = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+    
+    def _capture_loop(self):
+        """카메라에서 계속 프레임을 읽어 최신 프레임 슬롯에 덮어쓰기"""
+        video_capture = self.car.video_capture
+        while self._capturing:
+            ret, frame = video_capture.read()
+            
+            with self._frame_lock:
+                self._latest_frame = (ret, frame)
+            self._frame_event.set()
+            
+            if not ret:
+                time.sleep(0.1)  # 실패 시 잠시 후 재시도
+    
+    def _get_latest_frame(self, timeout=0.1):
+        """
+        캡처 스레드가 넣어둔 최신 프레임 가져오기
+        
+        Args:
+            timeout: 새 프레임을 기다릴 최대 시간 (초)
+            
+        Returns:
+            (성공 여부, 프레임) 튜플 (새 프레임이 없으면 None)
+        """
+        if not self._frame_event.wait(timeout):
+            return None
+        
+        with self._frame_lock:
+            latest = self._latest_frame
+            self._latest_frame = None
+            self._frame_event.clear()
+        return latest
+    
     def _show_instructions(self):
         """조작 방법을 화면에 표시합니다."""
         print('\n' + '=' * 60)
@@ -176,46 +273,60 @@ class PS4CarDataCollector:
             상태 정보가 추가된 프레임
         """
         height, width = frame.shape[:2]
+        font = cv2.FONT_HERSHEY_SIMPLEX
         
         # 반투명 검은색 배경
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (480, 180), (0, 0, 0), -1)
-        frame = cv2.addWeighted(overlay, 0.7, frame, 0.3, 0)
-        
-        # 1. 조향 정보
-        steering_text = f"Steering: {self.ps4.servo_angle}deg"
-        cv2.putText(frame, steering_text, (20, 45),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        # 💡 검은색과 70% 합성 = 밝기 30%로 줄이기 (프레임 전체 복사 없이 상자 영역만 제자리에서 계산)
+        status_box = frame[10:181, 10:481]
+        cv2.convertScaleAbs(status_box, status_box, alpha=0.3)
+        
+        # 1. 조향 정보 (각도가 바뀔 때만 문구 갱신)
+        servo_angle = self.ps4.servo_angle
+        if servo_angle != self._steering_angle:
+            self._steering_angle = servo_angle
+            self._steering_text = f"Steering: {servo_angle}deg"
+        steering_text = self._steering_text
+        put_text = self._text_cache.put_text
+        put_text(frame, steering_text, (20, 45),
+                 font, 0.8, (255, 255, 255), 2)
         
         # 2. 속도 정보 (색상으로 구분)
-        if self.ps4.speed > 0:
-            speed_text = f"Speed: FORWARD ({self.ps4.speed})"
+        # 💡 속도는 한 번만 읽고, 스티어링 휠 표시선 색상도 여기서 같이 정하기
+        speed = self.ps4.speed
+        if speed > 0:
+            speed_text = f"Speed: FORWARD ({speed})"
             speed_color = (0, 255, 0)  # 초록색
-        elif self.ps4.speed < 0:
+            line_color = (0, 255, 0)  # 초록색 (전진)
+        elif speed < 0:
             speed_text = "Speed: REVERSE"
             speed_color = (0, 0, 255)  # 빨간색
+            line_color = (0, 0, 255)  # 빨간색 (후진)
         else:
             speed_text = "Speed: STOP"
             speed_color = (200, 200, 200)  # 회색
+            line_color = (0, 255, 255)  # 노란색 (정지)
         
-        cv2.putText(frame, speed_text, (20, 90),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, speed_color, 2)
+        put_text(frame, speed_text, (20, 90),
+                 font, 0.8, speed_color, 2)
         
         # 3. 컨트롤러 상태
-        cv2.putText(frame, "PS4: CONNECTED", (20, 135),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        put_text(frame, "PS4: CONNECTED", (20, 135),
+                 font, 0.7, (0, 255, 0), 2)
         
-        # 4. FPS 표시
-        fps_text = f"FPS: {fps:.1f}"
-        cv2.putText(frame, fps_text, (20, 165),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+        # 4. FPS 표시 (FPS는 30프레임마다 계산되므로 그때만 문구 갱신)
+        if fps != self._fps_value:
+            self._fps_value = fps
+            self._fps_text = f"FPS: {fps:.1f}"
+        fps_text = self._fps_text
+        put_text(frame, fps_text, (20, 165),
+                 font, 0.6, (255, 255, 0), 2)
         
         # 5. 스티어링 휠 시각화 (오른쪽 위)
-        self._draw_steering_wheel(frame, width - 110, 90)
+        self._draw_steering_wheel(frame, width - 110, 90, line_color)
         
         return frame
     
-    def _draw_steering_wheel(self, frame, center_x, center_y):
+    def _draw_steering_wheel(self, frame, center_x, center_y, line_color):
         """
         스티어링 휠을 시각적으로 표시합니다.
         서보가 거꾸로 연결되어 있으므로 방향을 반대로 표시합니다.
@@ -224,40 +335,40 @@ class PS4CarDataCollector:
             frame: 프레임
             center_x: 중심 X 좌표
             center_y: 중심 Y 좌표
+            line_color: 각도 표시선 색상 (속도에 따라 변화)
         """
-        radius = 60
+        # 💡 안티에일리어싱(LINE_AA) 없이 빠른 LINE_8로 고정해서 그리기
+        line_type = cv2.LINE_8
         
         # 원 그리기 (스티어링 휠)
-        cv2.circle(frame, (center_x, center_y), radius, (255, 255, 255), 3)
+        cv2.circle(frame, (center_x, center_y), WHEEL_RADIUS, (255, 255, 255), 3,
+                   lineType=line_type)
         
         # 서보 각도를 반대로 변환 (거꾸로 연결된 서보 보정)
         inverted_angle = 180 - self.ps4.servo_angle
         
-        # 현재 각도를 라디안으로 변환 (90도가 중앙)
-        angle_rad = math.radians(inverted_angle - 90)
-        
-        # 각도 표시선의 끝점 계산
-        end_x = int(center_x + radius * math.sin(angle_rad))
-        end_y = int(center_y - radius * math.cos(angle_rad))
-        
-        # 각도 표시선 그리기 (색상: 속도에 따라 변화)
-        if self.ps4.speed > 0:
-            line_color = (0, 255, 0)  # 초록색 (전진)
-        elif self.ps4.speed < 0:
-            line_color = (0, 0, 255)  # 빨간색 (후진)
-        else:
-            line_color = (0, 255, 255)  # 노란색 (정지)
+        # 각도 표시선의 끝점 (미리 계산한 오프셋 사용)
+        offset_x, offset_y = WHEEL_OFFSETS[max(0, min(180, inverted_angle))]
+        end_x = int(center_x + offset_x)
+        end_y = int(center_y - offset_y)
         
+        # 각도 표시선 그리기
         cv2.line(frame, (center_x, center_y), (end_x, end_y), 
-                line_color, 4)
+                line_color, 4, lineType=line_type)
         
         # 중심점 그리기
-        cv2.circle(frame, (center_x, center_y), 5, line_color, -1)
+        cv2.circle(frame, (center_x, center_y), 5, line_color, -1, lineType=line_type)
     
     def cleanup(self):
         """프로그램 종료 시 리소스를 정리합니다."""
         print('\n리소스 정리 중...')
         
+        # 캡처 스레드 종료 (카메라 해제 전에)
+        self._capturing = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+        
         # 자동차 정지 및 연결 종료
         if self.car:
             self.car.close()
@@ -159,9 +159,9 @@ class PS4CarDriver:
         height, width = frame.shape[:2]
         
         # 반투명 검은색 배경
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (480, 180), (0, 0, 0), -1)
-        frame = cv2.addWeighted(overlay, 0.7, frame, 0.3, 0)
+        # 💡 검은색과 70% 합성 = 밝기 30%로 줄이기 (프레임 전체 복사 없이 상자 영역만 제자리에서 계산)
+        status_box = frame[10:181, 10:481]
+        cv2.convertScaleAbs(status_box, status_box, alpha=0.3)
         
         # 1. 조향 정보
         steering_text = f"Steering: {self.ps4.servo_angle}deg"
@@ -0,0 +1,109 @@
+"""
+BrainAI Car [화면 표시 스프라이트] 모듈_v1.0.0
+고정된 글자/도형을 한 번만 그려두고 매 프레임 붙여넣어 화면 표시 비용을 줄입니다.
+
+모듈 위치: utils/
+모듈 이름: sprites.py
+"""
+
+import cv2
+import numpy as np
+
+
+def make_sprite(canvas):
+    """
+    흑백 캔버스에 그린 그림을 (캔버스, 마스크, 알파) 스프라이트로 변환
+
+    Args:
+        canvas: 그림이 그려진 uint8 캔버스 (0 = 투명)
+
+    Returns:
+        tuple: (캔버스, 마스크, 알파)
+    """
+    mask = canvas > 0
+    alpha = canvas[mask].astype(np.float32)[:, None] / 255.0
+    return canvas, mask, alpha
+
+
+def paste_sprite(area, sprite, color):
+    """
+    스프라이트를 지정한 색으로 영역에 붙여넣기 (그림이 있는 픽셀만 수정)
+
+    Args:
+        area: 대상 영역 (프레임 슬라이스, 왼쪽 위가 스프라이트 왼쪽 위)
+        sprite: make_sprite 결과
+        color: BGR 색상
+    """
+    canvas, mask, alpha = sprite
+    height, width = area.shape[:2]
+    if mask.shape != (height, width):  # 프레임이 작아서 잘린 경우
+        _, mask, alpha = make_sprite(canvas[:height, :width])
+
+    pixels = area[mask]
+    area[mask] = pixels * (1.0 - alpha) + np.array(color, dtype=np.float32) * alpha
+
+
+class TextSpriteCache:
+    """cv2.putText 결과를 글자별로 저장해두고 다시 쓰는 캐시"""
+
+    def __init__(self, max_entries=64):
+        """
+        Args:
+            max_entries: 저장할 최대 글자 수 (넘으면 가장 오래된 것부터 삭제)
+        """
+        self.max_entries = max_entries
+        self._sprites = {}
+
+    def _get(self, text, font, font_scale, thickness):
+        """(텍스트, 폰트, 크기, 두께)에 해당하는 스프라이트 반환 (없으면 생성)"""
+        key = (text, font, font_scale, thickness)
+        entry = self._sprites.get(key)
+        if entry is not None:
+            return entry
+
+        (text_width, text_height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        pad = thickness + 1
+        canvas = np.zeros(
+            (text_height + baseline + 2 * pad, text_width + 2 * pad), dtype=np.uint8
+        )
+        cv2.putText(canvas, text, (pad, pad + text_height), font, font_scale, 255, thickness)
+
+        # 스프라이트 + 기준점(putText org)에서 캔버스 왼쪽 위까지의 거리
+        entry = (make_sprite(canvas), pad, pad + text_height)
+        if len(self._sprites) >= self.max_entries:
+            self._sprites.pop(next(iter(self._sprites)))
+        self._sprites[key] = entry
+        return entry
+
+    def put_text(self, frame, text, org, font, font_scale, color, thickness=1):
+        """
+        cv2.putText와 같은 결과를 캐시된 스프라이트로 그리기
+
+        Args:
+            frame: 대상 프레임
+            text: 표시할 문자열
+            org: 글자 기준점 (왼쪽 아래, cv2.putText와 동일)
+            font: 폰트
+            font_scale: 글자 크기
+            color: BGR 색상
+            thickness: 글자 두께
+        """
+        sprite, offset_x, offset_y = self._get(text, font, font_scale, thickness)
+        canvas = sprite[0]
+
+        # 프레임 밖으로 나가는 부분 잘라내기
+        x = org[0] - offset_x
+        y = org[1] - offset_y
+        left, top = max(0, -x), max(0, -y)
+        if left or top:
+            sprite = make_sprite(canvas[top:, left:])
+
+        area = frame[y + top:y + canvas.shape[0], x + left:x + canvas.shape[1]]
+        if area.size:
+            paste_sprite(area, sprite, color)
+
+
+# 버전 정보
+__version__ = '1.0.0'
+__author__ = 'BrainAI Co,.Ltd.'
+__description__ = 'BrainAI Autonomous Driving Project - Overlay Sprites'
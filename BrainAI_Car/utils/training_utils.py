@@ -0,0 +1,53 @@
+"""
+BrainAI Car [모델 훈련 공용 도구] 모듈_v1.0.0
+model_train.py와 model_update.py가 함께 쓰는 파일 처리 함수 모음입니다.
+
+모듈 위치: utils/
+모듈 이름: training_utils.py
+"""
+
+import os
+import json
+
+try:
+    import orjson  # 설치되어 있으면 더 빠른 JSON 파서 사용
+except ImportError:
+    orjson = None
+
+
+def load_json(json_path):
+    """JSON 파일 읽기 (orjson 우선, 실패 시 표준 json)"""
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity 등 표준 json만 읽을 수 있는 값은 아래에서 재시도
+    
+    return json.loads(raw)
+
+
+def remove_stale_tf_caches(cache_path):
+    """
+    같은 폴더에 남아 있는 예전 tf.data 캐시 파일 지우기
+    
+    💡 파일 목록이나 조향값이 바뀌면 캐시 이름도 바뀌어요.
+       지우지 않으면 더 이상 쓰지 않는 캐시가 디스크에 계속 쌓여요.
+    
+    Args:
+        cache_path: 지금 사용할 캐시 경로 (이 이름으로 시작하는 파일은 남김)
+    """
+    cache_dir, cache_name = os.path.split(cache_path)
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return
+    
+    for name in names:
+        if name.startswith("_tfcache_") and not name.startswith(cache_name):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass  # 다른 프로그램이 쓰고 있으면 다음에 다시 시도